@@ -142,11 +142,16 @@ app.post('/api/cart/sync', authMiddleware, async (req, res) => {
 // Protected route: Create order (async - returns 202 Accepted)
 app.post('/api/buy', authMiddleware, async (req, res) => {
   try {
-    const { event_id, seat_id, total_amount } = req.body;
+    const { event_id, seat_id, seat_ids, total_amount } = req.body;
+
+    // Cart orders send seat_ids; they are bought as one unit (all or none)
+    const seatIds = Array.isArray(seat_ids)
+      ? [...new Set(seat_ids.map((id) => parseInt(id)).filter(Boolean))]
+      : [];
 
     // Validate input
-    if (!event_id || !seat_id) {
-      return res.status(400).json({ error: 'event_id and seat_id are required' });
+    if (!event_id || (!seat_id && seatIds.length === 0)) {
+      return res.status(400).json({ error: 'event_id and seat_id (or seat_ids) are required' });
     }
 
     const orderUuid = uuidv4();
@@ -156,7 +161,7 @@ app.post('/api/buy', authMiddleware, async (req, res) => {
       order_uuid: orderUuid,
       user_id: req.user.sub,  // Must be a valid UUID from Keycloak
       event_id: parseInt(event_id),
-      seat_id: parseInt(seat_id),
+      seat_id: seatIds.length > 0 ? seatIds[0] : parseInt(seat_id),
       total_amount: parseFloat(total_amount) || 0.0,
       processing_complexity: Math.floor(Math.random() * 10) + 1,
       timestamp: new Date().toISOString(),
@@ -164,6 +169,9 @@ app.post('/api/buy', authMiddleware, async (req, res) => {
       retry_count: 0,
       priority: 5
     };
+    if (seatIds.length > 1) {
+      orderData.seat_ids = seatIds;
+    }
 
     // Send to RabbitMQ queue
     if (!isConnected) {
@@ -180,6 +188,7 @@ app.post('/api/buy', authMiddleware, async (req, res) => {
         user_id: orderData.user_id,
         event_id: orderData.event_id,
         seat_id: orderData.seat_id,
+        seat_ids: orderData.seat_ids,
         total_amount: orderData.total_amount
       },
     });
@@ -71,6 +71,121 @@ export async function ValidateAndCommitSeat(call, callback) {
   }
 }
 
+// All seats of a cart order are sold in one transaction, or none is.
+// Rows are locked in id order so concurrent carts cannot deadlock.
+export async function CommitSeats(call, callback) {
+  const seatIds = [...new Set((call.request?.seat_ids || []).map(Number).filter(Boolean))];
+
+  if (seatIds.length === 0) {
+    callback(null, { success: false, message: 'seat_ids is required' });
+    return;
+  }
+
+  const client = await pool.connect();
+
+  try {
+    await client.query('BEGIN');
+
+    const seatResult = await client.query(
+      'SELECT id, status FROM seats WHERE id = ANY($1::int[]) ORDER BY id FOR UPDATE',
+      [seatIds],
+    );
+
+    const found = new Set(seatResult.rows.map((row) => Number(row.id)));
+    const missing = seatIds.filter((id) => !found.has(id));
+    if (missing.length > 0) {
+      await client.query('ROLLBACK');
+      callback(null, { success: false, message: 'Seat not found', unavailable_seat_ids: missing });
+      return;
+    }
+
+    const sold = seatResult.rows
+      .filter((row) => String(row.status || '').toUpperCase() === 'SOLD')
+      .map((row) => Number(row.id));
+    if (sold.length > 0) {
+      await client.query('ROLLBACK');
+      callback(null, { success: false, message: 'Seat already sold', unavailable_seat_ids: sold });
+      return;
+    }
+
+    const ineligible = seatResult.rows
+      .filter((row) => !['LOCKED', 'AVAILABLE'].includes(String(row.status || '').toUpperCase()))
+      .map((row) => Number(row.id));
+    if (ineligible.length > 0) {
+      await client.query('ROLLBACK');
+      callback(null, {
+        success: false,
+        message: 'Seat not eligible for commit',
+        unavailable_seat_ids: ineligible,
+      });
+      return;
+    }
+
+    await client.query("UPDATE seats SET status = 'SOLD' WHERE id = ANY($1::int[])", [seatIds]);
+    await client.query('COMMIT');
+    callback(null, { success: true });
+  } catch (error) {
+    await client.query('ROLLBACK');
+    console.error('CommitSeats error:', error);
+    callback(null, { success: false, message: 'Internal error' });
+  } finally {
+    client.release();
+  }
+}
+
+function toSeatDetails(row) {
+  const status = String(row.status || '').toUpperCase();
+  const details = {
+    seat_id: row.id,
+    event_id: row.event_id,
+    seat_number: `${row.section}-${row.row}-${row.seat_number}`,
+    price: Number(row.price || 0),
+    is_available: status === 'AVAILABLE',
+    status: `SEAT_STATUS_${status || 'UNSPECIFIED'}`,
+    locked_by_user_id: row.locked_by_user_id || '',
+  };
+  if (row.locked_at) {
+    const millis = new Date(row.locked_at).getTime();
+    details.locked_at = { seconds: Math.floor(millis / 1000), nanos: (millis % 1000) * 1e6 };
+  }
+  return details;
+}
+
+// Batch seat lookup, by seat_ids or (when seat_ids is empty) by event_id.
+// The order worker uses the event form to warm its sold-seat cache.
+export async function GetMultipleSeatsDetails(call, callback) {
+  const seatIds = (call.request?.seat_ids || []).map(Number).filter(Boolean);
+  const eventId = Number(call.request?.event_id);
+
+  if (seatIds.length === 0 && !eventId) {
+    callback({ code: grpc.status.INVALID_ARGUMENT, message: 'seat_ids or event_id is required' });
+    return;
+  }
+
+  const filter = seatIds.length > 0 ? 's.id = ANY($1::int[])' : 's.event_id = $1';
+  try {
+    const result = await pool.query(
+      `SELECT s.id, s.event_id, s.section, s.row, s.seat_number, s.status,
+              s.locked_by_user_id, s.locked_at, e.price
+         FROM seats s
+         JOIN events e ON e.id = s.event_id
+        WHERE ${filter}
+        ORDER BY s.id`,
+      [seatIds.length > 0 ? seatIds : eventId],
+    );
+
+    const found = new Set(result.rows.map((row) => row.id));
+    callback(null, {
+      seats: result.rows.map(toSeatDetails),
+      total_found: result.rowCount,
+      not_found_ids: seatIds.filter((id) => !found.has(id)),
+    });
+  } catch (error) {
+    console.error('GetMultipleSeatsDetails error:', error);
+    callback({ code: grpc.status.INTERNAL, message: 'Internal error' });
+  }
+}
+
 export function startGrpcServer(port = process.env.GRPC_PORT || 50051) {
   if (!inventoryProto?.InventoryService) {
     throw new Error('InventoryService definition not found in inventory.proto');
@@ -80,6 +195,8 @@ export function startGrpcServer(port = process.env.GRPC_PORT || 50051) {
   // Map CommitSeat RPC to ValidateAndCommitSeat handler per service contract.
   server.addService(inventoryProto.InventoryService.service, {
     CommitSeat: ValidateAndCommitSeat,
+    CommitSeats,
+    GetMultipleSeatsDetails,
   });
 
   server.bindAsync(
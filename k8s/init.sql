@@ -502,15 +502,25 @@ CREATE TABLE IF NOT EXISTS db_orders.orders (
     error_message TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    completed_at TIMESTAMP
+    completed_at TIMESTAMP,
+    -- Processing lease of the order-worker delivery that started the order
+    processing_token UUID,
+    lease_expires_at TIMESTAMP
 );
 
+-- Lease columns for databases created before they existed
+ALTER TABLE db_orders.orders ADD COLUMN IF NOT EXISTS processing_token UUID;
+ALTER TABLE db_orders.orders ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+
 -- Create indexes for order queries (idempotent)
 CREATE INDEX IF NOT EXISTS idx_orders_uuid ON db_orders.orders(order_uuid);
 CREATE INDEX IF NOT EXISTS idx_orders_user_id ON db_orders.orders(user_id);
 CREATE INDEX IF NOT EXISTS idx_orders_status ON db_orders.orders(status);
 CREATE INDEX IF NOT EXISTS idx_orders_created_at ON db_orders.orders(created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_orders_event_seat ON db_orders.orders(event_id, seat_id);
+-- Keyset pagination for GetUserOrders (order-worker OrderService)
+CREATE INDEX IF NOT EXISTS idx_orders_user_created ON db_orders.orders(user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_orders_qr_hash ON db_orders.orders(qr_code_hash);
 
 -- Order History Table (for audit trail)
 CREATE TABLE IF NOT EXISTS db_orders.order_history (
@@ -524,6 +534,87 @@ CREATE TABLE IF NOT EXISTS db_orders.order_history (
 
 CREATE INDEX IF NOT EXISTS idx_order_history_order_id ON db_orders.order_history(order_id);
 
+-- Seats of multi-seat (cart) orders, one QR ticket each. The orders row
+-- holds the first seat and the totals; no FK since order_uuid alone is
+-- not unique on the partitioned table.
+CREATE TABLE IF NOT EXISTS db_orders.order_items (
+    order_uuid UUID NOT NULL,
+    seat_id INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    qr_code_hash TEXT,
+    qr_code_base64 TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (order_uuid, seat_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_order_items_qr_hash ON db_orders.order_items(qr_code_hash);
+CREATE INDEX IF NOT EXISTS idx_order_items_event_seat ON db_orders.order_items(event_id, seat_id);
+
+-- Cold storage for archived QR tickets (archive_orders.py): images are
+-- stored decoded (bytea) instead of base64 text. orders_archive also
+-- receives whole rows of retired partitions when orders is partitioned
+-- (k8s/partition_orders.sql).
+CREATE TABLE IF NOT EXISTS db_orders.orders_archive (
+    order_uuid UUID PRIMARY KEY,
+    user_id UUID NOT NULL,
+    event_id INTEGER NOT NULL,
+    seat_id INTEGER NOT NULL,
+    total_amount DECIMAL(10, 2) NOT NULL,
+    status db_orders.order_status NOT NULL,
+    qr_code_hash TEXT,
+    qr_code_png BYTEA,
+    created_at TIMESTAMP NOT NULL,
+    completed_at TIMESTAMP,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_orders_archive_event ON db_orders.orders_archive(event_id);
+CREATE INDEX IF NOT EXISTS idx_orders_archive_user ON db_orders.orders_archive(user_id, created_at);
+
+CREATE TABLE IF NOT EXISTS db_orders.order_items_archive (
+    order_uuid UUID NOT NULL,
+    seat_id INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    qr_code_hash TEXT,
+    qr_code_png BYTEA,
+    created_at TIMESTAMP NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (order_uuid, seat_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_order_items_archive_event ON db_orders.order_items_archive(event_id);
+
+-- Per-order stage durations in ms (written by the order worker with the
+-- final status update when ORDER_TIMINGS_ENABLED=true)
+CREATE TABLE IF NOT EXISTS db_orders.order_timings (
+    order_uuid UUID PRIMARY KEY,
+    event_id INTEGER NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP,
+    recorded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    queue_wait_ms INTEGER,
+    db_ms INTEGER NOT NULL DEFAULT 0,
+    cpu_sim_ms INTEGER NOT NULL DEFAULT 0,
+    qr_render_ms INTEGER NOT NULL DEFAULT 0,
+    commit_ms INTEGER NOT NULL DEFAULT 0,
+    total_ms INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_order_timings_event_recorded ON db_orders.order_timings(event_id, recorded_at);
+
+-- Tickets admitted at venue gates (GateService.ValidateTickets, written
+-- behind in batches by the order worker)
+CREATE TABLE IF NOT EXISTS db_orders.ticket_redemptions (
+    order_uuid UUID NOT NULL,
+    seat_id INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    gate_id VARCHAR(100) NOT NULL,
+    redeemed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (order_uuid, seat_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_ticket_redemptions_event ON db_orders.ticket_redemptions(event_id);
+
 -- Trigger to log status changes
 CREATE OR REPLACE FUNCTION db_orders.log_order_status_change()
 RETURNS TRIGGER AS $$
@@ -635,6 +726,21 @@ SELECT
     EXTRACT(EPOCH FROM (COALESCE(o.completed_at, CURRENT_TIMESTAMP) - o.created_at)) AS processing_time_seconds
 FROM db_orders.orders o;
 
+-- View: p50/p95/p99 per stage and event for completed orders (ms)
+CREATE OR REPLACE VIEW db_orders.v_order_stage_latency AS
+SELECT
+    t.event_id,
+    COUNT(*) AS orders,
+    percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY t.queue_wait_ms) AS queue_wait,
+    percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY t.db_ms) AS db,
+    percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY t.cpu_sim_ms) AS cpu_sim,
+    percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY t.qr_render_ms) AS qr_render,
+    percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY t.commit_ms) AS commit,
+    percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY t.total_ms) AS total
+FROM db_orders.order_timings t
+WHERE t.status = 'COMPLETED'
+GROUP BY t.event_id;
+
 -- ================================================
 -- PERMISSIONS (Optional - adjust based on your setup)
 -- ================================================
@@ -0,0 +1,158 @@
+-- ================================================
+-- MIGRATION: Range-partition db_orders.orders by created_at
+-- ================================================
+-- Run once against a database initialized with init.sql, then set
+-- ORDERS_PARTITIONED=true on the order-worker. Safe to re-run: the table
+-- conversion is skipped when db_orders.orders is already partitioned.
+--
+--   kubectl exec -i -n ticketbuster <postgres-pod> -- \
+--       psql -U admin -d ticketbuster -f - < k8s/partition_orders.sql
+--
+-- Notes:
+-- * Unique constraints on a partitioned table must include the partition
+--   key, so uniqueness becomes (order_uuid, created_at) and the primary key
+--   (id, created_at). The worker derives created_at from the message
+--   timestamp, so redeliveries upsert the same row.
+-- * order_history.order_id loses its foreign key for the same reason
+--   (the audit rows are kept).
+-- * Monthly partitions are named orders_YYYY_MM; archive_orders.py creates
+--   them ahead of time and retires old ones.
+
+SET search_path TO db_orders;
+
+-- Cold storage for archived orders: QR images are stored decoded (bytea)
+-- instead of base64 text, and rows survive partition retirement. Same
+-- definition as in init.sql, repeated for databases created before it
+-- was added there.
+CREATE TABLE IF NOT EXISTS db_orders.orders_archive (
+    order_uuid UUID PRIMARY KEY,
+    user_id UUID NOT NULL,
+    event_id INTEGER NOT NULL,
+    seat_id INTEGER NOT NULL,
+    total_amount DECIMAL(10, 2) NOT NULL,
+    status db_orders.order_status NOT NULL,
+    qr_code_hash TEXT,
+    qr_code_png BYTEA,
+    created_at TIMESTAMP NOT NULL,
+    completed_at TIMESTAMP,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_orders_archive_event ON db_orders.orders_archive(event_id);
+CREATE INDEX IF NOT EXISTS idx_orders_archive_user ON db_orders.orders_archive(user_id, created_at);
+
+-- Create monthly partitions from p_from's month up to p_months_ahead
+-- months after the current one. Returns the number of partitions created.
+CREATE OR REPLACE FUNCTION db_orders.ensure_order_partitions(p_from DATE, p_months_ahead INTEGER DEFAULT 3)
+RETURNS INTEGER AS $$
+DECLARE
+    v_month DATE := date_trunc('month', p_from)::date;
+    v_last DATE := (date_trunc('month', CURRENT_DATE) + make_interval(months => p_months_ahead))::date;
+    v_name TEXT;
+    v_created INTEGER := 0;
+BEGIN
+    WHILE v_month <= v_last LOOP
+        v_name := 'orders_' || to_char(v_month, 'YYYY_MM');
+        IF to_regclass('db_orders.' || v_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE db_orders.%I PARTITION OF db_orders.orders FOR VALUES FROM (%L) TO (%L)',
+                v_name, v_month, (v_month + interval '1 month')::date
+            );
+            v_created := v_created + 1;
+        END IF;
+        v_month := (v_month + interval '1 month')::date;
+    END LOOP;
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    v_first_month DATE;
+BEGIN
+    IF EXISTS (
+        SELECT 1
+        FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'db_orders' AND c.relname = 'orders'
+    ) THEN
+        RAISE NOTICE 'db_orders.orders is already partitioned, skipping conversion';
+        RETURN;
+    END IF;
+
+    ALTER TABLE db_orders.order_history DROP CONSTRAINT IF EXISTS order_history_order_id_fkey;
+    -- Keep the id sequence when the old table is dropped
+    ALTER SEQUENCE db_orders.orders_id_seq OWNED BY NONE;
+
+    CREATE TABLE db_orders.orders_partitioned (
+        id INTEGER NOT NULL DEFAULT nextval('db_orders.orders_id_seq'),
+        order_uuid UUID NOT NULL DEFAULT gen_random_uuid(),
+        user_id UUID NOT NULL,
+        event_id INTEGER NOT NULL,
+        seat_id INTEGER NOT NULL,
+        total_amount DECIMAL(10, 2) NOT NULL CHECK (total_amount >= 0),
+        status db_orders.order_status NOT NULL DEFAULT 'PENDING',
+        qr_code_hash TEXT,
+        qr_code_base64 TEXT,
+        processing_complexity INTEGER CHECK (processing_complexity BETWEEN 1 AND 10),
+        payment_reference VARCHAR(255),
+        error_message TEXT,
+        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        completed_at TIMESTAMP,
+        processing_token UUID,
+        lease_expires_at TIMESTAMP,
+        CONSTRAINT orders_part_pkey PRIMARY KEY (id, created_at),
+        CONSTRAINT orders_part_uuid_key UNIQUE (order_uuid, created_at)
+    ) PARTITION BY RANGE (created_at);
+
+    -- Catch-all so inserts never fail if partitions were not created ahead
+    CREATE TABLE db_orders.orders_default PARTITION OF db_orders.orders_partitioned DEFAULT;
+
+    ALTER TABLE db_orders.orders RENAME TO orders_unpartitioned;
+    ALTER TABLE db_orders.orders_partitioned RENAME TO orders;
+
+    SELECT date_trunc('month', COALESCE(MIN(COALESCE(created_at, updated_at)), CURRENT_TIMESTAMP))::date
+    INTO v_first_month
+    FROM db_orders.orders_unpartitioned;
+    PERFORM db_orders.ensure_order_partitions(v_first_month, 3);
+
+    INSERT INTO db_orders.orders (
+        id, order_uuid, user_id, event_id, seat_id, total_amount, status,
+        qr_code_hash, qr_code_base64, processing_complexity, payment_reference,
+        error_message, created_at, updated_at, completed_at,
+        processing_token, lease_expires_at
+    )
+    SELECT
+        id, order_uuid, user_id, event_id, seat_id, total_amount, status,
+        qr_code_hash, qr_code_base64, processing_complexity, payment_reference,
+        error_message, COALESCE(created_at, updated_at, CURRENT_TIMESTAMP), updated_at, completed_at,
+        processing_token, lease_expires_at
+    FROM db_orders.orders_unpartitioned;
+
+    DROP TABLE db_orders.orders_unpartitioned;
+    ALTER SEQUENCE db_orders.orders_id_seq OWNED BY db_orders.orders.id;
+END $$;
+
+-- Indexes (created on every partition, current and future)
+CREATE INDEX IF NOT EXISTS idx_orders_uuid ON db_orders.orders(order_uuid);
+CREATE INDEX IF NOT EXISTS idx_orders_user_id ON db_orders.orders(user_id);
+CREATE INDEX IF NOT EXISTS idx_orders_status ON db_orders.orders(status);
+CREATE INDEX IF NOT EXISTS idx_orders_created_at ON db_orders.orders(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_orders_event_seat ON db_orders.orders(event_id, seat_id);
+CREATE INDEX IF NOT EXISTS idx_orders_user_created ON db_orders.orders(user_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_orders_qr_hash ON db_orders.orders(qr_code_hash);
+
+-- Triggers (row triggers on partitioned tables need PostgreSQL 13+)
+DROP TRIGGER IF EXISTS order_status_change_trigger ON db_orders.orders;
+CREATE TRIGGER order_status_change_trigger
+    AFTER UPDATE ON db_orders.orders
+    FOR EACH ROW
+    EXECUTE FUNCTION db_orders.log_order_status_change();
+
+DROP TRIGGER IF EXISTS orders_update_timestamp ON db_orders.orders;
+CREATE TRIGGER orders_update_timestamp
+    BEFORE UPDATE ON db_orders.orders
+    FOR EACH ROW
+    EXECUTE FUNCTION db_catalog.update_timestamp();
@@ -96,6 +96,7 @@ function handleNotification(io, message) {
     order_uuid: data.order_uuid,
     event_id: data.event_id,
     seat_id: data.seat_id,
+    seats: data.seats || null,  // Cart orders: [{ seat_id, qr_code_hash }, ...]
     status: type === 'order.completed' ? 'completed' : 'failed',
     qr_code_hash: data.qr_code_hash || null,
     total_amount: data.total_amount,
@@ -123,7 +124,8 @@ function simulateEmailNotification(userId, notification) {
   if (notification.status === 'completed') {
     console.log(`📧 Enviando correo de confirmación a usuario ${userId.slice(0, 8)}...`);
     console.log(`   📍 Orden: ${notification.order_uuid.slice(0, 8)}...`);
-    console.log(`   🎫 Evento: ${notification.event_id}, Asiento: ${notification.seat_id}`);
+    const seats = notification.seats ? notification.seats.map((s) => s.seat_id).join(', ') : notification.seat_id;
+    console.log(`   🎫 Evento: ${notification.event_id}, Asiento: ${seats}`);
     console.log(`   💰 Total: $${notification.total_amount}`);
     console.log(`   🔑 QR Hash: ${notification.qr_code_hash?.slice(0, 16)}...`);
   } else {
@@ -0,0 +1,70 @@
+"""
+TicketBuster order archival job
+
+Maintenance for db_orders.orders, meant to run as a CronJob:
+
+1. Create upcoming monthly partitions (ORDERS_PARTITIONED=true only)
+2. Move QR images of past events (orders and cart seats) to
+   db_orders.orders_archive / db_orders.order_items_archive
+3. Archive and drop partitions older than the retention window
+   (ORDERS_PARTITIONED=true only, see k8s/partition_orders.sql)
+
+Usage:
+    python archive_orders.py                    # all steps, settings from env
+    python archive_orders.py --skip-retire      # never drop partitions
+    python archive_orders.py --grace-days 30 --retention-months 12
+"""
+import argparse
+import logging
+import sys
+
+from src.config import settings
+from src.database import init_database
+from src.partitioning import archive_past_event_qr, ensure_partitions, retire_partitions
+
+logging.basicConfig(
+    level=getattr(logging, settings.log_level.upper()),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.StreamHandler(sys.stdout)
+    ]
+)
+logger = logging.getLogger("archive-orders")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Partition maintenance and QR archival for db_orders.orders")
+    parser.add_argument("--months-ahead", type=int, default=settings.partition_months_ahead,
+                        help="Monthly partitions to create ahead of the current month")
+    parser.add_argument("--grace-days", type=int, default=settings.archive_grace_days,
+                        help="Days after an event before its QR codes are archived")
+    parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size,
+                        help="Tickets archived per transaction")
+    parser.add_argument("--retention-months", type=int, default=settings.partition_retention_months,
+                        help="Months kept besides the current one (0 = keep forever)")
+    parser.add_argument("--skip-partitions", action="store_true",
+                        help="Do not create upcoming partitions")
+    parser.add_argument("--skip-retire", action="store_true",
+                        help="Do not drop old partitions")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    init_database()
+
+    if settings.orders_partitioned and not args.skip_partitions:
+        ensure_partitions(args.months_ahead)
+
+    archive_past_event_qr(args.grace_days, args.batch_size)
+
+    if settings.orders_partitioned and not args.skip_retire:
+        retired = retire_partitions(args.retention_months)
+        if retired:
+            logger.info(f"Dropped {len(retired)} partitions: {', '.join(retired)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+TicketBuster worker concurrency benchmark
+
+Runs the same synthetic orders through the two ways one worker pod can
+use several cores, and reports throughput, latency and memory:
+
+    threads    WORKER_CONCURRENCY threads in one process, each generating
+               its order's QR code in-line. Parallel where the GIL is
+               released: CPU_LOAD_MODE=buffer, or any mode on a
+               free-threaded build (python3.13t) running without the GIL.
+    processes  The same threads hand QR generation to a spawn process pool
+               (PIPELINE_QR_PROCESSES): parallel on any build, at the cost
+               of one interpreter (and QR cache) per process.
+
+Each order costs one generate_qr_code call (CPU simulation + render) plus
+--io-ms of sleeping that stands in for its database and catalog round
+trips, which both modes overlap on the threads. Memory is the peak RSS of
+this process and its pool processes, sampled every 50ms.
+
+Usage:
+    python bench_concurrency.py --workers 8 --orders 200 --complexity 3
+    python bench_concurrency.py --mode threads --cpu-load-mode buffer
+    python3.13t -X gil=0 bench_concurrency.py --cpu-load-mode chain --json bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+
+from src.config import settings
+from src.qr_generator import generate_qr_code_timed, warm_up
+from src.startup import gil_enabled
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare thread-pool and process-pool order processing")
+    parser.add_argument("--mode", choices=["threads", "processes", "both"], default="both")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Threads (and pool processes) per mode")
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--complexity", type=int, default=3, help="processing_complexity of every order")
+    parser.add_argument("--io-ms", type=float, default=20.0, help="Simulated DB/catalog wait per order")
+    parser.add_argument("--cpu-load-mode", choices=["chain", "buffer"], default=settings.cpu_load_mode)
+    parser.add_argument("--json", help="Also write the results to this file")
+    return parser.parse_args()
+
+
+def rss_bytes(pid: int) -> int:
+    """Resident set size of a process (Linux /proc), 0 if it is gone."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+class PeakMemory:
+    """Samples the RSS of this process and its children until stopped."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def __enter__(self) -> "PeakMemory":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def sample(self) -> int:
+        pids = [os.getpid()] + [child.pid for child in multiprocessing.active_children()]
+        return sum(rss_bytes(pid) for pid in pids)
+
+    def _run(self):
+        while True:
+            self.peak = max(self.peak, self.sample())
+            if self._stop.wait(self.interval):
+                return
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run(mode: str, args) -> dict:
+    """Process --orders orders on --workers threads, QR codes in-line or on a process pool."""
+    pool: Optional[ProcessPoolExecutor] = None
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def order(seat_id: int):
+        started = time.perf_counter()
+        time.sleep(args.io_ms / 1000)  # upsert, commit, final update
+        ticket = dict(
+            order_uuid=str(uuid.uuid4()),
+            user_id=str(uuid.uuid4()),
+            event_id=1,
+            seat_id=seat_id,
+            processing_complexity=args.complexity
+        )
+        if pool is not None:
+            pool.submit(generate_qr_code_timed, **ticket).result()
+        else:
+            generate_qr_code_timed(**ticket)
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    with PeakMemory() as memory:
+        startup_started = time.perf_counter()
+        if mode == "processes":
+            pool = ProcessPoolExecutor(
+                max_workers=args.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_up
+            )
+            # Start every process (and import its modules) before timing
+            list(pool.map(time.sleep, [0.2] * args.workers))
+        startup = time.perf_counter() - startup_started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix=f"bench-{mode}") as threads:
+            list(threads.map(order, range(1, args.orders + 1)))
+        elapsed = time.perf_counter() - started
+
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    return {
+        "mode": mode,
+        "workers": args.workers,
+        "orders": args.orders,
+        "elapsed_s": round(elapsed, 3),
+        "orders_per_s": round(args.orders / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "peak_rss_mb": round(memory.peak / 2 ** 20, 1),
+        "startup_s": round(startup, 3),
+    }
+
+
+def main() -> int:
+    args = parse_args()
+    # Pool processes read settings from the environment
+    os.environ["CPU_LOAD_MODE"] = args.cpu_load_mode
+    settings.cpu_load_mode = args.cpu_load_mode
+    warm_up()
+
+    gil = gil_enabled()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}, "
+          f"CPU_LOAD_MODE={args.cpu_load_mode}, {os.cpu_count()} CPUs, "
+          f"{args.orders} orders x complexity {args.complexity} + {args.io_ms:g}ms I/O on {args.workers} workers")
+
+    modes = ["threads", "processes"] if args.mode == "both" else [args.mode]
+    results = [run(mode, args) for mode in modes]
+
+    print(f"{'mode':<10} {'orders/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'peak RSS MB':>12} {'startup s':>10}")
+    for result in results:
+        print(f"{result['mode']:<10} {result['orders_per_s']:>9} {result['p50_ms']:>8} {result['p95_ms']:>8} "
+              f"{result['peak_rss_mb']:>12} {result['startup_s']:>10}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "python": sys.version.split()[0],
+                "gil_enabled": gil,
+                "cpu_load_mode": args.cpu_load_mode,
+                "complexity": args.complexity,
+                "io_ms": args.io_ms,
+                "results": results,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+TicketBuster ticket manifest export
+
+Writes the memory-mappable ticket manifest of an event (see src/manifest.py)
+for gate devices that validate offline. A full manifest lists every
+completed ticket; --delta writes only tickets completed since the newest
+manifest of the event in the output directory.
+
+Files are named event-<id>-<full|delta>-<YYYYmmddTHHMMSS>.tbm (UTC), so
+sorting them by name gives the order a device applies them in.
+
+Usage:
+    python export_manifest.py 42                 # full manifest
+    python export_manifest.py 42 --delta         # late purchases since the last file
+    python export_manifest.py 42 --output-dir /mnt/gates
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from datetime import datetime
+
+from src.config import settings
+from src.database import init_database
+from src.log_config import configure_logging
+from src.manifest import read_watermark, write_manifest
+
+configure_logging()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export an event's ticket manifest for offline gates")
+    parser.add_argument("event_id", type=int)
+    parser.add_argument("--delta", action="store_true",
+                        help="Only tickets completed since the newest manifest in the output directory")
+    parser.add_argument("--output-dir", default=settings.manifest_dir)
+    return parser.parse_args()
+
+
+def latest_manifest(output_dir: str, event_id: int) -> str:
+    files = sorted(glob.glob(os.path.join(output_dir, f"event-{event_id}-*.tbm")),
+                   key=lambda name: os.path.basename(name).rsplit("-", 1)[-1])
+    return files[-1] if files else ""
+
+
+def main() -> int:
+    args = parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    since = None
+    if args.delta:
+        previous = latest_manifest(args.output_dir, args.event_id)
+        if not previous:
+            print(f"No manifest for event {args.event_id} in {args.output_dir}; export a full one first",
+                  file=sys.stderr)
+            return 1
+        since = read_watermark(previous) or datetime(1970, 1, 1)
+
+    init_database()
+    kind = "delta" if args.delta else "full"
+    path = os.path.join(
+        args.output_dir,
+        f"event-{args.event_id}-{kind}-{datetime.utcnow():%Y%m%dT%H%M%S}.tbm"
+    )
+    started = time.perf_counter()
+    count, _ = write_manifest(args.event_id, path, since)
+    print(f"{path}: {count} tickets in {time.perf_counter() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
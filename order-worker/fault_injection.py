@@ -0,0 +1,201 @@
+"""
+TicketBuster fault-injection harness
+
+Runs the real worker loop (process_order, retries, parking, circuit
+breaker, limiter) against stand-ins while injecting faults on a schedule
+(see src/faults.py), and reports how throughput held up:
+
+    goodput       distinct orders completed per second
+    redeliveries  messages delivered again (lost acks, retries)
+    duplicates    orders whose seat commit reached the catalog more than
+                  once, and orders completed more than once
+    recovery      per fault, time from its end until goodput is back to
+                  90% of the fault-free rate
+
+Synthetic orders (one seat each, fresh UUIDs) are fed into an in-memory
+broker at --rate for --duration seconds; the catalog is an in-process
+gRPC stand-in. Orders are written to the configured PostgreSQL.
+
+Usage:
+    python fault_injection.py --duration 60 --rate 20 \\
+        --fault 10:5:grpc_error=UNAVAILABLE \\
+        --fault 25:5:db_down \\
+        --fault 40:0:broker_close --fault 45:3:broker_down
+    python fault_injection.py --fault 10:10:grpc_latency=1.5 --json report.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.config import settings
+from src.database import get_engine
+from src.faults import FakeCatalog, FaultSchedule, FaultWindow, FaultyBroker, install_db_faults
+
+import main as worker
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure worker throughput under injected faults")
+    parser.add_argument("--fault", action="append", default=[], type=FaultWindow.parse,
+                        help="START:DURATION:KIND[=ARG] (repeatable), see src/faults.py")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of order traffic")
+    parser.add_argument("--rate", type=float, default=20.0, help="Orders per second")
+    parser.add_argument("--complexity", type=int, default=1, help="processing_complexity of every order")
+    parser.add_argument("--event-id", type=int, default=1)
+    parser.add_argument("--drain-timeout", type=float, default=120.0,
+                        help="Seconds to wait after the traffic for in-flight orders to finish")
+    parser.add_argument("--json", help="Also write the report to this file")
+    return parser.parse_args()
+
+
+def feed(broker: FaultyBroker, schedule: FaultSchedule, args, sent: List[str]):
+    """Publish orders at a constant rate, like the gateway."""
+    interval = 1.0 / args.rate
+    seat_id = 0
+    while schedule.now() < args.duration:
+        seat_id += 1
+        order_uuid = str(uuid.uuid4())
+        broker.publish_order(json.dumps({
+            "order_uuid": order_uuid,
+            "user_id": str(uuid.uuid4()),
+            "event_id": args.event_id,
+            "seat_id": seat_id,
+            "total_amount": 50.0,
+            "processing_complexity": args.complexity,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        }).encode())
+        sent.append(order_uuid)
+        delay = seat_id * interval - schedule.now()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def counted(callback, deliveries: Counter):
+    """Wrap process_order to count deliveries per order."""
+    def wrapper(message):
+        deliveries[message.order_uuid] += 1
+        return callback(message)
+    return wrapper
+
+
+def recovery_times(completions: List[float], schedule: FaultSchedule, end: float) -> List[Optional[float]]:
+    """Seconds from each fault's end until a 1s bucket reaches 90% of the fault-free goodput."""
+    buckets = Counter(int(at) for at in completions)
+    seconds = range(int(end) + 1)
+    faulty = {
+        second for second in seconds for window in schedule.windows
+        if window.start - 1 < second < window.end + 1
+    }
+    steady = [buckets[second] for second in seconds if second not in faulty and second > 0]
+    baseline = statistics.median(steady) if steady else 0
+    recovered = []
+    for window in schedule.windows:
+        after = [second for second in seconds if second >= window.end and buckets[second] >= 0.9 * baseline]
+        recovered.append(max(0.0, after[0] - window.end) if after and baseline else None)
+    return recovered
+
+
+def main() -> int:
+    args = parse_args()
+    schedule = FaultSchedule(args.fault)
+    # The catalog stand-in has no seat map or prices to validate against
+    settings.seat_price_check_enabled = False
+
+    catalog = FakeCatalog(schedule)
+    address = catalog.start()
+    worker.init_database()
+    remove_db_faults = install_db_faults(get_engine(), schedule)
+    worker.catalog_client = worker.CatalogClient(address)
+    worker.catalog_client.connect()
+    broker = FaultyBroker(schedule)
+    worker.rabbitmq = broker
+
+    sent: List[str] = []
+    deliveries: Counter = Counter()
+
+    schedule.start()
+    feeder = threading.Thread(target=feed, args=(broker, schedule, args, sent), name="fault-feeder", daemon=True)
+    feeder.start()
+
+    def settled() -> bool:
+        done = {n["data"]["order_uuid"] for n in broker.notifications}
+        return len(done) >= len(sent) and broker.queue_size(broker.parking_queue) == 0
+
+    def stop_when_settled():
+        feeder.join()
+        deadline = time.monotonic() + args.drain_timeout
+        while not settled() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        broker.stop_consuming()
+
+    threading.Thread(target=stop_when_settled, name="fault-monitor", daemon=True).start()
+    broker.call_later(settings.parked_resume_interval, worker.resume_parked_orders)
+    broker.consume(counted(worker.process_order, deliveries))
+    elapsed = schedule.now()
+
+    remove_db_faults()
+    worker.catalog_client.disconnect()
+    catalog.stop()
+
+    completed: Dict[str, float] = {}
+    completions = Counter()
+    failed = set()
+    for notification in broker.notifications:
+        order_uuid = notification["data"]["order_uuid"]
+        if notification["type"] == "order.completed":
+            completions[order_uuid] += 1
+            completed.setdefault(order_uuid, notification["at"])
+        else:
+            failed.add(order_uuid)
+    recovery = recovery_times(list(completed.values()), schedule, elapsed)
+
+    report = {
+        "sent": len(sent),
+        "completed": len(completed),
+        "failed": len(failed - completed.keys()),
+        "unfinished": len(set(sent) - completed.keys() - failed),
+        "elapsed_s": round(elapsed, 2),
+        "goodput_per_s": round(len(completed) / elapsed, 2) if elapsed else 0.0,
+        "deliveries": sum(deliveries.values()),
+        "redeliveries": sum(deliveries.values()) - len(deliveries),
+        "lost_acks": broker.redelivered,
+        "retries": broker.requeued,
+        "dead_lettered": broker.dead_lettered,
+        "duplicate_commits": sum(1 for n in catalog.commit_attempts.values() if n > 1),
+        "duplicate_completions": sum(1 for n in completions.values() if n > 1),
+        "catalog_calls": catalog.calls,
+        "catalog_errors": catalog.errors,
+        "broker_stall_s": round(broker.stalled, 2),
+        "faults": [
+            {"fault": str(window), "recovery_s": seconds}
+            for window, seconds in zip(schedule.windows, recovery)
+        ],
+    }
+
+    print(f"Sent {report['sent']} orders at {args.rate:g}/s: {report['completed']} completed, "
+          f"{report['failed']} failed, {report['unfinished']} unfinished in {report['elapsed_s']}s")
+    print(f"  goodput={report['goodput_per_s']}/s deliveries={report['deliveries']} "
+          f"redeliveries={report['redeliveries']} (lost acks={report['lost_acks']}, retries={report['retries']}) "
+          f"dead-lettered={report['dead_lettered']}")
+    print(f"  duplicate commits={report['duplicate_commits']} duplicate completions={report['duplicate_completions']} "
+          f"catalog calls={report['catalog_calls']} (errors={report['catalog_errors']}) "
+          f"broker stalled={report['broker_stall_s']}s")
+    for fault in report["faults"]:
+        recovered = "not recovered" if fault["recovery_s"] is None else f"recovered in {fault['recovery_s']:g}s"
+        print(f"  {fault['fault']}: {recovered}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,35 +16,56 @@ Architecture:
                                     PostgreSQL
 """
 import logging
+import platform
 import signal
 import sys
 import time
 import uuid
 import base64
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+from sqlalchemy import select
+
+# Marks the start of application imports for the startup timing breakdown
+_imports_started = time.perf_counter()
 
 from src.config import settings
-from src.database import init_database, get_session, health_check as db_health
+from src.cache import order_status_cache
+from src.partitioning import order_created_at, order_key
+from src.database import init_database, get_session, resize_pool, health_check as db_health
 from src.models import Order, OrderStatus
+from src import order_state
 from src.rabbitmq import RabbitMQConnection, OrderMessage
 from src.grpc_client import CatalogClient
-from src.qr_generator import generate_qr_code
+from src.circuit_breaker import CircuitState
+from src.sold_seats import sold_seats, SEAT_ALREADY_SOLD
+from src.seat_prices import seat_prices
+from src.metrics import metrics, start_metrics_server
+from src.timings import StageTimings
+from src.reload import reloader
+from src import log_config
+from src.log_config import configure_logging
+from src.qr_generator import generate_qr_code, generate_qr_code_timed, warm_up as warm_up_qr
+from src import cart
+from src.cart import SeatTicket
+from src.pipeline import Pipeline, Stage
+from src.startup import StartupTimer, connect_dependencies, gil_enabled
+
+_imports_finished = time.perf_counter()
 
 # Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+configure_logging()
 logger = logging.getLogger("order-worker")
 
 # Global state for graceful shutdown
 shutdown_requested = False
 rabbitmq: Optional[RabbitMQConnection] = None
 catalog_client: Optional[CatalogClient] = None
+order_server = None  # grpc.Server for OrderService, started in main()
+order_pipeline: Optional[Pipeline] = None  # with PIPELINE_ENABLED or WORKER_CONCURRENCY > 1
 
 
 def signal_handler(signum, frame):
@@ -57,175 +78,633 @@ def signal_handler(signum, frame):
         rabbitmq._channel.stop_consuming()
 
 
+def reload_handler(signum, frame):
+    """SIGHUP: reload configuration on the consumer thread's next poll."""
+    logger.info("Received SIGHUP, reloading configuration")
+    reloader.request()
+
+
+@dataclass
+class OrderJob:
+    """An order on its way through the processing steps."""
+    message: OrderMessage
+    timings: StageTimings
+    start_time: float = field(default_factory=time.time)
+    order_uuid: Optional[uuid.UUID] = None
+    user_uuid: Optional[uuid.UUID] = None
+    created_at: Optional[datetime] = None
+    tickets: List[SeatTicket] = field(default_factory=list)
+    qr_hash: str = ""
+    qr_bytes: bytes = b""
+    qr_time: float = 0.0
+    processing_time_ms: int = 0
+    # Owns the order's processing lease once _persist_order started it
+    token: uuid.UUID = field(default_factory=uuid.uuid4)
+    
+    @classmethod
+    def start(cls, message: OrderMessage) -> "OrderJob":
+        return cls(message, StageTimings.start(message.timestamp))
+
+
 def process_order(message: OrderMessage) -> bool:
     """
     Process a single order message.
     
     Steps:
-    1. Create/update order record in database (status: processing)
+    1. Upsert order record in database (status: processing)
     2. Generate QR code with CPU simulation
     3. Call gRPC to commit seat purchase
     4. Update order status (completed/failed)
     5. Publish notification
     
+    Cart orders (several seat_ids) go through the same steps as one unit:
+    one QR ticket per seat, generated in parallel, and a single
+    all-or-nothing seat commit (see src/cart.py).
+    
+    The steps are the _validate_order ... _notify_order functions below;
+    with PIPELINE_ENABLED they run as the stages of a pipeline instead
+    (see build_pipeline). A step returns a result to end the order early.
+    
     Args:
         message: OrderMessage from RabbitMQ
         
     Returns:
         True if processing successful, False if should retry
     """
-    global catalog_client, rabbitmq
-    
-    order_uuid_str = message.order_uuid
-    start_time = time.time()
+    return _run_steps(OrderJob.start(message))
+
+
+def _run_steps(job: OrderJob) -> bool:
+    """Run every step of an order in turn on this thread."""
+    for step in ORDER_STEPS:
+        try:
+            result = step(job)
+        except Exception as e:
+            return _error_order(job, e)
+        if result is not None:
+            return result
+    return True
+
+
+def _validate_order(job: OrderJob) -> Optional[bool]:
+    """Check the message, its UUIDs and its seats/amount before the order is started."""
+    message = job.message
     
     # Validate required fields
-    if not order_uuid_str or not message.user_id:
+    if not message.order_uuid or not message.user_id:
         logger.error(f"Invalid message: missing order_uuid or user_id")
         return True  # Don't retry invalid messages
     
     # Convert string UUIDs to UUID objects
     try:
-        order_uuid = uuid.UUID(order_uuid_str)
-        user_uuid = uuid.UUID(message.user_id)
+        job.order_uuid = uuid.UUID(message.order_uuid)
+        job.user_uuid = uuid.UUID(message.user_id)
     except ValueError as e:
         logger.error(f"Invalid UUID format: {e}")
         return True  # Don't retry invalid UUIDs
     
-    logger.info(f"Processing order {order_uuid} (complexity: {message.processing_complexity})")
+    logger.info("Processing order %s (complexity: %s)", message.order_uuid, message.processing_complexity)
+    
+    # Unknown seats or a wrong amount: reject before saving or any CPU work
+    if settings.seat_price_check_enabled:
+        reason = seat_prices.check(message.event_id, message.seats, message.total_amount, _load_seat_prices)
+        if reason is not None:
+            return _reject_order(message, job.order_uuid, job.user_uuid, reason)
+    return None
+
+
+def _persist_order(job: OrderJob) -> Optional[bool]:
+    """Step 1: save the order as PROCESSING; fail or park it early when it cannot succeed."""
+    message = job.message
+    order_uuid = job.order_uuid
     
+    # Upsert keyed by the gateway timestamp so redeliveries hit the same
+    # partition and row
+    job.created_at = order_created_at(message.timestamp)
     try:
-        # Step 1: Create/update order in database
-        with get_session() as session:
-            order = session.query(Order).filter_by(order_uuid=order_uuid).first()
-            
-            if not order:
-                # Create new order
-                order = Order(
-                    order_uuid=order_uuid,
-                    user_id=user_uuid,
-                    event_id=message.event_id,
-                    seat_id=message.seat_id,
-                    total_amount=message.total_amount,
-                    processing_complexity=message.processing_complexity,
-                    payment_reference=message.payment_reference,
-                    status='PROCESSING',
-                    created_at=datetime.utcnow()
-                )
-                session.add(order)
-            else:
-                # Update existing order
-                order.status = 'PROCESSING'
-                order.updated_at = datetime.utcnow()
+        with job.timings.stage("db"), get_session() as session:
+            if job.created_at is None:
+                job.created_at = session.execute(
+                    select(Order.created_at).where(Order.order_uuid == order_uuid)
+                ).scalar() or datetime.utcnow()
             
-            session.flush()  # Get the order ID
-            order_id = order.id
-        
-        logger.info(f"Order {order_uuid} saved to database (id: {order_id})")
-        
-        # Step 2: Generate QR code with CPU simulation
-        qr_hash, qr_bytes, qr_time = generate_qr_code(
-            order_uuid=str(order_uuid),
-            user_id=str(user_uuid),
-            event_id=message.event_id,
-            seat_id=message.seat_id,
-            processing_complexity=message.processing_complexity
-        )
-        
-        logger.info(f"QR code generated in {qr_time:.3f}s, hash: {qr_hash[:16]}...")
-        
-        # Step 3: Commit seat via gRPC
-        commit_result = catalog_client.commit_seat(
-            seat_id=message.seat_id,
-            user_id=str(user_uuid),
-            order_uuid=str(order_uuid),
-            amount_paid=message.total_amount
+            started = order_state.start_processing(
+                session,
+                job.token,
+                order_uuid=order_uuid,
+                user_id=job.user_uuid,
+                event_id=message.event_id,
+                seat_id=message.seat_id,
+                total_amount=message.total_amount,
+                processing_complexity=message.processing_complexity,
+                payment_reference=message.payment_reference,
+                created_at=job.created_at
+            )
+            if started is not None and message.is_cart:
+                cart.save_items(session, order_uuid, message.event_id, message.seats)
+    except order_state.OrderLeased as e:
+        # Duplicate or redelivered while another delivery works on it: try
+        # again later, when it has finished or its lease ran out
+        return _park_order(job, str(e), release=False)
+    
+    if started is None:
+        # Another delivery already completed (or cancelled) this order
+        logger.info("Order %s already handled, skipping", message.order_uuid)
+        return True
+    
+    order_id, job.created_at = started
+    order_status_cache.invalidate(str(order_uuid))
+    
+    logger.info("Order %s saved to database (id: %s)", message.order_uuid, order_id)
+    
+    # Seat already known to be sold: fail before any CPU work
+    if settings.sold_seat_cache_enabled:
+        sold_seats.warm_async(message.event_id, catalog_client.get_sold_seats)
+        if any(sold_seats.is_sold(message.event_id, seat_id) for seat_id in message.seats):
+            return _fail_order(
+                message, order_uuid, job.user_uuid, job.created_at, SEAT_ALREADY_SOLD, job.timings, job.token
+            )
+    
+    # Catalog circuit open: park now instead of burning CPU on a QR
+    # code for an order that cannot be committed yet
+    if catalog_client.breaker.is_open():
+        return _park_order(job, "Catalog Service circuit open")
+    return None
+
+
+def _generate_qr(job: OrderJob, pool: Optional[Executor] = None) -> None:
+    """
+    Step 2: generate the QR code (one ticket per seat for a cart).
+    
+    With a process pool (PIPELINE_QR_PROCESSES) every ticket is generated
+    there; the CPU simulation then runs in parallel even in chain mode.
+    """
+    message = job.message
+    ticket_args = dict(
+        order_uuid=str(job.order_uuid),
+        user_id=str(job.user_uuid),
+        event_id=message.event_id,
+        processing_complexity=message.processing_complexity
+    )
+    if pool is not None:
+        futures = [pool.submit(generate_qr_code_timed, seat_id=seat_id, **ticket_args) for seat_id in message.seats]
+        tickets, seat_timings = [], []
+        for seat_id, future in zip(message.seats, futures):
+            qr_hash, qr_bytes, qr_time, timings = future.result()
+            tickets.append(SeatTicket(seat_id, qr_hash, qr_bytes, qr_time))
+            seat_timings.append(timings)
+        job.timings.cpu_sim_ms += max(timings.cpu_sim_ms for timings in seat_timings)
+        job.timings.qr_render_ms += max(timings.qr_render_ms for timings in seat_timings)
+        job.qr_hash, job.qr_bytes = tickets[0].qr_hash, tickets[0].qr_bytes
+        job.qr_time = max(ticket.qr_time for ticket in tickets)
+        if message.is_cart:
+            job.tickets = tickets
+    elif message.is_cart:
+        job.tickets = cart.generate_tickets(seat_ids=message.seats, timings=job.timings, **ticket_args)
+        job.qr_hash, job.qr_bytes = job.tickets[0].qr_hash, job.tickets[0].qr_bytes
+        job.qr_time = max(ticket.qr_time for ticket in job.tickets)
+    else:
+        job.qr_hash, job.qr_bytes, job.qr_time = generate_qr_code(
+            seat_id=message.seat_id, timings=job.timings, **ticket_args
         )
-        
-        if not commit_result.success:
-            # Seat commit failed - update order as failed
-            with get_session() as session:
-                order = session.query(Order).filter_by(order_uuid=order_uuid).first()
-                if order:
-                    order.status = 'FAILED'
-                    order.error_message = commit_result.message
-                    order.updated_at = datetime.utcnow()
-            
-            # Publish failure notification
-            rabbitmq.publish_notification(
-                "order.failed",
-                {
-                    "order_uuid": str(order_uuid),
-                    "user_id": str(user_uuid),
-                    "event_id": message.event_id,
-                    "seat_id": message.seat_id,
-                    "error": commit_result.message,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
+    
+    logger.info(
+        "QR code generated in %.3fs, hash: %.16s...", job.qr_time, job.qr_hash,
+        extra={"qr_ms": int(job.qr_time * 1000)}
+    )
+    return None
+
+
+def _commit_order(job: OrderJob) -> Optional[bool]:
+    """Step 3: commit the seat(s) via gRPC."""
+    message = job.message
+    with job.timings.stage("commit"):
+        if message.is_cart:
+            commit_result = catalog_client.commit_seats(
+                seat_ids=message.seats,
+                user_id=str(job.user_uuid),
+                order_uuid=str(job.order_uuid),
+                amount_paid=message.total_amount
             )
-            
-            logger.error(f"Order {order_uuid} failed: {commit_result.message}")
-            return True  # Don't retry - this is a business logic failure
-        
-        # Step 4: Update order as completed
-        processing_time_ms = int((time.time() - start_time) * 1000)
-        
-        # Encode QR to base64
-        qr_base64 = base64.b64encode(qr_bytes).decode('utf-8')
-        
-        with get_session() as session:
-            order = session.query(Order).filter_by(order_uuid=order_uuid).first()
-            if order:
-                order.status = 'COMPLETED'
-                order.qr_code_hash = qr_hash
-                order.qr_code_base64 = qr_base64
-                order.completed_at = datetime.utcnow()
-                order.updated_at = datetime.utcnow()
-        
-        # Step 5: Publish success notification
-        rabbitmq.publish_notification(
-            "order.completed",
-            {
-                "order_uuid": str(order_uuid),
-                "user_id": str(user_uuid),
-                "event_id": message.event_id,
-                "seat_id": message.seat_id,
-                "qr_code_hash": qr_hash,
-                "total_amount": message.total_amount,
-                "processing_time_ms": processing_time_ms,
-                "completed_at": datetime.utcnow().isoformat()
-            }
+        else:
+            commit_result = catalog_client.commit_seat(
+                seat_id=message.seat_id,
+                user_id=str(job.user_uuid),
+                order_uuid=str(job.order_uuid),
+                amount_paid=message.total_amount
+            )
+    
+    if not commit_result.success and commit_result.retryable:
+        # Catalog unavailable - not the order's fault, park it for later
+        return _park_order(job, commit_result.message)
+    
+    if not commit_result.success:
+        if commit_result.message == SEAT_ALREADY_SOLD:
+            for seat_id in commit_result.unavailable_seat_ids or [message.seat_id]:
+                sold_seats.mark_sold(message.event_id, seat_id)
+        elif settings.seat_price_check_enabled:
+            # The price table let through an order the catalog refused:
+            # it may be stale, reload it on the event's next order
+            seat_prices.invalidate_event(message.event_id)
+        # Seat commit failed - this is a business logic failure, don't retry
+        return _fail_order(
+            message, job.order_uuid, job.user_uuid, job.created_at, commit_result.message, job.timings, job.token
         )
-        
-        total_time = time.time() - start_time
-        logger.info(
-            f"Order {order_uuid} completed successfully in {total_time:.3f}s "
-            f"(QR: {qr_time:.3f}s, total: {processing_time_ms}ms)"
+    
+    for seat_id in message.seats:
+        sold_seats.mark_sold(message.event_id, seat_id)
+    return None
+
+
+def _finalize_order(job: OrderJob) -> Optional[bool]:
+    """Step 4: mark the order COMPLETED with its QR code."""
+    order_uuid = job.order_uuid
+    job.processing_time_ms = int((time.time() - job.start_time) * 1000)
+    
+    # Encode QR to base64
+    qr_base64 = base64.b64encode(job.qr_bytes).decode('utf-8')
+    
+    with get_session() as session:
+        completed = order_state.transition(
+            session, order_uuid, job.created_at, OrderStatus.COMPLETED, job.token,
+            qr_code_hash=job.qr_hash,
+            qr_code_base64=qr_base64,
+            completed_at=datetime.utcnow()
         )
-        
+        if completed:
+            if job.tickets:
+                cart.complete_items(session, order_uuid, job.tickets)
+            job.timings.record(session, order_uuid, job.message.event_id, job.created_at, 'COMPLETED')
+    order_status_cache.invalidate(str(order_uuid))
+    
+    if not completed:
+        # Handled by another delivery; it notifies the user
         return True
-        
-    except Exception as e:
-        logger.exception(f"Error processing order {order_uuid_str}: {e}")
-        
-        # Try to update order as failed
-        try:
-            with get_session() as session:
-                order = session.query(Order).filter_by(order_uuid=order_uuid).first()
-                if order:
-                    order.status = 'FAILED'
-                    order.error_message = str(e)
-                    order.updated_at = datetime.utcnow()
-        except Exception as db_error:
-            logger.error(f"Failed to update order status: {db_error}")
-        
-        # Return False to trigger retry/DLQ logic
+    return None
+
+
+def _notify_order(job: OrderJob) -> bool:
+    """Step 5: publish the success notification."""
+    message = job.message
+    notification = {
+        "order_uuid": str(job.order_uuid),
+        "user_id": str(job.user_uuid),
+        "event_id": message.event_id,
+        "seat_id": message.seat_id,
+        "qr_code_hash": job.qr_hash,
+        "total_amount": message.total_amount,
+        "processing_time_ms": job.processing_time_ms,
+        "completed_at": datetime.utcnow().isoformat()
+    }
+    if job.tickets:
+        notification["seats"] = [
+            {"seat_id": ticket.seat_id, "qr_code_hash": ticket.qr_hash} for ticket in job.tickets
+        ]
+    rabbitmq.publish_notification("order.completed", notification)
+    
+    total_time = time.time() - job.start_time
+    logger.info(
+        "Order %s completed successfully in %.3fs (QR: %.3fs, total: %dms)",
+        message.order_uuid, total_time, job.qr_time, job.processing_time_ms,
+        extra={"duration_ms": job.processing_time_ms, "qr_ms": int(job.qr_time * 1000)}
+    )
+    
+    return True
+
+
+def _error_order(job: OrderJob, error: Exception) -> bool:
+    """
+    A step raised: mark the order FAILED (it is retried).
+    
+    Returns:
+        False to trigger retry/DLQ logic
+    """
+    logger.exception(f"Error processing order {job.message.order_uuid}: {error}")
+    if job.order_uuid is None:
         return False
+    
+    # Try to update order as failed
+    try:
+        with get_session() as session:
+            order_state.transition(
+                session, job.order_uuid, job.created_at, OrderStatus.FAILED, job.token,
+                error_message=str(error)
+            )
+        order_status_cache.invalidate(str(job.order_uuid))
+    except Exception as db_error:
+        logger.error(f"Failed to update order status: {db_error}")
+    
+    return False
+
+
+ORDER_STEPS = (_validate_order, _persist_order, _generate_qr, _commit_order, _finalize_order, _notify_order)
+
+
+def build_pipeline() -> Pipeline:
+    """The order steps as pipeline stages, sized by the PIPELINE_* settings."""
+    queue_size = settings.pipeline_queue_size
+    return Pipeline(
+        [
+            Stage("validate", _validate_order, settings.pipeline_validate_workers, queue_size),
+            Stage("persist", _persist_order, settings.pipeline_persist_workers, queue_size),
+            Stage("qr", _generate_qr, settings.pipeline_qr_workers, queue_size, settings.pipeline_qr_processes),
+            Stage("commit", _commit_order, settings.pipeline_commit_workers, queue_size),
+            Stage("finalize", _finalize_order, settings.pipeline_finalize_workers, queue_size),
+            Stage("notify", _notify_order, settings.pipeline_notify_workers, queue_size),
+        ],
+        on_error=_error_order
+    )
+
+
+def build_order_pool() -> Pipeline:
+    """
+    WORKER_CONCURRENCY threads, each running all the steps of one order
+    at a time (a single-stage pipeline).
+    
+    Shared state reached from these threads is lock-protected or
+    thread-safe by design (gRPC channel, session factory, caches), and
+    broker calls run on the consumer thread, so this mode is also safe on
+    a free-threaded build, where the CPU simulation runs in parallel in
+    either CPU_LOAD_MODE.
+    """
+    return Pipeline(
+        [Stage("order", _run_steps, settings.worker_concurrency, settings.worker_concurrency)],
+        on_error=_error_order
+    )
+
+
+def submit_order(message: OrderMessage) -> Future:
+    """
+    Consumer callback with an order pool or pipeline: the message is settled when its job finishes.
+
+    Never blocks the connection thread, which settles finished jobs and
+    publishes for the stages: a full pipeline raises PipelineFull and the
+    consumer requeues the message.
+    """
+    return order_pipeline.submit(OrderJob.start(message), block=False)
+
+
+def _fail_order(
+    message: OrderMessage,
+    order_uuid: uuid.UUID,
+    user_uuid: uuid.UUID,
+    created_at: Optional[datetime],
+    error: str,
+    timings: Optional[StageTimings] = None,
+    token: Optional[uuid.UUID] = None
+) -> bool:
+    """
+    Mark an order FAILED for a business reason and notify the user.
+    
+    The order's stage timings, if given, are recorded with the status update.
+    token is the processing lease of the delivery that started the order.
+    Nothing is published if another delivery already completed the order.
+    
+    Returns:
+        True (the message is acked, never retried)
+    """
+    with get_session() as session:
+        failed = order_state.transition(
+            session, order_uuid, created_at, OrderStatus.FAILED, token,
+            error_message=error
+        )
+        if failed and timings is not None:
+            timings.record(session, order_uuid, message.event_id, created_at, 'FAILED')
+    order_status_cache.invalidate(str(order_uuid))
+    if not failed:
+        return True
+    
+    # Publish failure notification
+    notification = {
+        "order_uuid": str(order_uuid),
+        "user_id": str(user_uuid),
+        "event_id": message.event_id,
+        "seat_id": message.seat_id,
+        "error": error,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    if message.is_cart:
+        notification["seats"] = [{"seat_id": seat_id} for seat_id in message.seats]
+    rabbitmq.publish_notification("order.failed", notification)
+    
+    logger.error(f"Order {order_uuid} failed: {error}")
+    return True
+
+
+def _reject_order(message: OrderMessage, order_uuid: uuid.UUID, user_uuid: uuid.UUID, error: str) -> bool:
+    """
+    Reject an order that failed validation.
+    
+    A first delivery is rejected without being saved. If an earlier
+    delivery already saved the order (a retry or redelivery), the row is
+    moved to FAILED like any business failure instead; nothing is
+    published when it is COMPLETED or still owned by another delivery.
+    
+    Returns:
+        True (the message is acked, never retried)
+    """
+    with get_session() as session:
+        created_at = session.execute(
+            select(Order.created_at).filter_by(**order_key(order_uuid, order_created_at(message.timestamp)))
+        ).scalar()
+    if created_at is not None:
+        return _fail_order(message, order_uuid, user_uuid, created_at, error)
+    
+    notification = {
+        "order_uuid": str(order_uuid),
+        "user_id": str(user_uuid),
+        "event_id": message.event_id,
+        "seat_id": message.seat_id,
+        "error": error,
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    if message.is_cart:
+        notification["seats"] = [{"seat_id": seat_id} for seat_id in message.seats]
+    rabbitmq.publish_notification("order.failed", notification)
+    
+    logger.warning(f"Order {order_uuid} rejected: {error}")
+    return True
+
+
+def _load_seat_prices(event_id: int) -> Optional[dict]:
+    """Seat prices of an event from the catalog; also refreshes the sold-seat cache."""
+    seats = catalog_client.list_event_seats(event_id)
+    if seats is None:
+        return None
+    sold_seats.load(event_id, [seat.seat_id for seat in seats if seat.sold])
+    return {seat.seat_id: seat.price for seat in seats}
+
+
+def _park_order(job: OrderJob, reason: str, release: bool = True) -> bool:
+    """
+    Park an order while the catalog is unavailable.
+    
+    The order stays PROCESSING in the database and is resumed by
+    resume_parked_orders once the circuit breaker lets calls through.
+    Its processing lease is released first (release=False when this
+    delivery never got it), so the resumed delivery can start it again.
+    
+    Returns:
+        True if parked (ack the original), False to requeue it instead
+    """
+    if release:
+        with get_session() as session:
+            order_state.release(session, job.order_uuid, job.created_at, job.token)
+    return rabbitmq.park_order(job.message, reason)
+
+
+def resume_parked_orders():
+    """
+    Periodic task (runs on the consumer thread) that moves parked orders
+    back to orders_queue: all of them once the catalog circuit is closed,
+    one at a time as probes while it is half-open.
+    """
+    try:
+        breaker = catalog_client.breaker
+        if breaker.state == CircuitState.CLOSED:
+            rabbitmq.unpark_orders(settings.parked_resume_batch)
+        elif breaker.ready_for_probe():
+            rabbitmq.unpark_orders(1)
+    except Exception as e:
+        logger.error(f"Failed to resume parked orders: {e}")
+    finally:
+        if not shutdown_requested and rabbitmq.health_check():
+            rabbitmq.call_later(settings.parked_resume_interval, resume_parked_orders)
+
+
+def reload_config():
+    """
+    Periodic task (runs on the consumer thread) that applies configuration
+    changes from CONFIG_RELOAD_FILE or requested by SIGHUP.
+    """
+    try:
+        reloader.poll()
+    except Exception as e:
+        logger.error(f"Failed to reload configuration: {e}")
+    finally:
+        if not shutdown_requested and rabbitmq.health_check():
+            rabbitmq.call_later(settings.config_reload_interval, reload_config)
+
+
+def schedule_periodic_tasks():
+    """
+    Arm the consumer-thread timers of resume_parked_orders and reload_config.
+    
+    Each re-arms itself while the connection is healthy; the timers die
+    with the connection, so this runs again after every reconnect.
+    """
+    rabbitmq.call_later(settings.parked_resume_interval, resume_parked_orders)
+    rabbitmq.call_later(settings.config_reload_interval, reload_config)
+
+
+def register_reload_hooks():
+    """Push reloaded settings into the live objects that copied them."""
+    def apply_breaker():
+        breaker = catalog_client.breaker
+        breaker.failure_rate = settings.catalog_breaker_failure_rate
+        breaker.min_calls = settings.catalog_breaker_min_calls
+        breaker.open_seconds = settings.catalog_breaker_open_seconds
+        breaker.half_open_calls = settings.catalog_breaker_half_open_calls
+    
+    def apply_limiter():
+        limiter = catalog_client.limiter
+        limiter.set_bounds(settings.catalog_limit_min, settings.catalog_limit_max)
+        limiter.backoff_ratio = settings.catalog_limit_backoff
+        limiter.latency_tolerance = settings.catalog_limit_latency_tolerance
+    
+    def apply_grpc_timeout():
+        catalog_client.timeout = settings.grpc_commit_timeout
+    
+    def apply_ttls():
+        sold_seats.ttl = settings.sold_seat_cache_ttl
+        order_status_cache.ttl = settings.order_status_cache_ttl
+        seat_prices.ttl = settings.seat_price_cache_ttl
+    
+    def apply_log_level():
+        logging.getLogger().setLevel(getattr(logging, settings.log_level.upper()))
+    
+    reloader.on_change(["prefetch_count"], lambda: rabbitmq.set_prefetch(_prefetch_count()))
+    reloader.on_change(["db_pool_size", "db_max_overflow"], resize_pool)
+    reloader.on_change(["grpc_commit_timeout"], apply_grpc_timeout)
+    reloader.on_change([
+        "catalog_breaker_failure_rate", "catalog_breaker_min_calls",
+        "catalog_breaker_open_seconds", "catalog_breaker_half_open_calls",
+    ], apply_breaker)
+    reloader.on_change([
+        "catalog_limit_min", "catalog_limit_max",
+        "catalog_limit_backoff", "catalog_limit_latency_tolerance",
+    ], apply_limiter)
+    reloader.on_change(["sold_seat_cache_ttl", "order_status_cache_ttl", "seat_price_cache_ttl"], apply_ttls)
+    reloader.on_change(["log_level"], apply_log_level)
+
+
+def _prefetch_count() -> int:
+    """
+    PREFETCH_COUNT, or what the order pool or pipeline admits split over the consumers.
+
+    basic.qos limits each consumer on the channel (and quorum shard queues
+    ignore a channel-wide limit), so with shard queues every consumer gets
+    an equal share of max_inflight. Deliveries beyond it, e.g. while
+    set_prefetch re-subscribes, are refused by submit_order and requeued.
+    """
+    if not order_pipeline:
+        return settings.prefetch_count
+    return max(1, order_pipeline.max_inflight // rabbitmq.consumer_count)
+
+
+def _drain_pipeline():
+    """Let the orders in flight finish and settle their messages, then stop the stages."""
+    deadline = time.monotonic() + settings.pipeline_drain_timeout
+    try:
+        while not order_pipeline.wait_idle(0) and time.monotonic() < deadline:
+            rabbitmq.process_events(0.1)
+    except Exception as e:
+        logger.error(f"Failed to settle orders in flight: {e}")
+    order_pipeline.shutdown()
+    try:
+        rabbitmq.process_events()
+    except Exception as e:
+        logger.error(f"Failed to settle orders in flight: {e}")
+
+
+def register_metrics():
+    """Expose catalog client state as gauges."""
+    states = list(CircuitState)
+    metrics.gauge(
+        "catalog_concurrency_limit",
+        "Current adaptive limit on in-flight CommitSeat calls",
+        lambda: catalog_client.limiter.limit
+    )
+    metrics.gauge(
+        "catalog_inflight_calls",
+        "CommitSeat calls currently in flight",
+        lambda: catalog_client.limiter.inflight
+    )
+    metrics.gauge(
+        "sold_seat_cache_hits",
+        "Orders failed early because their seat was known to be sold",
+        lambda: sold_seats.hits
+    )
+    metrics.gauge(
+        "log_records_dropped",
+        "Log records dropped because the async log queue was full",
+        lambda: log_config.dropped_records
+    )
+    metrics.gauge(
+        "python_gil_enabled",
+        "1 if the GIL is in effect, 0 on a free-threaded Python running without it",
+        lambda: int(gil_enabled())
+    )
+    metrics.gauge(
+        "catalog_circuit_state",
+        "Catalog circuit breaker state (0=closed, 1=open, 2=half-open)",
+        lambda: states.index(catalog_client.breaker.state)
+    )
 
 
 def main():
     """Main entry point for the Order Worker daemon."""
-    global rabbitmq, catalog_client
+    global rabbitmq, catalog_client, order_server, order_pipeline
     
     logger.info("=" * 60)
     logger.info("TicketBuster Order Worker starting...")
@@ -236,40 +715,82 @@ def main():
     # Register signal handlers for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGHUP, reload_handler)
     
-    # Initialize database connection
-    logger.info("Connecting to database...")
-    try:
-        init_database()
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
-        sys.exit(1)
+    timer = StartupTimer(started_at=_imports_started)
+    timer.record("imports", _imports_finished - _imports_started)
     
-    # Initialize gRPC client
-    logger.info("Initializing gRPC client for Catalog Service...")
     catalog_client = CatalogClient()
-    catalog_client.connect()
-    
-    # Initialize RabbitMQ connection
-    logger.info("Connecting to RabbitMQ...")
     rabbitmq = RabbitMQConnection()
+    register_reload_hooks()
     
-    max_retries = 5
-    for attempt in range(max_retries):
-        if rabbitmq.connect():
-            break
-        logger.warning(f"RabbitMQ connection attempt {attempt + 1}/{max_retries} failed")
-        time.sleep(5)
-    else:
+    if settings.metrics_enabled:
+        register_metrics()
+        start_metrics_server()
+    
+    def connect_catalog() -> bool:
+        # The channel reconnects on demand, so an unreachable catalog
+        # only delays the first CommitSeat instead of blocking startup
+        catalog_client.connect()
+        if not catalog_client.wait_for_ready():
+            logger.warning("Catalog Service not reachable yet, continuing startup")
+        return True
+    
+    # Connect to all dependencies concurrently (each with jittered retries)
+    logger.info("Connecting to database, Catalog Service and RabbitMQ...")
+    results = connect_dependencies(
+        {
+            "database": init_database,
+            "catalog": connect_catalog,
+            "rabbitmq": rabbitmq.connect,
+            "qr_warmup": warm_up_qr,
+        },
+        timer
+    )
+    
+    if not results["database"]:
+        logger.error("Failed to initialize database after multiple attempts")
+        sys.exit(1)
+    
+    if not results["rabbitmq"]:
         logger.error("Failed to connect to RabbitMQ after multiple attempts")
         sys.exit(1)
     
+    logger.info(f"Startup completed in {timer.elapsed():.3f}s ({timer.summary()})")
+    
+    gil = gil_enabled()
+    logger.info(f"Python {platform.python_version()}, GIL {'enabled' if gil else 'disabled'}")
+    if gil and settings.order_concurrency > 1 and settings.cpu_load_mode == "chain" and not settings.pipeline_qr_processes:
+        logger.warning(
+            "Orders run on several threads but the chain CPU simulation holds the GIL: "
+            "use CPU_LOAD_MODE=buffer, PIPELINE_QR_PROCESSES or a free-threaded Python"
+        )
+    
+    # Serve order reads (imported here to keep grpc off the startup path)
+    if settings.order_server_enabled:
+        from src.order_service import start_order_server, stop_order_server
+        order_server = start_order_server()
+    
     # Start consuming messages
     logger.info(f"Starting to consume from queue: {settings.orders_queue}")
     logger.info("Worker is ready and waiting for orders...")
     
+    schedule_periodic_tasks()
+    rabbitmq.on_reconnect(schedule_periodic_tasks)
+    
+    if settings.pipeline_enabled:
+        order_pipeline = build_pipeline()
+    elif settings.worker_concurrency > 1:
+        order_pipeline = build_order_pool()
+    if order_pipeline:
+        order_pipeline.start()
+        if settings.metrics_enabled:
+            order_pipeline.register_metrics()
+        # Backpressure: the broker stops delivering once the pipeline is full
+        rabbitmq.set_prefetch(_prefetch_count())
+    
     try:
-        rabbitmq.consume(process_order)
+        rabbitmq.consume(submit_order if order_pipeline else process_order)
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
     except Exception as e:
@@ -278,12 +799,20 @@ def main():
         # Cleanup
         logger.info("Shutting down worker...")
         
+        if order_pipeline:
+            _drain_pipeline()
+        
         if rabbitmq:
             rabbitmq.disconnect()
         
+        cart.shutdown()
+        
         if catalog_client:
             catalog_client.disconnect()
         
+        if order_server:
+            stop_order_server(order_server)
+        
         logger.info("Order Worker stopped")
 
 
@@ -0,0 +1,120 @@
+"""
+TicketBuster DLQ replay tool
+
+Drains orders_queue_dlq in parallel, filters the dead letters and replays
+them with retry_count reset, at a bounded rate.
+
+Usage:
+    python replay_dlq.py --dry-run                       # report only
+    python replay_dlq.py --event-id 42 --rate 100        # republish to orders_queue
+    python replay_dlq.py --error "UNAVAILABLE|timeout" --older-than 10m
+    python replay_dlq.py --process --concurrency 8       # run process_order in-line
+
+Non-matching messages stay in the DLQ.
+"""
+import argparse
+import sys
+import threading
+
+from src.config import settings
+from src.dlq import DLQReplayer, ReplayFilter, parse_duration
+from src.rabbitmq import RabbitMQConnection
+
+import main as worker
+
+
+class _ThreadLocalRabbitMQ:
+    """
+    Stand-in for main.rabbitmq when process_order runs on several threads:
+    pika connections are not thread-safe, so each thread gets its own.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _get(self) -> RabbitMQConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = RabbitMQConnection()
+            if not connection.connect():
+                raise RuntimeError("Could not connect to RabbitMQ")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def close_all(self):
+        with self._lock:
+            for connection in self._connections:
+                connection.disconnect()
+            self._connections.clear()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=f"Replay dead-lettered orders from {settings.orders_queue}_dlq")
+    parser.add_argument("--event-id", type=int, action="append", default=[],
+                        help="Only replay orders for this event (repeatable)")
+    parser.add_argument("--error", help="Only replay messages whose recorded error matches this regex")
+    parser.add_argument("--older-than", type=parse_duration,
+                        help="Only orders placed at least this long ago (e.g. 30m, 2h, 1d)")
+    parser.add_argument("--newer-than", type=parse_duration,
+                        help="Only orders placed at most this long ago")
+    parser.add_argument("--rate", type=float, default=settings.dlq_replay_rate,
+                        help="Replays per second across all threads (0 = unlimited)")
+    parser.add_argument("--concurrency", type=int, default=settings.dlq_replay_concurrency,
+                        help="Parallel drain threads")
+    parser.add_argument("--limit", type=int, default=0,
+                        help="Scan at most this many messages (0 = whole queue)")
+    parser.add_argument("--process", action="store_true",
+                        help="Run process_order in this process instead of republishing")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Report what would be replayed; leave the DLQ untouched")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    replay_filter = ReplayFilter(
+        event_ids=set(args.event_id),
+        error=args.error,
+        min_age=args.older_than,
+        max_age=args.newer_than
+    )
+
+    handler = None
+    publishers = None
+    if args.process and not args.dry_run:
+        worker.init_database()
+        worker.catalog_client = worker.CatalogClient()
+        worker.catalog_client.connect()
+        publishers = _ThreadLocalRabbitMQ()
+        worker.rabbitmq = publishers
+        handler = worker.process_order
+
+    replayer = DLQReplayer(
+        replay_filter=replay_filter,
+        handler=handler,
+        rate=args.rate,
+        concurrency=args.concurrency,
+        limit=args.limit,
+        dry_run=args.dry_run
+    )
+    try:
+        report = replayer.run()
+    finally:
+        if publishers:
+            publishers.close_all()
+        if worker.catalog_client:
+            worker.catalog_client.disconnect()
+
+    print(report.summary())
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+TicketBuster traffic replay tool
+
+Re-injects a capture recorded with CAPTURE_FILE (see src/capture.py),
+preserving the original inter-arrival times scaled by --speed.
+
+Targets:
+    memory    In-memory broker stand-in consumed by the real worker loop
+              (process_order, parking, retries), no RabbitMQ needed
+    process   Call process_order directly, one message after another
+    rabbitmq  Publish to the configured RabbitMQ (orders_queue or its shards)
+
+The memory and process targets still use the configured PostgreSQL and
+Catalog Service, so results reflect the real processing cost.
+
+Usage:
+    python replay_traffic.py capture.bin                     # 1x into memory broker
+    python replay_traffic.py capture.bin --speed 10
+    python replay_traffic.py capture.bin --speed 0 --target process
+    python replay_traffic.py capture.bin --fresh-uuids --target rabbitmq
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, List
+
+from src.capture import CapturedMessage, read_capture
+from src.config import settings
+from src.memory_broker import InMemoryBroker
+from src.rabbitmq import RabbitMQConnection
+from src.sharding import order_route
+
+import main as worker
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay captured orders_queue traffic")
+    parser.add_argument("capture", help="Capture file written with CAPTURE_FILE")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Time scale: 1 = real time, 10 = ten times faster, 0 = as fast as possible")
+    parser.add_argument("--target", choices=("memory", "process", "rabbitmq"), default="memory")
+    parser.add_argument("--limit", type=int, help="Replay only the first N messages")
+    parser.add_argument("--fresh-uuids", action="store_true",
+                        help="Give every captured order a new order_uuid (redeliveries keep theirs)")
+    return parser.parse_args()
+
+
+def rewrite_uuids(records: Iterator[CapturedMessage]) -> Iterator[CapturedMessage]:
+    """Replace order_uuid consistently so a capture can be replayed more than once."""
+    mapping: Dict[str, str] = {}
+    for record in records:
+        try:
+            data = json.loads(record.body)
+        except ValueError:
+            yield record
+            continue
+        original = data.get("order_uuid")
+        if original:
+            data["order_uuid"] = mapping.setdefault(original, str(uuid.uuid4()))
+        yield CapturedMessage(record.arrival, json.dumps(data).encode(), record.redelivered)
+
+
+def paced(records: Iterator[CapturedMessage], speed: float, lateness: List[float]) -> Iterator[CapturedMessage]:
+    """Yield records at their (scaled) original offsets, recording how late each one is."""
+    first_arrival = None
+    started = time.monotonic()
+    for record in records:
+        if first_arrival is None:
+            first_arrival = record.arrival
+        if speed > 0:
+            due = started + (record.arrival - first_arrival) / speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            lateness.append(max(0.0, -delay))
+        yield record
+
+
+def timed(callback, durations: List[float]):
+    """Wrap process_order to record each call's duration."""
+    def wrapper(message):
+        started = time.perf_counter()
+        try:
+            return callback(message)
+        finally:
+            durations.append(time.perf_counter() - started)
+    return wrapper
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main() -> int:
+    args = parse_args()
+    records = read_capture(args.capture, args.limit)
+    if args.fresh_uuids:
+        records = rewrite_uuids(records)
+
+    lateness: List[float] = []
+    durations: List[float] = []
+    sent = 0
+    broker = None
+    started = time.monotonic()
+
+    if args.target == "rabbitmq":
+        rabbitmq = RabbitMQConnection()
+        if not rabbitmq.connect():
+            return 1
+        try:
+            for record in paced(records, args.speed, lateness):
+                try:
+                    exchange, routing_key = order_route(json.loads(record.body))
+                except ValueError:
+                    exchange, routing_key = order_route()
+                rabbitmq._channel.basic_publish(exchange=exchange, routing_key=routing_key, body=record.body)
+                sent += 1
+        finally:
+            rabbitmq.disconnect()
+    else:
+        worker.init_database()
+        worker.catalog_client = worker.CatalogClient()
+        worker.catalog_client.connect()
+        broker = InMemoryBroker()
+        worker.rabbitmq = broker
+        process = timed(worker.process_order, durations)
+
+        if args.target == "process":
+            for record in paced(records, args.speed, lateness):
+                broker.publish_order(record.body)
+                sent += 1
+                broker.drain(process)
+        else:
+            def feed():
+                nonlocal sent
+                for record in paced(records, args.speed, lateness):
+                    broker.publish_order(record.body)
+                    sent += 1
+                broker.finish()
+
+            feeder = threading.Thread(target=feed, name="replay-feeder", daemon=True)
+            feeder.start()
+            broker.call_later(settings.parked_resume_interval, worker.resume_parked_orders)
+            broker.consume(process)
+            feeder.join()
+        worker.catalog_client.disconnect()
+
+    elapsed = time.monotonic() - started
+    print(f"Replayed {sent} messages to {args.target} in {elapsed:.2f}s "
+          f"({sent / elapsed if elapsed else 0:.1f} msg/s, speed {args.speed or 'max'})")
+    if lateness:
+        print(f"  schedule lateness: p50={percentile(lateness, 0.5) * 1000:.1f}ms "
+              f"max={max(lateness) * 1000:.1f}ms")
+    if durations:
+        print(f"  process_order: n={len(durations)} mean={statistics.mean(durations) * 1000:.1f}ms "
+              f"p50={percentile(durations, 0.5) * 1000:.1f}ms p95={percentile(durations, 0.95) * 1000:.1f}ms "
+              f"p99={percentile(durations, 0.99) * 1000:.1f}ms")
+    if broker is not None:
+        completed = sum(1 for n in broker.notifications if n["type"] == "order.completed")
+        failed = sum(1 for n in broker.notifications if n["type"] == "order.failed")
+        print(f"  acked={broker.acked} requeued={broker.requeued} dead-lettered={broker.dead_lettered} "
+              f"parked={broker.queue_size(broker.parking_queue)} completed={completed} failed={failed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
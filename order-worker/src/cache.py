@@ -0,0 +1,103 @@
+"""
+In-process caches for Order Worker.
+Small thread-safe LRU cache with per-entry TTL, used for read-through
+caching of order status lookups.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from .config import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after `ttl` seconds.
+
+    get_or_load() is read-through and safe against the invalidate/load
+    race: a value loaded while an invalidation happened is returned to
+    the caller but not stored, so it cannot outlive the invalidation.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._invalidations = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value or `default` if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._store(key, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], cache_none: bool = True) -> Any:
+        """
+        Return the cached value, calling loader() on a miss.
+
+        The loader runs outside the lock; concurrent misses for the same
+        key may load twice, which is cheaper than serializing all reads.
+        With cache_none=False a None result is returned but not stored.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            generation = self._invalidations
+        value = loader()
+        with self._lock:
+            if generation == self._invalidations and (cache_none or value is not None):
+                self._store(key, value)
+        return value
+
+    def invalidate(self, key: Hashable):
+        """Drop a key (no-op if absent)."""
+        with self._lock:
+            self._invalidations += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._invalidations += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _store(self, key: Hashable, value: Any):
+        """Insert under the lock."""
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# Read-through cache for GetOrderStatus, invalidated by process_order on
+# every status transition. Other pods' entries expire after the TTL.
+order_status_cache = TTLCache(
+    maxsize=settings.order_status_cache_size,
+    ttl=settings.order_status_cache_ttl
+)
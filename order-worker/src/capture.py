@@ -0,0 +1,86 @@
+"""
+Traffic capture for orders_queue.
+
+With CAPTURE_FILE set, RabbitMQConnection.consume appends every delivered
+message to an append-only binary file, together with its arrival time, so
+real on-sale traffic (complexity mix, seat contention, redeliveries) can
+be replayed later with replay_traffic.py.
+
+Record layout (big-endian):
+    arrival  float64   Unix time the message was delivered to the worker
+    flags    uint8     bit 0: redelivered by the broker
+    length   uint32    Body size in bytes
+    body     bytes     Message body as received (JSON)
+
+A record torn by a crash at the end of the file is ignored when reading.
+"""
+import logging
+import struct
+import threading
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct(">dBI")
+_FLAG_REDELIVERED = 0x01
+
+
+@dataclass
+class CapturedMessage:
+    """One captured delivery."""
+    arrival: float
+    body: bytes
+    redelivered: bool = False
+
+
+class CaptureWriter:
+    """Thread-safe appender for capture files."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "ab")
+        self._lock = threading.Lock()
+        self.count = 0
+        logger.info(f"Capturing consumed messages to {path}")
+
+    def write(self, body: bytes, arrival: float, redelivered: bool = False):
+        """Append one record and flush it to the OS."""
+        flags = _FLAG_REDELIVERED if redelivered else 0
+        record = _HEADER.pack(arrival, flags, len(body)) + body
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(record)
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                logger.info(f"Captured {self.count} messages to {self.path}")
+
+
+def read_capture(path: str, limit: Optional[int] = None) -> Iterator[CapturedMessage]:
+    """
+    Iterate over the records of a capture file in arrival order.
+
+    Args:
+        path: File written by CaptureWriter
+        limit: Stop after this many records
+    """
+    count = 0
+    with open(path, "rb") as f:
+        while limit is None or count < limit:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                break
+            arrival, flags, length = _HEADER.unpack(header)
+            body = f.read(length)
+            if len(body) < length:
+                logger.warning(f"Ignoring truncated record at the end of {path}")
+                break
+            yield CapturedMessage(arrival, body, bool(flags & _FLAG_REDELIVERED))
+            count += 1
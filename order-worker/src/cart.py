@@ -0,0 +1,165 @@
+"""
+Multi-seat (cart) orders.
+
+A cart order message carries seat_ids; process_order handles it as one
+unit:
+
+- the parent orders row (first seat, order totals) and one
+  db_orders.order_items row per seat are upserted in one transaction,
+- the QR ticket of every seat is generated in parallel on a shared
+  thread pool (CART_QR_WORKERS; with CPU_LOAD_MODE=chain the CPU
+  simulation holds the GIL, so only "buffer" mode runs truly in parallel),
+- the seats are committed with a single all-or-nothing CommitSeats call,
+- the parent and its items are marked COMPLETED in one transaction and a
+  single notification lists every seat.
+
+Every seat, including the first, has its own ticket in order_items;
+completed_tickets() is the query gate validation and manifests use to see
+them alongside single-seat orders.
+"""
+import base64
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+from sqlalchemy import select, union, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models import Order, OrderItem
+from .qr_generator import generate_qr_code
+from .timings import StageTimings
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+@dataclass
+class SeatTicket:
+    """QR ticket generated for one seat of a cart."""
+    seat_id: int
+    qr_hash: str
+    qr_bytes: bytes
+    qr_time: float
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=settings.cart_qr_workers, thread_name_prefix="cart-qr")
+    return _pool
+
+
+def save_items(session: Session, order_uuid, event_id: int, seat_ids: List[int]):
+    """Insert the items of a cart in the caller's transaction (redeliveries keep the existing rows)."""
+    session.execute(
+        pg_insert(OrderItem)
+        .values([
+            {"order_uuid": order_uuid, "seat_id": seat_id, "event_id": event_id}
+            for seat_id in seat_ids
+        ])
+        .on_conflict_do_nothing(index_elements=[OrderItem.order_uuid, OrderItem.seat_id])
+    )
+
+
+def complete_items(session: Session, order_uuid, tickets: List[SeatTicket]):
+    """Store each seat's QR ticket on its item in the caller's transaction."""
+    session.execute(
+        update(OrderItem),
+        [
+            {
+                "order_uuid": order_uuid,
+                "seat_id": ticket.seat_id,
+                "qr_code_hash": ticket.qr_hash,
+                "qr_code_base64": base64.b64encode(ticket.qr_bytes).decode('utf-8'),
+            }
+            for ticket in tickets
+        ]
+    )
+
+
+def generate_tickets(
+    order_uuid: str,
+    user_id: str,
+    event_id: int,
+    seat_ids: List[int],
+    processing_complexity: int,
+    timings: Optional[StageTimings] = None
+) -> List[SeatTicket]:
+    """
+    Generate the QR ticket of every seat in parallel.
+
+    Each seat costs the same CPU simulation as a single-seat order. The
+    cpu_sim and qr_render stages get the slowest seat's durations, which
+    is what the order waited for.
+
+    Returns:
+        One SeatTicket per seat, in seat_ids order
+    """
+    seat_timings = [StageTimings() for _ in seat_ids]
+    # Each task runs in a copy of this context so its logs keep the order's fields
+    futures = [
+        _executor().submit(
+            contextvars.copy_context().run,
+            generate_qr_code,
+            order_uuid=order_uuid,
+            user_id=user_id,
+            event_id=event_id,
+            seat_id=seat_id,
+            processing_complexity=processing_complexity,
+            timings=seat_timing
+        )
+        for seat_id, seat_timing in zip(seat_ids, seat_timings)
+    ]
+    tickets = [
+        SeatTicket(seat_id, *future.result())
+        for seat_id, future in zip(seat_ids, futures)
+    ]
+    if timings is not None:
+        timings.cpu_sim_ms += max(t.cpu_sim_ms for t in seat_timings)
+        timings.qr_render_ms += max(t.qr_render_ms for t in seat_timings)
+    return tickets
+
+
+def completed_tickets(event_id: Optional[int] = None):
+    """
+    Tickets of COMPLETED orders: (qr_code_hash, order_uuid, user_id, event_id, seat_id, completed_at).
+
+    Single-seat orders come from orders, cart seats from order_items; the
+    first seat of a cart is in both with identical values and UNION
+    drops the copy.
+    """
+    orders = (
+        select(Order.qr_code_hash, Order.order_uuid, Order.user_id, Order.event_id, Order.seat_id, Order.completed_at)
+        .where(Order.status == 'COMPLETED')
+        .where(Order.qr_code_hash.isnot(None))
+    )
+    items = (
+        select(
+            OrderItem.qr_code_hash, Order.order_uuid, Order.user_id, Order.event_id,
+            OrderItem.seat_id, Order.completed_at
+        )
+        .join(Order, Order.order_uuid == OrderItem.order_uuid)
+        .where(Order.status == 'COMPLETED')
+        .where(OrderItem.qr_code_hash.isnot(None))
+    )
+    if event_id is not None:
+        orders = orders.where(Order.event_id == event_id)
+        items = items.where(OrderItem.event_id == event_id)
+    return union(orders, items).subquery("tickets")
+
+
+def shutdown():
+    """Stop the QR thread pool (pending tickets are finished first)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
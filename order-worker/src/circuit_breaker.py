@@ -0,0 +1,165 @@
+"""
+Circuit breaker for calls to remote services.
+Tracks the error rate over a sliding window of recent calls and opens
+to fail fast while the remote side is unhealthy.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+    CLOSED = "CLOSED"        # Calls flow normally
+    OPEN = "OPEN"            # Calls fail fast until open_seconds elapse
+    HALF_OPEN = "HALF_OPEN"  # A limited number of probe calls are allowed
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker.
+
+    CLOSED -> OPEN when at least min_calls of the last window_size calls
+    were recorded and the failure rate reaches failure_rate.
+    OPEN -> HALF_OPEN once open_seconds have elapsed.
+    HALF_OPEN -> CLOSED after half_open_calls consecutive successful probes,
+    or back to OPEN on the first probe failure.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 10.0,
+        half_open_calls: int = 2
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+
+        self._state = CircuitState.CLOSED
+        self._window: deque = deque(maxlen=window_size)  # True = failure
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._listeners: List[Callable[[CircuitState, CircuitState], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (does not trigger OPEN -> HALF_OPEN)."""
+        return self._state
+
+    def add_listener(self, listener: Callable[[CircuitState, CircuitState], None]):
+        """Register a callback invoked as listener(old_state, new_state)."""
+        self._listeners.append(listener)
+
+    def is_open(self) -> bool:
+        """True while calls would be rejected outright (OPEN and not yet due for probing)."""
+        with self._lock:
+            return (
+                self._state == CircuitState.OPEN and
+                time.monotonic() - self._opened_at < self.open_seconds
+            )
+
+    def ready_for_probe(self) -> bool:
+        """True when the breaker is OPEN past its timeout or already HALF_OPEN."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                return self._probes_in_flight < self.half_open_calls
+            return (
+                self._state == CircuitState.OPEN and
+                time.monotonic() - self._opened_at >= self.open_seconds
+            )
+
+    def allow_request(self) -> bool:
+        """
+        Decide whether a call may proceed.
+
+        Every allowed call must be followed by record_success() or
+        record_failure().
+        """
+        change = None
+        with self._lock:
+            if self._state == CircuitState.CLOSED:
+                return True
+
+            if self._state == CircuitState.OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    return False
+                change = self._transition(CircuitState.HALF_OPEN)
+
+            allowed = self._probes_in_flight < self.half_open_calls
+            if allowed:
+                self._probes_in_flight += 1
+
+        self._notify(change)
+        return allowed
+
+    def record_success(self):
+        """Record a call that reached the remote service."""
+        change = None
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_calls:
+                    change = self._transition(CircuitState.CLOSED)
+            else:
+                self._window.append(False)
+        self._notify(change)
+
+    def record_failure(self):
+        """Record a call that failed because the remote service is unhealthy."""
+        change = None
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                change = self._transition(CircuitState.OPEN)
+            else:
+                self._window.append(True)
+                if self._state == CircuitState.CLOSED and len(self._window) >= self.min_calls:
+                    failures = sum(self._window)
+                    if failures / len(self._window) >= self.failure_rate:
+                        change = self._transition(CircuitState.OPEN)
+        self._notify(change)
+
+    def record_ignored(self):
+        """Release a probe slot for a call whose outcome says nothing about the remote side."""
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _transition(self, new_state: CircuitState) -> Tuple[CircuitState, CircuitState]:
+        """Switch state; caller holds the lock and passes the result to _notify."""
+        old_state = self._state
+        self._state = new_state
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        if new_state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        elif new_state == CircuitState.CLOSED:
+            self._window.clear()
+
+        logger.warning(f"Circuit '{self.name}' {old_state.value} -> {new_state.value}")
+        return old_state, new_state
+
+    def _notify(self, change: Optional[Tuple[CircuitState, CircuitState]]):
+        """Invoke listeners outside the lock so they may query the breaker."""
+        if change is None:
+            return
+        old_state, new_state = change
+        for listener in self._listeners:
+            try:
+                listener(old_state, new_state)
+            except Exception as e:
+                logger.error(f"Circuit '{self.name}' listener failed: {e}")
@@ -0,0 +1,129 @@
+"""
+Adaptive concurrency limit for calls to remote services.
+AIMD on the number of in-flight calls: the limit grows by one while calls
+succeed at full utilization and shrinks multiplicatively on overload
+signals (rejections, timeouts, or latency well above its usual level).
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AIMDLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency limiter.
+
+    acquire() admits a call while in-flight calls are below the current
+    limit; release() reports how it went:
+
+    - dropped=True (the remote shed load or timed out), or recent latency
+      above latency_tolerance x its long-term average, multiplies the
+      limit by backoff_ratio.
+    - Otherwise, if at least half the limit was in use, the limit grows
+      by one (an underused limit carries no signal and is left alone).
+
+    Latency is compared as a short moving average (about the last 10
+    calls) against a long one (about long_window calls), so single slow
+    calls are not mistaken for congestion and a lasting shift in service
+    time is eventually accepted as the new normal.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.9,
+        latency_tolerance: float = 2.0,
+        long_window: int = 500
+    ):
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self._long_alpha = 1.0 / max(1, long_window)
+
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._inflight = 0
+        self._short_rtt = None
+        self._long_rtt = None
+        self._cond = threading.Condition()
+
+    def set_bounds(self, min_limit: int, max_limit: int):
+        """Change the limit's bounds, clamping the current limit into them."""
+        with self._cond:
+            self.min_limit = min_limit
+            self.max_limit = max_limit
+            self._limit = float(max(min_limit, min(self._limit, max_limit)))
+            self._cond.notify_all()
+
+    @property
+    def limit(self) -> int:
+        """Current number of calls allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        """Calls currently admitted and not yet released."""
+        return self._inflight
+
+    def acquire(self, timeout: float = 0.0) -> bool:
+        """
+        Admit one call, waiting up to `timeout` seconds for a free slot.
+
+        Returns:
+            True if admitted (release() must follow), False if still at
+            the limit after the timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._inflight >= int(self._limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self._inflight += 1
+            return True
+
+    def release(self, latency: float = None, dropped: bool = False, ignore: bool = False):
+        """
+        Finish an admitted call.
+
+        Args:
+            latency: Call duration in seconds (None if unknown)
+            dropped: The remote rejected or timed out the call
+            ignore: Free the slot without adjusting the limit
+        """
+        with self._cond:
+            inflight = self._inflight
+            self._inflight -= 1
+            if not ignore:
+                self._adjust(inflight, latency, dropped)
+            self._cond.notify()
+
+    def _adjust(self, inflight: int, latency: float, dropped: bool):
+        """Update the limit under the lock."""
+        old_limit = int(self._limit)
+
+        congested = dropped
+        if latency is not None and not dropped:
+            if self._long_rtt is None:
+                self._short_rtt = self._long_rtt = latency
+            else:
+                self._short_rtt += 0.1 * (latency - self._short_rtt)
+                self._long_rtt += self._long_alpha * (latency - self._long_rtt)
+            congested = self._short_rtt > self._long_rtt * self.latency_tolerance
+
+        if congested:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+        elif inflight * 2 >= self._limit:
+            self._limit = min(self.max_limit, self._limit + 1)
+
+        if int(self._limit) != old_limit:
+            logger.debug(f"{self.name} concurrency limit {old_limit} -> {int(self._limit)}")
+            # More room: wake every waiter, not just one
+            self._cond.notify_all()
@@ -3,6 +3,7 @@ Configuration module for Order Worker.
 Uses pydantic-settings for type-safe environment variable parsing.
 """
 import os
+from dotenv import dotenv_values
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -17,6 +18,14 @@ class Settings(BaseSettings):
     db_user: str = Field(default="admin", alias="DB_USER")
     db_password: str = Field(default="admin", alias="DB_PASSWORD")
     db_schema: str = Field(default="db_orders", alias="DB_SCHEMA")
+    # Set when DB_HOST/DB_PORT point at PgBouncer in transaction pooling mode
+    db_pgbouncer: bool = Field(default=False, alias="DB_PGBOUNCER")
+    # Direct Postgres endpoint for LISTEN (defaults to DB_HOST/DB_PORT)
+    db_listen_host: str = Field(default="", alias="DB_LISTEN_HOST")
+    db_listen_port: int = Field(default=0, alias="DB_LISTEN_PORT")
+    # Connection pool (0 = sized from WORKER_CONCURRENCY)
+    db_pool_size: int = Field(default=0, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=-1, alias="DB_MAX_OVERFLOW")
     
     # RabbitMQ Configuration
     rabbitmq_host: str = Field(default="localhost", alias="RABBITMQ_HOST")
@@ -28,28 +37,167 @@ class Settings(BaseSettings):
     # Queue Names
     orders_queue: str = Field(default="orders_queue", alias="ORDERS_QUEUE")
     notifications_queue: str = Field(default="notifications_queue", alias="NOTIFICATIONS_QUEUE")
+    # Consistent-hash sharding of orders (0 = single orders_queue)
+    order_shards: int = Field(default=0, alias="ORDER_SHARDS")
+    order_shard_exchange: str = Field(default="orders_sharded", alias="ORDER_SHARD_EXCHANGE")
+    order_shard_key: str = Field(default="seat", alias="ORDER_SHARD_KEY")
     
     # gRPC Configuration (Catalog Service)
     grpc_catalog_host: str = Field(default="localhost", alias="GRPC_CATALOG_HOST")
     grpc_catalog_port: int = Field(default=50051, alias="GRPC_CATALOG_PORT")
+    grpc_commit_timeout: float = Field(default=30.0, alias="GRPC_COMMIT_TIMEOUT")
+    
+    # Catalog circuit breaker (fails fast and parks orders while catalog is down)
+    catalog_breaker_failure_rate: float = Field(default=0.5, alias="CATALOG_BREAKER_FAILURE_RATE")
+    catalog_breaker_window: int = Field(default=20, alias="CATALOG_BREAKER_WINDOW")
+    catalog_breaker_min_calls: int = Field(default=5, alias="CATALOG_BREAKER_MIN_CALLS")
+    catalog_breaker_open_seconds: float = Field(default=10.0, alias="CATALOG_BREAKER_OPEN_SECONDS")
+    catalog_breaker_half_open_calls: int = Field(default=2, alias="CATALOG_BREAKER_HALF_OPEN_CALLS")
+    # Adaptive (AIMD) limit on in-flight CommitSeat calls per process
+    catalog_limit_initial: int = Field(default=10, alias="CATALOG_LIMIT_INITIAL")
+    catalog_limit_min: int = Field(default=1, alias="CATALOG_LIMIT_MIN")
+    catalog_limit_max: int = Field(default=200, alias="CATALOG_LIMIT_MAX")
+    catalog_limit_backoff: float = Field(default=0.9, alias="CATALOG_LIMIT_BACKOFF")
+    catalog_limit_latency_tolerance: float = Field(default=2.0, alias="CATALOG_LIMIT_LATENCY_TOLERANCE")
+    catalog_limit_wait: float = Field(default=5.0, alias="CATALOG_LIMIT_WAIT")
+    parked_resume_interval: float = Field(default=5.0, alias="PARKED_RESUME_INTERVAL")
+    parked_resume_batch: int = Field(default=500, alias="PARKED_RESUME_BATCH")
+    
+    # DLQ replay (replay_dlq.py): replays per second and drain threads
+    dlq_replay_rate: float = Field(default=50.0, alias="DLQ_REPLAY_RATE")
+    dlq_replay_concurrency: int = Field(default=4, alias="DLQ_REPLAY_CONCURRENCY")
+    
+    # Sold-seat negative cache (fail lost seat races before QR generation)
+    sold_seat_cache_enabled: bool = Field(default=True, alias="SOLD_SEAT_CACHE_ENABLED")
+    sold_seat_cache_events: int = Field(default=256, alias="SOLD_SEAT_CACHE_EVENTS")
+    sold_seat_cache_ttl: float = Field(default=600.0, alias="SOLD_SEAT_CACHE_TTL")
+    sold_seat_warm_timeout: float = Field(default=5.0, alias="SOLD_SEAT_WARM_TIMEOUT")
+    
+    # Seat price cache (reject unknown seats / wrong amounts before processing)
+    seat_price_check_enabled: bool = Field(default=True, alias="SEAT_PRICE_CHECK_ENABLED")
+    seat_price_cache_events: int = Field(default=256, alias="SEAT_PRICE_CACHE_EVENTS")
+    seat_price_cache_ttl: float = Field(default=300.0, alias="SEAT_PRICE_CACHE_TTL")
+    
+    # OrderService gRPC server (GetOrderStatus / GetUserOrders)
+    order_server_enabled: bool = Field(default=True, alias="ORDER_SERVER_ENABLED")
+    order_server_port: int = Field(default=50052, alias="ORDER_SERVER_PORT")
+    order_server_workers: int = Field(default=64, alias="ORDER_SERVER_WORKERS")
+    order_status_cache_ttl: float = Field(default=2.0, alias="ORDER_STATUS_CACHE_TTL")
+    order_status_cache_size: int = Field(default=10000, alias="ORDER_STATUS_CACHE_SIZE")
+    # WatchOrder: NOTIFY channel and maximum stream lifetime (seconds)
+    order_events_channel: str = Field(default="order_status", alias="ORDER_EVENTS_CHANNEL")
+    watch_order_timeout: float = Field(default=300.0, alias="WATCH_ORDER_TIMEOUT")
+    watch_order_max_streams: int = Field(default=32, alias="WATCH_ORDER_MAX_STREAMS")
+    
+    # GateService (ticket validation at venue gates, on the order server)
+    gate_service_enabled: bool = Field(default=True, alias="GATE_SERVICE_ENABLED")
+    gate_flush_interval: float = Field(default=0.5, alias="GATE_FLUSH_INTERVAL")
+    gate_flush_batch: int = Field(default=500, alias="GATE_FLUSH_BATCH")
+    gate_miss_ttl: float = Field(default=5.0, alias="GATE_MISS_TTL")
+    gate_index_events: int = Field(default=32, alias="GATE_INDEX_EVENTS")
+    gate_index_ttl: float = Field(default=300.0, alias="GATE_INDEX_TTL")
+    gate_max_pending: int = Field(default=100000, alias="GATE_MAX_PENDING")
+    gate_max_streams: int = Field(default=16, alias="GATE_MAX_STREAMS")
+    
+    # Offline gate manifests (export_manifest.py, see src/manifest.py)
+    manifest_dir: str = Field(default="manifests", alias="MANIFEST_DIR")
+    manifest_batch_size: int = Field(default=10000, alias="MANIFEST_BATCH_SIZE")
+    
+    # Orders partitioning / archival (see k8s/partition_orders.sql)
+    orders_partitioned: bool = Field(default=False, alias="ORDERS_PARTITIONED")
+    partition_months_ahead: int = Field(default=3, alias="PARTITION_MONTHS_AHEAD")
+    partition_retention_months: int = Field(default=0, alias="PARTITION_RETENTION_MONTHS")
+    archive_grace_days: int = Field(default=7, alias="ARCHIVE_GRACE_DAYS")
+    archive_batch_size: int = Field(default=1000, alias="ARCHIVE_BATCH_SIZE")
+    
+    # Per-order stage timings in db_orders.order_timings (see src/timings.py)
+    order_timings_enabled: bool = Field(default=False, alias="ORDER_TIMINGS_ENABLED")
     
     # Worker Configuration
     prefetch_count: int = Field(default=1, alias="PREFETCH_COUNT")
+    # Orders processed concurrently by this process, on a thread pool when
+    # > 1 (also sizes the DB pool; changes need a restart)
+    worker_concurrency: int = Field(default=1, alias="WORKER_CONCURRENCY")
     worker_name: str = Field(default="order-worker-1", alias="WORKER_NAME")
+    # Seconds a delivery owns an order it started (see src/order_state.py)
+    order_processing_lease: float = Field(default=120.0, alias="ORDER_PROCESSING_LEASE")
+    # "chain" (GIL-bound, original) or "buffer" (GIL-releasing) CPU simulation
+    cpu_load_mode: str = Field(default="chain", alias="CPU_LOAD_MODE")
+    # Threads generating the QR tickets of multi-seat (cart) orders in parallel
+    cart_qr_workers: int = Field(default=4, alias="CART_QR_WORKERS")
+    # Rendered QR images (see src/qr_cache.py): in-memory LRU size and an
+    # optional shared directory ("" = memory only) with its size limit
+    qr_cache_memory_bytes: int = Field(default=32 * 1024 * 1024, alias="QR_CACHE_MEMORY_BYTES")
+    qr_cache_dir: str = Field(default="", alias="QR_CACHE_DIR")
+    qr_cache_disk_bytes: int = Field(default=1024 * 1024 * 1024, alias="QR_CACHE_DISK_BYTES")
+    # Staged order pipeline (see src/pipeline.py) instead of one
+    # process_order call per message: threads per stage, jobs that may wait
+    # between stages, and processes generating QR codes (0 = stage threads)
+    pipeline_enabled: bool = Field(default=False, alias="PIPELINE_ENABLED")
+    pipeline_queue_size: int = Field(default=16, alias="PIPELINE_QUEUE_SIZE")
+    pipeline_validate_workers: int = Field(default=2, alias="PIPELINE_VALIDATE_WORKERS")
+    pipeline_persist_workers: int = Field(default=4, alias="PIPELINE_PERSIST_WORKERS")
+    pipeline_qr_workers: int = Field(default=4, alias="PIPELINE_QR_WORKERS")
+    pipeline_qr_processes: int = Field(default=0, alias="PIPELINE_QR_PROCESSES")
+    pipeline_commit_workers: int = Field(default=8, alias="PIPELINE_COMMIT_WORKERS")
+    pipeline_finalize_workers: int = Field(default=4, alias="PIPELINE_FINALIZE_WORKERS")
+    pipeline_notify_workers: int = Field(default=1, alias="PIPELINE_NOTIFY_WORKERS")
+    # Seconds to let orders in flight finish on shutdown
+    pipeline_drain_timeout: float = Field(default=30.0, alias="PIPELINE_DRAIN_TIMEOUT")
+    
+    # Startup (dependencies are connected concurrently with jittered retries)
+    startup_max_attempts: int = Field(default=20, alias="STARTUP_MAX_ATTEMPTS")
+    startup_retry_base_delay: float = Field(default=0.05, alias="STARTUP_RETRY_BASE_DELAY")
+    startup_retry_max_delay: float = Field(default=2.0, alias="STARTUP_RETRY_MAX_DELAY")
+    startup_grpc_ready_timeout: float = Field(default=2.0, alias="STARTUP_GRPC_READY_TIMEOUT")
+
+    # Prometheus metrics (GET /metrics)
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+    metrics_port: int = Field(default=9100, alias="METRICS_PORT")
+    
+    # Traffic capture: append every consumed message to this file ("" = off)
+    capture_file: str = Field(default="", alias="CAPTURE_FILE")
+    
+    # Live reload (see src/reload.py): env-format overrides file, e.g. a
+    # mounted ConfigMap, re-read when it changes and on SIGHUP
+    config_reload_file: str = Field(default="", alias="CONFIG_RELOAD_FILE")
+    config_reload_interval: float = Field(default=5.0, alias="CONFIG_RELOAD_INTERVAL")
     
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    log_format: str = Field(default="text", alias="LOG_FORMAT")  # text | json
+    log_async: bool = Field(default=False, alias="LOG_ASYNC")
+    log_queue_size: int = Field(default=10000, alias="LOG_QUEUE_SIZE")
+    log_sample_rate: float = Field(default=1.0, alias="LOG_SAMPLE_RATE")
     
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         extra = "ignore"
     
+    @property
+    def order_concurrency(self) -> int:
+        """Orders processed at once: WORKER_CONCURRENCY, or every pipeline stage thread."""
+        if self.pipeline_enabled:
+            return (
+                self.pipeline_validate_workers + self.pipeline_persist_workers
+                + self.pipeline_qr_workers + self.pipeline_commit_workers
+                + self.pipeline_finalize_workers + self.pipeline_notify_workers
+            )
+        return self.worker_concurrency
+    
     @property
     def database_url(self) -> str:
         """Construct PostgreSQL connection URL."""
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
     
+    @property
+    def database_listen_url(self) -> str:
+        """PostgreSQL URL for LISTEN, which needs a session-pooled/direct connection."""
+        host = self.db_listen_host or self.db_host
+        port = self.db_listen_port or self.db_port
+        return f"postgresql://{self.db_user}:{self.db_password}@{host}:{port}/{self.db_name}"
+    
     @property
     def rabbitmq_url(self) -> str:
         """Construct RabbitMQ connection URL."""
@@ -61,5 +209,18 @@ class Settings(BaseSettings):
         return f"{self.grpc_catalog_host}:{self.grpc_catalog_port}"
 
 
+def load_settings() -> Settings:
+    """
+    Settings from the environment and .env, with the values of
+    CONFIG_RELOAD_FILE (if any) taking precedence over both.
+    """
+    base = Settings()
+    path = base.config_reload_file
+    if not path or not os.path.isfile(path):
+        return base
+    overrides = {key: value for key, value in dotenv_values(path).items() if value is not None}
+    return Settings(**overrides)
+
+
 # Global settings instance
-settings = Settings()
+settings = load_settings()
@@ -3,8 +3,12 @@ Database connection and session management.
 Uses synchronous SQLAlchemy for simplicity in daemon pattern.
 """
 import logging
+import threading
 from contextlib import contextmanager
+from typing import Optional, Tuple
+
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -13,17 +17,96 @@ from .models import Base
 
 logger = logging.getLogger(__name__)
 
-# Create engine with connection pooling
-engine = create_engine(
-    settings.database_url,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,  # Verify connections before use
-    echo=False  # Set to True for SQL debugging
-)
+# Engine and session factory are created on first use so importing this
+# module does not load the DB driver or touch the network.
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_engine_lock = threading.Lock()
+
+# Auto overflow for order server reads (the pre-auto-sizing default)
+DEFAULT_READ_OVERFLOW = 10
+
+
+def pool_limits() -> Tuple[int, int]:
+    """
+    Connection pool size and overflow for this process.
+    
+    DB_POOL_SIZE=0 keeps one connection per concurrent order plus one for
+    the gate redemption writer, so order processing never waits for a
+    connection. DB_MAX_OVERFLOW=-1 adds a small overflow
+    (DEFAULT_READ_OVERFLOW, or ORDER_SERVER_WORKERS if fewer) for the
+    order server's reads, gate lookups and index loads when the order
+    server is enabled; bursts beyond it wait in the pool rather than
+    open more Postgres connections per pod. Raise DB_MAX_OVERFLOW
+    explicitly (ideally behind PgBouncer) to serve more reads at once.
+    
+    Returns:
+        Tuple of (pool_size, max_overflow)
+    """
+    pool_size = settings.db_pool_size or settings.order_concurrency + 1
+    max_overflow = settings.db_max_overflow
+    if max_overflow < 0:
+        max_overflow = 0
+        if settings.order_server_enabled:
+            max_overflow = min(settings.order_server_workers, DEFAULT_READ_OVERFLOW)
+    return pool_size, max_overflow
+
+
+def _connect_args() -> dict:
+    """
+    Driver connect arguments.
+    
+    Direct connections get search_path as a startup option instead of a
+    SET per session. PgBouncer rejects unknown startup options and shares
+    server connections between clients, so in that mode nothing is set:
+    every statement is schema-qualified (see Order.__table_args__).
+    """
+    if settings.db_pgbouncer:
+        return {}
+    return {"options": f"-csearch_path={settings.db_schema}"}
+
 
-# Session factory
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+def _build_engine():
+    """Create the engine and session factory (caller holds _engine_lock)."""
+    global _engine, _session_factory
+    pool_size, max_overflow = pool_limits()
+    # Create engine with connection pooling
+    engine = create_engine(
+        settings.database_url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,  # Verify connections before use
+        connect_args=_connect_args(),
+        echo=False  # Set to True for SQL debugging
+    )
+    _session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    _engine = engine
+
+
+def get_engine() -> Engine:
+    """Return the shared engine, creating it (and the session factory) lazily."""
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _build_engine()
+    return _engine
+
+
+def resize_pool():
+    """
+    Re-create the connection pool with the current pool_limits().
+    
+    New sessions use the new pool at once; sessions already open finish on
+    the old one, whose connections are closed as they are returned.
+    """
+    with _engine_lock:
+        old = _engine
+        if old is None:
+            return
+        _build_engine()
+    old.dispose()
+    pool_size, max_overflow = pool_limits()
+    logger.info(f"Connection pool resized: {pool_size} (+{max_overflow} overflow)")
 
 
 def init_database():
@@ -32,17 +115,18 @@ def init_database():
     Does NOT create tables - assumes they exist from migrations.
     """
     try:
-        with engine.connect() as conn:
-            # Set search path to db_orders schema
-            conn.execute(text(f"SET search_path TO {settings.db_schema}"))
-            conn.commit()
-            
+        with get_engine().connect() as conn:
             # Verify connection
             result = conn.execute(text("SELECT 1"))
             result.fetchone()
             
             logger.info(f"Database connection established to {settings.db_host}:{settings.db_port}/{settings.db_name}")
             logger.info(f"Using schema: {settings.db_schema}")
+            pool_size, max_overflow = pool_limits()
+            logger.info(
+                f"Connection pool: {pool_size} (+{max_overflow} overflow)"
+                f"{', PgBouncer mode' if settings.db_pgbouncer else ''}"
+            )
             return True
     except SQLAlchemyError as e:
         logger.error(f"Failed to connect to database: {e}")
@@ -53,16 +137,16 @@ def init_database():
 def get_session() -> Session:
     """
     Context manager for database sessions.
-    Automatically handles commit/rollback and schema search path.
+    Automatically handles commit/rollback. The schema search path is set
+    at connect time (see _connect_args), not per session.
     
     Usage:
         with get_session() as session:
             order = session.query(Order).filter_by(order_uuid=uuid).first()
     """
-    session = SessionLocal()
+    get_engine()
+    session = _session_factory()
     try:
-        # Set search path for this session
-        session.execute(text(f"SET search_path TO {settings.db_schema}"))
         yield session
         session.commit()
     except SQLAlchemyError as e:
@@ -76,7 +160,7 @@ def get_session() -> Session:
 def health_check() -> bool:
     """Check database connectivity for health endpoint."""
     try:
-        with engine.connect() as conn:
+        with get_engine().connect() as conn:
             conn.execute(text("SELECT 1"))
             return True
     except Exception as e:
@@ -0,0 +1,358 @@
+"""
+Dead letter queue replay for Order Worker.
+
+Drains <ORDERS_QUEUE>_dlq with several threads (one AMQP connection
+each), keeps only the messages matching a ReplayFilter and replays them
+with retry_count reset to 0, either by republishing to orders_queue or by
+running them through a handler such as main.process_order.
+
+Replays are paced by a shared TokenBucket so a large backlog does not
+hit the catalog service all at once. Messages that are skipped (or fail
+when processed in-line) are left unacked until every thread has finished
+draining and then returned to the DLQ, so each message is looked at once
+per run.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, List, Optional, Set
+
+import pika
+from sqlalchemy import select
+
+from .config import settings
+from .database import get_session
+from .models import Order
+from .partitioning import order_created_at
+from .rabbitmq import OrderMessage, RabbitMQConnection
+from .sharding import order_route
+
+logger = logging.getLogger(__name__)
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)([smhd]?)$")
+_DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(value: str) -> float:
+    """
+    Parse a duration such as "90", "15m", "2h" or "7d" into seconds.
+
+    Raises:
+        ValueError: If the value is not a duration
+    """
+    match = _DURATION.match(value.strip().lower())
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r}")
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, up to `burst` saved.
+
+    A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class DeadLetter:
+    """One message fetched from the DLQ."""
+    delivery_tag: int
+    body: bytes
+    headers: dict
+    data: Optional[dict] = None
+
+    @property
+    def error(self) -> str:
+        """Failure details recorded in the headers (x-error, park reason, x-death)."""
+        parts = [
+            str(self.headers[name])
+            for name in ("x-error", "x-parked-reason")
+            if self.headers.get(name)
+        ]
+        for death in self.headers.get("x-death") or []:
+            parts.append(f"{death.get('reason', '')} from {death.get('queue', '')}")
+        return "; ".join(parts)
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the order was placed (from the gateway timestamp)."""
+        created_at = order_created_at((self.data or {}).get("timestamp"))
+        if created_at is None:
+            return None
+        return (datetime.utcnow() - created_at).total_seconds()
+
+
+def order_error_message(order_uuid: str) -> str:
+    """error_message stored on the order row ("" if none)."""
+    try:
+        with get_session() as session:
+            return session.execute(
+                select(Order.error_message).where(Order.order_uuid == order_uuid)
+            ).scalar() or ""
+    except Exception as e:
+        logger.warning(f"Could not load error for order {order_uuid}: {e}")
+        return ""
+
+
+@dataclass
+class ReplayFilter:
+    """
+    Which dead letters to replay. Empty criteria match everything.
+
+    Attributes:
+        event_ids: Only orders for these events
+        error: Regex searched (case-insensitive) in the recorded error:
+            message headers first, then the order's error_message in the
+            database
+        min_age: Only orders placed at least this many seconds ago
+        max_age: Only orders placed at most this many seconds ago
+    """
+    event_ids: Set[int] = field(default_factory=set)
+    error: Optional[str] = None
+    min_age: Optional[float] = None
+    max_age: Optional[float] = None
+
+    def __post_init__(self):
+        self._error = re.compile(self.error, re.IGNORECASE) if self.error else None
+
+    def skip_reason(self, letter: DeadLetter) -> Optional[str]:
+        """Why the message should be left in the DLQ, or None to replay it."""
+        if letter.data is None:
+            return "unparseable"
+        if self.event_ids and letter.data.get("event_id") not in self.event_ids:
+            return "event_id"
+        if self.min_age is not None or self.max_age is not None:
+            age = letter.age
+            if age is None:
+                return "age"
+            if self.min_age is not None and age < self.min_age:
+                return "age"
+            if self.max_age is not None and age > self.max_age:
+                return "age"
+        if self._error:
+            if not self._error.search(letter.error) and not self._error.search(
+                order_error_message(str(letter.data.get("order_uuid")))
+            ):
+                return "error"
+        return None
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of a replay run (thread-safe counters)."""
+    dry_run: bool = False
+    scanned: int = 0
+    replayed: int = 0
+    failed: int = 0
+    skipped: Counter = field(default_factory=Counter)
+    by_event: Counter = field(default_factory=Counter)
+    by_error: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def record(self, letter: DeadLetter, skip_reason: Optional[str] = None, failed: bool = False):
+        with self._lock:
+            self.scanned += 1
+            if skip_reason:
+                self.skipped[skip_reason] += 1
+                return
+            if failed:
+                self.failed += 1
+                return
+            self.replayed += 1
+            self.by_event[letter.data.get("event_id")] += 1
+            self.by_error[letter.error or "(no error recorded)"] += 1
+
+    def summary(self) -> str:
+        """Human-readable report."""
+        verb = "would replay" if self.dry_run else "replayed"
+        lines = [
+            f"Scanned {self.scanned} dead letters in {self.elapsed:.1f}s: "
+            f"{verb} {self.replayed}, failed {self.failed}, "
+            f"skipped {sum(self.skipped.values())}"
+        ]
+        if self.skipped:
+            lines.append("  skipped by: " + ", ".join(f"{k}={v}" for k, v in self.skipped.most_common()))
+        for event_id, count in self.by_event.most_common(20):
+            lines.append(f"  event {event_id}: {count}")
+        for error, count in self.by_error.most_common(10):
+            lines.append(f"  {count:>6}  {error}")
+        return "\n".join(lines)
+
+
+class DLQReplayer:
+    """
+    Parallel, rate-limited replay of the orders DLQ.
+
+    Args:
+        replay_filter: Which messages to replay
+        handler: Called with each OrderMessage instead of republishing
+            (e.g. process_order); True acks it, False leaves it in the DLQ.
+            Runs on the drain threads, so it must be thread-safe.
+        rate: Replays per second across all threads (0 = unlimited)
+        concurrency: Drain threads, each with its own AMQP connection
+        limit: Stop after scanning this many messages (0 = whole queue)
+        dry_run: Only report what would be replayed
+    """
+
+    def __init__(
+        self,
+        replay_filter: ReplayFilter = None,
+        handler: Optional[Callable[[OrderMessage], bool]] = None,
+        rate: float = None,
+        concurrency: int = None,
+        limit: int = 0,
+        dry_run: bool = False
+    ):
+        self.filter = replay_filter or ReplayFilter()
+        self.handler = handler
+        self.bucket = TokenBucket(settings.dlq_replay_rate if rate is None else rate)
+        self.concurrency = max(1, concurrency or settings.dlq_replay_concurrency)
+        self.limit = limit
+        self.dry_run = dry_run
+        self.report = ReplayReport(dry_run=dry_run)
+        self._claimed = 0
+        self._claim_lock = threading.Lock()
+        self._draining = self.concurrency
+        self._drained = threading.Event()
+
+    def run(self) -> ReplayReport:
+        """Drain the DLQ once and return the report."""
+        started = time.monotonic()
+        threads: List[threading.Thread] = [
+            threading.Thread(target=self._drain, name=f"dlq-replay-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.report.elapsed = time.monotonic() - started
+        return self.report
+
+    def _claim(self) -> bool:
+        """Reserve one message of the scan limit."""
+        with self._claim_lock:
+            if self.limit and self._claimed >= self.limit:
+                return False
+            self._claimed += 1
+            return True
+
+    def _drain(self):
+        """Per-thread loop: basic_get until the DLQ is empty (for this channel)."""
+        rabbitmq = RabbitMQConnection()
+        if not rabbitmq.connect():
+            logger.error("DLQ replay thread could not connect to RabbitMQ")
+            self._done_draining()
+            return
+        channel = rabbitmq._channel
+        # Republish must reach orders_queue before the DLQ copy is acked
+        channel.confirm_delivery()
+
+        try:
+            while self._claim():
+                method, properties, body = channel.basic_get(
+                    queue=rabbitmq.dead_letter_queue,
+                    auto_ack=False
+                )
+                if method is None:
+                    break
+                letter = DeadLetter(
+                    delivery_tag=method.delivery_tag,
+                    body=body,
+                    headers=dict(properties.headers or {})
+                )
+                try:
+                    letter.data = json.loads(body.decode("utf-8"))
+                except (ValueError, UnicodeDecodeError):
+                    pass
+
+                reason = self.filter.skip_reason(letter)
+                if reason or self.dry_run:
+                    # Held unacked: returned to the DLQ when the channel closes
+                    self.report.record(letter, skip_reason=reason)
+                    continue
+
+                self.bucket.acquire()
+                if self._replay(rabbitmq, letter):
+                    channel.basic_ack(delivery_tag=method.delivery_tag)
+                    self.report.record(letter)
+                else:
+                    self.report.record(letter, failed=True)
+        except Exception as e:
+            logger.error(f"DLQ replay thread stopped: {e}")
+        finally:
+            self._done_draining()
+            # Closing the channel returns its unacked messages to the DLQ,
+            # where threads still draining would fetch and count them again
+            try:
+                while not self._drained.wait(1.0):
+                    rabbitmq.process_events()
+            except Exception as e:
+                logger.error(f"DLQ replay connection lost while waiting for other threads: {e}")
+            rabbitmq.disconnect()
+
+    def _done_draining(self):
+        """Count this thread out; the last one lets every thread return its held messages."""
+        with self._claim_lock:
+            self._draining -= 1
+            if self._draining == 0:
+                self._drained.set()
+
+    def _replay(self, rabbitmq: RabbitMQConnection, letter: DeadLetter) -> bool:
+        """Replay one message with retry_count reset."""
+        letter.data["retry_count"] = 0
+        if self.handler is not None:
+            try:
+                return self.handler(OrderMessage.from_dict(letter.data))
+            except Exception as e:
+                logger.error(f"Replay of order {letter.data.get('order_uuid')} failed: {e}")
+                return False
+
+        try:
+            exchange, routing_key = order_route(letter.data)
+            rabbitmq._channel.basic_publish(
+                exchange=exchange,
+                routing_key=routing_key,
+                body=json.dumps(letter.data),
+                properties=pika.BasicProperties(
+                    delivery_mode=2,  # Persistent
+                    content_type="application/json",
+                    headers={"x-replayed-from": rabbitmq.dead_letter_queue}
+                ),
+                mandatory=True
+            )
+            return True
+        except (pika.exceptions.UnroutableError, pika.exceptions.NackError) as e:
+            logger.error(f"Replay of order {letter.data.get('order_uuid')} not confirmed: {e}")
+            return False
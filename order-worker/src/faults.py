@@ -0,0 +1,293 @@
+"""
+Fault injection for throughput experiments (fault_injection.py).
+
+A FaultSchedule lists fault windows relative to the start of a run, each
+written START:DURATION:KIND[=ARG] (seconds):
+
+    grpc_error=CODE       the catalog stand-in aborts calls with status CODE
+    grpc_latency=SECONDS  the catalog stand-in answers SECONDS late
+    db_down               every statement fails as during a Postgres
+                          failover; the pool is disposed when the window
+                          ends, as connections to the old primary are dead
+    db_latency=SECONDS    every statement is delayed by SECONDS
+    broker_close          the channel closes: the ack of the message in
+                          flight is lost and the broker redelivers it
+    broker_down           the connection drops: like broker_close, and no
+                          delivery happens until the worker would have
+                          reconnected (RabbitMQConnection.reconnect_with_backoff
+                          delays, so a 3s outage stalls consumption 5s)
+
+Stand-ins:
+- FakeCatalog is a real in-process gRPC InventoryService, so the client's
+  timeouts, circuit breaker and concurrency limiter run unchanged.
+- FaultyBroker is an InMemoryBroker that loses acks and stalls as above.
+- install_db_faults() hooks the SQLAlchemy engine of the configured
+  database; the database itself is not replaced.
+"""
+import logging
+import threading
+import time
+from collections import Counter, deque
+from concurrent import futures
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from .memory_broker import InMemoryBroker
+from .rabbitmq import OrderMessage, RabbitMQConnection
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("grpc_error", "grpc_latency", "db_down", "db_latency", "broker_close", "broker_down")
+
+
+@dataclass
+class FaultWindow:
+    """One scheduled fault."""
+    start: float
+    duration: float
+    kind: str
+    arg: Optional[str] = None
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+    @classmethod
+    def parse(cls, spec: str) -> "FaultWindow":
+        """Parse START:DURATION:KIND[=ARG], e.g. "10:5:grpc_error=UNAVAILABLE"."""
+        try:
+            start, duration, fault = spec.split(":", 2)
+            kind, _, arg = fault.partition("=")
+            window = cls(float(start), float(duration), kind, arg or None)
+        except ValueError:
+            raise ValueError(f"Invalid fault {spec!r}, expected START:DURATION:KIND[=ARG]")
+        if kind not in KINDS:
+            raise ValueError(f"Unknown fault kind {kind!r} (one of {', '.join(KINDS)})")
+        if kind in ("grpc_error", "grpc_latency", "db_latency") and not arg:
+            raise ValueError(f"Fault {kind} needs an argument ({spec!r})")
+        return window
+
+    def __str__(self) -> str:
+        fault = f"{self.kind}={self.arg}" if self.arg else self.kind
+        return f"{fault} at {self.start:g}s for {self.duration:g}s"
+
+
+class FaultSchedule:
+    """Fault windows on a clock that starts with start()."""
+
+    def __init__(self, windows: List[FaultWindow]):
+        self.windows = sorted(windows, key=lambda w: w.start)
+        self._started: Optional[float] = None
+
+    def start(self):
+        self._started = time.monotonic()
+
+    def now(self) -> float:
+        """Seconds since start() (0 before it)."""
+        return 0.0 if self._started is None else time.monotonic() - self._started
+
+    def active(self, kind: str, at: float = None) -> Optional[FaultWindow]:
+        """The window of this kind in effect at `at` (default: now)."""
+        if self._started is None:
+            return None
+        at = self.now() if at is None else at
+        for window in self.windows:
+            if window.kind == kind and window.start <= at < window.end:
+                return window
+        return None
+
+    def interrupted(self, since: float, until: float) -> bool:
+        """True if a broker_close/broker_down window started in (since, until]."""
+        return any(
+            window.kind in ("broker_close", "broker_down") and since < window.start <= until
+            for window in self.windows
+        )
+
+
+def reconnect_delay(outage: float, initial: float, maximum: float) -> float:
+    """Seconds reconnect_with_backoff sleeps before reconnecting after an outage."""
+    delay, waited = initial, initial
+    while waited < outage:
+        delay = min(delay * 2, maximum)
+        waited += delay
+    return waited
+
+
+class FaultyBroker(InMemoryBroker):
+    """InMemoryBroker with broker_close / broker_down faults."""
+
+    def __init__(self, schedule: FaultSchedule):
+        super().__init__()
+        self.schedule = schedule
+        self.redelivered = 0
+        self.stalled = 0.0
+        connection = RabbitMQConnection()
+        self._backoff = (connection._reconnect_delay, connection._max_reconnect_delay)
+
+    def publish_notification(self, notification_type: str, data: dict, queue: str = None) -> bool:
+        with self._cond:
+            self.notifications.append({"type": notification_type, "data": data, "at": self.schedule.now()})
+        return True
+
+    def _deliver(self, queue: str, item: Tuple[bytes, dict], callback: Callable[[OrderMessage], bool]):
+        outage = self.schedule.active("broker_down")
+        if outage is not None:
+            resume_at = outage.start + reconnect_delay(outage.duration, *self._backoff)
+            wait = resume_at - self.schedule.now()
+            if wait > 0:
+                self.stalled += wait
+                time.sleep(wait)
+
+        results = []
+
+        def tracked(message: OrderMessage) -> bool:
+            results.append(callback(message))
+            return results[-1]
+
+        started = self.schedule.now()
+        super()._deliver(queue, item, tracked)
+        if results and results[-1] and self.schedule.interrupted(started, self.schedule.now()):
+            # The ack never reached the broker, which redelivers the original
+            self.acked -= 1
+            self.redelivered += 1
+            with self._cond:
+                self._queues.setdefault(queue, deque()).appendleft(item)
+                self._cond.notify_all()
+
+
+def install_db_faults(engine: Engine, schedule: FaultSchedule) -> Callable[[], None]:
+    """
+    Inject db_down / db_latency faults into every statement run on `engine`.
+
+    Returns:
+        Function removing the hook
+    """
+    state = {"down": False}
+    lock = threading.Lock()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        latency = schedule.active("db_latency")
+        if latency is not None:
+            time.sleep(float(latency.arg))
+        down = schedule.active("db_down") is not None
+        with lock:
+            recovered = state["down"] and not down
+            state["down"] = down
+        if recovered:
+            # Pooled connections pointed at the old primary
+            engine.dispose()
+        if down:
+            raise OperationalError(statement, parameters, ConnectionError("injected failover: server closed the connection"))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return lambda: event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _grpc_modules():
+    import grpc
+    from .generated import common_pb2, inventory_pb2, inventory_pb2_grpc
+    return grpc, common_pb2, inventory_pb2, inventory_pb2_grpc
+
+
+class FakeCatalog:
+    """
+    In-memory InventoryService with grpc_error / grpc_latency faults.
+
+    Every seat is available until committed. Commit attempts that reach
+    the service are counted per order (commit_attempts).
+    """
+
+    def __init__(self, schedule: FaultSchedule):
+        self.schedule = schedule
+        self.sold: dict = {}
+        self.commit_attempts: Counter = Counter()
+        self.calls = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    def start(self, workers: int = 32) -> str:
+        """Serve on a free local port; returns its address."""
+        grpc, _, _, inventory_pb2_grpc = _grpc_modules()
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers))
+        inventory_pb2_grpc.add_InventoryServiceServicer_to_server(self._servicer(), self._server)
+        port = self._server.add_insecure_port("127.0.0.1:0")
+        self._server.start()
+        return f"127.0.0.1:{port}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.stop(grace=None)
+            self._server = None
+
+    def _inject(self, context):
+        with self._lock:
+            self.calls += 1
+        latency = self.schedule.active("grpc_latency")
+        if latency is not None:
+            time.sleep(float(latency.arg))
+        error = self.schedule.active("grpc_error")
+        if error is not None:
+            grpc = _grpc_modules()[0]
+            with self._lock:
+                self.errors += 1
+            context.abort(getattr(grpc.StatusCode, error.arg.upper()), "injected fault")
+
+    def _commit(self, seat_ids: List[int], order_uuid: str) -> List[int]:
+        """Sell all seats to the order, or none; returns the seats that were unavailable."""
+        with self._lock:
+            self.commit_attempts[order_uuid] += 1
+            taken = [seat_id for seat_id in seat_ids if self.sold.get(seat_id, order_uuid) != order_uuid]
+            if not taken:
+                for seat_id in seat_ids:
+                    self.sold[seat_id] = order_uuid
+            return taken
+
+    def _servicer(self):
+        _, common_pb2, inventory_pb2, inventory_pb2_grpc = _grpc_modules()
+        catalog = self
+
+        def committed_at():
+            now = time.time()
+            return common_pb2.Timestamp(seconds=int(now), nanos=int(now % 1 * 1e9))
+
+        class Servicer(inventory_pb2_grpc.InventoryServiceServicer):
+            def CommitSeat(self, request, context):
+                catalog._inject(context)
+                if catalog._commit([request.seat_id], request.order_uuid):
+                    return inventory_pb2.CommitSeatResponse(success=False, message="Seat already sold")
+                return inventory_pb2.CommitSeatResponse(
+                    success=True, seat_status=inventory_pb2.SEAT_STATUS_SOLD, committed_at=committed_at()
+                )
+
+            def CommitSeats(self, request, context):
+                catalog._inject(context)
+                taken = catalog._commit(list(request.seat_ids), request.order_uuid)
+                if taken:
+                    return inventory_pb2.CommitSeatsResponse(
+                        success=False, message="Seat already sold", unavailable_seat_ids=taken
+                    )
+                return inventory_pb2.CommitSeatsResponse(success=True, committed_at=committed_at())
+
+            def GetMultipleSeatsDetails(self, request, context):
+                catalog._inject(context)
+                with catalog._lock:
+                    sold = [
+                        seat_id for seat_id in catalog.sold
+                        if not request.seat_ids or seat_id in request.seat_ids
+                    ]
+                return inventory_pb2.GetMultipleSeatsResponse(
+                    seats=[
+                        inventory_pb2.SeatDetails(
+                            seat_id=seat_id, event_id=request.event_id, status=inventory_pb2.SEAT_STATUS_SOLD
+                        )
+                        for seat_id in sold
+                    ],
+                    total_found=len(sold)
+                )
+
+        return Servicer()
@@ -0,0 +1,408 @@
+"""
+GateService: ticket validation at venue gates.
+
+ValidateTickets is a bidirectional stream per gate scanner. Scans are
+answered from memory:
+
+- The first scan for an event loads an index of its tickets (COMPLETED
+  orders and the seats of cart orders, see cart.completed_tickets),
+  qr_code_hash -> ticket (order_uuid, user_id, seat_id), together with
+  the tickets already redeemed (db_orders.ticket_redemptions). Hashes
+  missing from the index (orders completed after the load) are looked up
+  once in the database; unknown ones are remembered for GATE_MISS_TTL.
+  An event is reloaded after GATE_INDEX_TTL, which picks up redemptions
+  made through other replicas, and at most GATE_INDEX_EVENTS events are
+  kept (least recently scanned dropped first).
+- Scanned QR content is checked with verify_qr_hash against the ticket's
+  own data, so a copied or forged payload is rejected.
+- All gate streams share the index, so a ticket (one seat of an order)
+  is admitted once and any
+  later scan, at any gate, gets ALREADY_REDEEMED with the first gate/time.
+- Redemptions are written behind by RedemptionWriter in batched inserts.
+  The insert ignores conflicts; a conflict means another replica admitted
+  the ticket first and is counted as a late duplicate. Route all gates of
+  an event to one replica to catch duplicates at scan time.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import grpc
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .config import settings
+from .database import get_session
+from .generated import orders_pb2, orders_pb2_grpc
+from .metrics import metrics
+from .cart import completed_tickets
+from .models import TicketRedemption
+from .order_service import _to_timestamp
+from .qr_generator import build_ticket_data, compute_qr_hash, verify_qr_hash
+
+logger = logging.getLogger(__name__)
+
+_scans = metrics.counter("gate_scans_total", "Tickets scanned at gates")
+_duplicates = metrics.counter("gate_duplicate_scans_total", "Scans of tickets already redeemed")
+_late_duplicates = metrics.counter(
+    "gate_late_duplicates_total", "Redemptions another replica had already written"
+)
+_dropped = metrics.counter("gate_redemptions_dropped_total", "Redemptions dropped without being written")
+
+# Longest wait between retries of a failed redemption insert (seconds)
+_MAX_RETRY_DELAY = 30.0
+
+
+@dataclass
+class Ticket:
+    """A valid ticket of an event and its redemption, if any."""
+    order_uuid: str
+    user_id: str
+    event_id: int
+    seat_id: int
+    redeemed_gate: Optional[str] = None
+    redeemed_at: Optional[datetime] = None
+
+
+class RedemptionWriter:
+    """
+    Background thread inserting redemptions in batches.
+
+    A failed insert is retried after flush_interval, doubling up to
+    _MAX_RETRY_DELAY while the database stays unavailable. At most
+    max_pending redemptions are kept meanwhile; older ones are dropped.
+    """
+
+    def __init__(self, flush_interval: float = None, batch_size: int = None, max_pending: int = None):
+        self.flush_interval = flush_interval or settings.gate_flush_interval
+        self.batch_size = batch_size or settings.gate_flush_batch
+        self.max_pending = max_pending or settings.gate_max_pending
+        self._queue: "queue.Queue[dict]" = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="gate-redemptions", daemon=True)
+        self._thread.start()
+
+    def add(self, ticket: Ticket):
+        """Queue a redemption (called with the index lock held; never blocks)."""
+        self._queue.put({
+            "order_uuid": ticket.order_uuid,
+            "seat_id": ticket.seat_id,
+            "event_id": ticket.event_id,
+            "gate_id": ticket.redeemed_gate,
+            "redeemed_at": ticket.redeemed_at,
+        })
+
+    def stop(self):
+        """Stop the thread after writing everything queued."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        pending: List[dict] = []
+        retry_delay = 0.0
+        while True:
+            if retry_delay:
+                # The last insert failed: wait (or stop) instead of retrying at once
+                self._stop.wait(retry_delay)
+            else:
+                deadline = time.monotonic() + self.flush_interval
+                while len(pending) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        pending.append(self._queue.get(timeout=timeout))
+                    except queue.Empty:
+                        break
+            stopping = self._stop.is_set()
+            if stopping or retry_delay:
+                while True:
+                    try:
+                        pending.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+            self._trim(pending)
+            while pending:
+                batch = pending[:self.batch_size]
+                if not self._write(batch):
+                    retry_delay = min(max(retry_delay * 2, self.flush_interval), _MAX_RETRY_DELAY)
+                    break
+                del pending[:len(batch)]
+                retry_delay = 0.0
+                if not stopping and len(pending) < self.batch_size:
+                    break
+            if stopping:
+                if pending:
+                    _dropped.inc(len(pending))
+                    logger.error(f"Dropping {len(pending)} unwritten gate redemptions")
+                return
+
+    def _trim(self, pending: List[dict]):
+        """Drop the oldest redemptions beyond max_pending."""
+        excess = len(pending) - self.max_pending
+        if excess > 0:
+            del pending[:excess]
+            _dropped.inc(excess)
+            logger.error(f"Dropped {excess} unwritten gate redemptions (more than {self.max_pending} pending)")
+
+    def _write(self, batch: List[dict]) -> bool:
+        """Insert a batch; False (keep it for the next flush) on DB errors."""
+        try:
+            with get_session() as session:
+                written = session.execute(
+                    pg_insert(TicketRedemption)
+                    .values(batch)
+                    .on_conflict_do_nothing(index_elements=[TicketRedemption.order_uuid, TicketRedemption.seat_id])
+                    .returning(TicketRedemption.order_uuid)
+                ).scalars().all()
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} gate redemptions, will retry: {e}")
+            return False
+        late = len(batch) - len(written)
+        if late:
+            _late_duplicates.inc(late)
+            logger.warning(f"{late} tickets had already been redeemed through another replica")
+        return True
+
+
+class TicketIndex:
+    """
+    In-memory hash index of the tickets of the events being scanned.
+
+    Args:
+        writer: Writer the redemptions are queued on
+        max_events: Events kept (least recently scanned dropped first)
+        ttl: Seconds before an event is reloaded, which picks up tickets
+            redeemed through other replicas
+    """
+
+    def __init__(self, writer: RedemptionWriter, max_events: int = None, ttl: float = None):
+        self._writer = writer
+        self.max_events = max_events or settings.gate_index_events
+        self.ttl = ttl or settings.gate_index_ttl
+        self._events: "OrderedDict[int, tuple]" = OrderedDict()  # event_id -> (tickets, loaded_at)
+        self._misses: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def load_event(self, event_id: int) -> Dict[str, Ticket]:
+        """
+        Index the tickets and redemptions of an event, reloading it after ttl.
+
+        While one scan reloads an expired event, concurrent scans keep
+        using the previous index instead of waiting.
+        """
+        tickets, fresh = self._get(event_id)
+        if fresh:
+            return tickets
+        if tickets is None:
+            self._load_lock.acquire()
+        elif not self._load_lock.acquire(blocking=False):
+            # Being reloaded: keep scanning against the previous index
+            return tickets
+        try:
+            tickets, fresh = self._get(event_id)
+            if fresh:
+                return tickets
+
+            started = time.perf_counter()
+            loaded, redeemed = self._load_tickets(event_id)
+            with self._lock:
+                # Keep redemptions made here that may not be written yet
+                previous = self._events.get(event_id)
+                if previous is not None:
+                    for qr_hash, ticket in previous[0].items():
+                        reloaded = loaded.get(qr_hash)
+                        if ticket.redeemed_at is not None and reloaded is not None and reloaded.redeemed_at is None:
+                            reloaded.redeemed_gate, reloaded.redeemed_at = ticket.redeemed_gate, ticket.redeemed_at
+                self._events[event_id] = (loaded, time.monotonic())
+                self._events.move_to_end(event_id)
+                while len(self._events) > self.max_events:
+                    self._events.popitem(last=False)
+            logger.info(
+                f"Gate index for event {event_id}: {len(loaded)} tickets, "
+                f"{redeemed} redeemed ({(time.perf_counter() - started) * 1000:.0f}ms)"
+            )
+            return loaded
+        finally:
+            self._load_lock.release()
+
+    def _get(self, event_id: int) -> Tuple[Optional[Dict[str, Ticket]], bool]:
+        """An event's index (or None) and whether it is younger than ttl."""
+        with self._lock:
+            entry = self._events.get(event_id)
+            if entry is None:
+                return None, False
+            self._events.move_to_end(event_id)
+            tickets, loaded_at = entry
+            return tickets, time.monotonic() - loaded_at <= self.ttl
+
+    @staticmethod
+    def _load_tickets(event_id: int) -> Tuple[Dict[str, Ticket], int]:
+        """Read an event's tickets and redemptions; returns (tickets by hash, redemptions)."""
+        tickets_query = completed_tickets(event_id)
+        with get_session() as session:
+            rows = session.execute(
+                select(tickets_query.c.qr_code_hash, tickets_query.c.order_uuid,
+                       tickets_query.c.user_id, tickets_query.c.seat_id)
+            ).all()
+            redeemed = session.execute(
+                select(TicketRedemption.order_uuid, TicketRedemption.seat_id,
+                       TicketRedemption.gate_id, TicketRedemption.redeemed_at)
+                .where(TicketRedemption.event_id == event_id)
+            ).all()
+
+        tickets = {
+            row.qr_code_hash: Ticket(str(row.order_uuid), str(row.user_id), event_id, row.seat_id)
+            for row in rows
+        }
+        by_seat = {(ticket.order_uuid, ticket.seat_id): ticket for ticket in tickets.values()}
+        for order_uuid, seat_id, gate_id, redeemed_at in redeemed:
+            ticket = by_seat.get((str(order_uuid), seat_id))
+            if ticket is not None:
+                ticket.redeemed_gate, ticket.redeemed_at = gate_id, redeemed_at
+        return tickets, len(redeemed)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def lookup(self, event_id: int, qr_hash: str) -> Optional[Ticket]:
+        """Ticket with this hash, from the index or (once per GATE_MISS_TTL) the database."""
+        tickets = self.load_event(event_id)
+        ticket = tickets.get(qr_hash)
+        if ticket is not None:
+            return ticket
+
+        now = time.monotonic()
+        if self._misses.get(qr_hash, 0.0) > now:
+            return None
+
+        tickets_query = completed_tickets()
+        with get_session() as session:
+            row = session.execute(
+                select(tickets_query.c.order_uuid, tickets_query.c.user_id,
+                       tickets_query.c.event_id, tickets_query.c.seat_id)
+                .where(tickets_query.c.qr_code_hash == qr_hash)
+                .limit(1)
+            ).first()
+            redemption = None
+            if row is not None:
+                redemption = session.execute(
+                    select(TicketRedemption.gate_id, TicketRedemption.redeemed_at)
+                    .where(TicketRedemption.order_uuid == row.order_uuid)
+                    .where(TicketRedemption.seat_id == row.seat_id)
+                ).first()
+
+        with self._lock:
+            if row is None:
+                self._misses[qr_hash] = now + settings.gate_miss_ttl
+                if len(self._misses) > 100_000:
+                    self._misses = {h: t for h, t in self._misses.items() if t > now}
+                return None
+            ticket = Ticket(str(row.order_uuid), str(row.user_id), row.event_id, row.seat_id)
+            if redemption is not None:
+                ticket.redeemed_gate, ticket.redeemed_at = redemption
+            if row.event_id == event_id:
+                ticket = tickets.setdefault(qr_hash, ticket)
+            return ticket
+
+    def redeem(self, ticket: Ticket, gate_id: str) -> bool:
+        """Mark a ticket redeemed; False if it already was."""
+        with self._lock:
+            if ticket.redeemed_at is not None:
+                return False
+            ticket.redeemed_gate = gate_id
+            ticket.redeemed_at = datetime.utcnow()
+            self._writer.add(ticket)
+            return True
+
+
+def validate_scan(index: TicketIndex, request: orders_pb2.ValidateTicketRequest) -> orders_pb2.ValidateTicketResponse:
+    """Answer one scan."""
+    _scans.inc()
+    response = orders_pb2.ValidateTicketResponse(scan_id=request.scan_id)
+
+    qr_hash = compute_qr_hash(request.qr_data) if request.qr_data else request.qr_code_hash
+    ticket = index.lookup(request.event_id, qr_hash) if qr_hash else None
+    if ticket is None:
+        response.result = orders_pb2.SCAN_RESULT_UNKNOWN_TICKET
+        return response
+
+    response.order_uuid = ticket.order_uuid
+    response.seat_id = ticket.seat_id
+    if ticket.event_id != request.event_id:
+        response.result = orders_pb2.SCAN_RESULT_WRONG_EVENT
+        return response
+
+    expected = build_ticket_data(ticket.order_uuid, ticket.user_id, ticket.event_id, ticket.seat_id)
+    if (request.qr_data and request.qr_data != expected) or not verify_qr_hash(qr_hash, expected):
+        response.result = orders_pb2.SCAN_RESULT_INVALID
+        return response
+
+    if index.redeem(ticket, request.gate_id):
+        response.result = orders_pb2.SCAN_RESULT_ADMITTED
+    else:
+        _duplicates.inc()
+        response.result = orders_pb2.SCAN_RESULT_ALREADY_REDEEMED
+        response.redeemed_gate_id = ticket.redeemed_gate
+        response.redeemed_at.CopyFrom(_to_timestamp(ticket.redeemed_at))
+    return response
+
+
+class GateServiceServicer(orders_pb2_grpc.GateServiceServicer):
+    """ticketbuster.orders.GateService."""
+
+    def __init__(self, index: TicketIndex, max_streams: int = None):
+        self.index = index
+        self.max_streams = max_streams or settings.gate_max_streams
+        # Each stream holds a server thread for as long as the scanner is connected
+        self._streams = threading.BoundedSemaphore(self.max_streams)
+
+    def ValidateTickets(self, request_iterator, context):
+        if not self._streams.acquire(blocking=False):
+            context.abort(
+                grpc.StatusCode.RESOURCE_EXHAUSTED,
+                f"{self.max_streams} gate streams already open, retry later"
+            )
+        try:
+            for request in request_iterator:
+                try:
+                    yield validate_scan(self.index, request)
+                except Exception as e:
+                    # Keep the gate's stream open; UNSPECIFIED tells it to scan again
+                    logger.error(f"Gate scan {request.scan_id} failed: {e}")
+                    yield orders_pb2.ValidateTicketResponse(scan_id=request.scan_id)
+        finally:
+            self._streams.release()
+
+
+_writer: Optional[RedemptionWriter] = None
+
+
+def add_gate_service(server: grpc.Server) -> Tuple[TicketIndex, RedemptionWriter]:
+    """Register GateService on a gRPC server and start the redemption writer."""
+    global _writer
+    _writer = RedemptionWriter()
+    _writer.start()
+    index = TicketIndex(_writer)
+    orders_pb2_grpc.add_GateServiceServicer_to_server(GateServiceServicer(index), server)
+    logger.info("GateService registered")
+    return index, _writer
+
+
+def stop_gate_service():
+    """Write pending redemptions and stop the writer."""
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
@@ -25,39 +25,43 @@ _sym_db = _symbol_database.Default()
 from . import common_pb2 as common__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0finventory.proto\x12\x16ticketbuster.inventory\x1a\x0c\x63ommon.proto\"^\n\x11\x43ommitSeatRequest\x12\x0f\n\x07seat_id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x12\n\norder_uuid\x18\x03 \x01(\t\x12\x13\n\x0b\x61mount_paid\x18\x04 \x01(\x01\"\xa5\x01\n\x12\x43ommitSeatResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x37\n\x0bseat_status\x18\x03 \x01(\x0e\x32\".ticketbuster.inventory.SeatStatus\x12\x34\n\x0c\x63ommitted_at\x18\x04 \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp\"(\n\x15GetSeatDetailsRequest\x12\x0f\n\x07seat_id\x18\x01 \x01(\x05\"p\n\x16GetSeatDetailsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x34\n\x07\x64\x65tails\x18\x03 \x01(\x0b\x32#.ticketbuster.inventory.SeatDetails\"\xec\x01\n\x0bSeatDetails\x12\x0f\n\x07seat_id\x18\x01 \x01(\x05\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\x05\x12\x13\n\x0bseat_number\x18\x03 \x01(\t\x12\r\n\x05price\x18\x04 \x01(\x01\x12\x14\n\x0cis_available\x18\x05 \x01(\x08\x12\x32\n\x06status\x18\x06 \x01(\x0e\x32\".ticketbuster.inventory.SeatStatus\x12\x19\n\x11locked_by_user_id\x18\x07 \x01(\t\x12\x31\n\tlocked_at\x18\x08 \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp\"R\n\x0fLockSeatRequest\x12\x0f\n\x07seat_id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x1d\n\x15lock_duration_seconds\x18\x03 \x01(\x05\"~\n\x10LockSeatResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x34\n\x0clocked_until\x18\x03 \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp\x12\x12\n\nlock_token\x18\x04 \x01(\t\"J\n\x12ReleaseSeatRequest\x12\x0f\n\x07seat_id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x12\n\nlock_token\x18\x03 \x01(\t\"7\n\x13ReleaseSeatResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"+\n\x17GetMultipleSeatsRequest\x12\x10\n\x08seat_ids\x18\x01 \x03(\x05\"z\n\x18GetMultipleSeatsResponse\x12\x32\n\x05seats\x18\x01 \x03(\x0b\x32#.ticketbuster.inventory.SeatDetails\x12\x13\n\x0btotal_found\x18\x02 \x01(\x05\x12\x15\n\rnot_found_ids\x18\x03 \x03(\x05*r\n\nSeatStatus\x12\x1b\n\x17SEAT_STATUS_UNSPECIFIED\x10\x00\x12\x19\n\x15SEAT_STATUS_AVAILABLE\x10\x01\x12\x16\n\x12SEAT_STATUS_LOCKED\x10\x02\x12\x14\n\x10SEAT_STATUS_SOLD\x10\x03*\xb8\x02\n\x12InventoryErrorCode\x12\x18\n\x14INVENTORY_ERROR_NONE\x10\x00\x12\"\n\x1eINVENTORY_ERROR_SEAT_NOT_FOUND\x10\x01\x12%\n!INVENTORY_ERROR_SEAT_ALREADY_SOLD\x10\x02\x12*\n&INVENTORY_ERROR_SEAT_LOCKED_BY_ANOTHER\x10\x03\x12&\n\"INVENTORY_ERROR_INVALID_LOCK_TOKEN\x10\x04\x12 \n\x1cINVENTORY_ERROR_LOCK_EXPIRED\x10\x05\x12\"\n\x1eINVENTORY_ERROR_DATABASE_ERROR\x10\x06\x12#\n\x1fINVENTORY_ERROR_INVALID_REQUEST\x10\x07\x32\xad\x04\n\x10InventoryService\x12\x63\n\nCommitSeat\x12).ticketbuster.inventory.CommitSeatRequest\x1a*.ticketbuster.inventory.CommitSeatResponse\x12o\n\x0eGetSeatDetails\x12-.ticketbuster.inventory.GetSeatDetailsRequest\x1a..ticketbuster.inventory.GetSeatDetailsResponse\x12]\n\x08LockSeat\x12\'.ticketbuster.inventory.LockSeatRequest\x1a(.ticketbuster.inventory.LockSeatResponse\x12\x66\n\x0bReleaseSeat\x12*.ticketbuster.inventory.ReleaseSeatRequest\x1a+.ticketbuster.inventory.ReleaseSeatResponse\x12|\n\x17GetMultipleSeatsDetails\x12/.ticketbuster.inventory.GetMultipleSeatsRequest\x1a\x30.ticketbuster.inventory.GetMultipleSeatsResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0finventory.proto\x12\x16ticketbuster.inventory\x1a\x0c\x63ommon.proto\"^\n\x11\x43ommitSeatRequest\x12\x0f\n\x07seat_id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x12\n\norder_uuid\x18\x03 \x01(\t\x12\x13\n\x0b\x61mount_paid\x18\x04 \x01(\x01\"\xa5\x01\n\x12\x43ommitSeatResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x37\n\x0bseat_status\x18\x03 \x01(\x0e\x32\".ticketbuster.inventory.SeatStatus\x12\x34\n\x0c\x63ommitted_at\x18\x04 \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp\"`\n\x12\x43ommitSeatsRequest\x12\x10\n\x08seat_ids\x18\x01 \x03(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x12\n\norder_uuid\x18\x03 \x01(\t\x12\x13\n\x0b\x61mount_paid\x18\x04 \x01(\x01\"\x8b\x01\n\x13\x43ommitSeatsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x1c\n\x14unavailable_seat_ids\x18\x03 \x03(\x05\x12\x34\n\x0c\x63ommitted_at\x18\x04 \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp\"(\n\x15GetSeatDetailsRequest\x12\x0f\n\x07seat_id\x18\x01 \x01(\x05\"p\n\x16GetSeatDetailsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x34\n\x07\x64\x65tails\x18\x03 \x01(\x0b\x32#.ticketbuster.inventory.SeatDetails\"\xec\x01\n\x0bSeatDetails\x12\x0f\n\x07seat_id\x18\x01 \x01(\x05\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\x05\x12\x13\n\x0bseat_number\x18\x03 \x01(\t\x12\r\n\x05price\x18\x04 \x01(\x01\x12\x14\n\x0cis_available\x18\x05 \x01(\x08\x12\x32\n\x06status\x18\x06 \x01(\x0e\x32\".ticketbuster.inventory.SeatStatus\x12\x19\n\x11locked_by_user_id\x18\x07 \x01(\t\x12\x31\n\tlocked_at\x18\x08 \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp\"R\n\x0fLockSeatRequest\x12\x0f\n\x07seat_id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x1d\n\x15lock_duration_seconds\x18\x03 \x01(\x05\"~\n\x10LockSeatResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x34\n\x0clocked_until\x18\x03 \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp\x12\x12\n\nlock_token\x18\x04 \x01(\t\"J\n\x12ReleaseSeatRequest\x12\x0f\n\x07seat_id\x18\x01 \x01(\x05\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x12\n\nlock_token\x18\x03 \x01(\t\"7\n\x13ReleaseSeatResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"=\n\x17GetMultipleSeatsRequest\x12\x10\n\x08seat_ids\x18\x01 \x03(\x05\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\x05\"z\n\x18GetMultipleSeatsResponse\x12\x32\n\x05seats\x18\x01 \x03(\x0b\x32#.ticketbuster.inventory.SeatDetails\x12\x13\n\x0btotal_found\x18\x02 \x01(\x05\x12\x15\n\rnot_found_ids\x18\x03 \x03(\x05*r\n\nSeatStatus\x12\x1b\n\x17SEAT_STATUS_UNSPECIFIED\x10\x00\x12\x19\n\x15SEAT_STATUS_AVAILABLE\x10\x01\x12\x16\n\x12SEAT_STATUS_LOCKED\x10\x02\x12\x14\n\x10SEAT_STATUS_SOLD\x10\x03*\xb8\x02\n\x12InventoryErrorCode\x12\x18\n\x14INVENTORY_ERROR_NONE\x10\x00\x12\"\n\x1eINVENTORY_ERROR_SEAT_NOT_FOUND\x10\x01\x12%\n!INVENTORY_ERROR_SEAT_ALREADY_SOLD\x10\x02\x12*\n&INVENTORY_ERROR_SEAT_LOCKED_BY_ANOTHER\x10\x03\x12&\n\"INVENTORY_ERROR_INVALID_LOCK_TOKEN\x10\x04\x12 \n\x1cINVENTORY_ERROR_LOCK_EXPIRED\x10\x05\x12\"\n\x1eINVENTORY_ERROR_DATABASE_ERROR\x10\x06\x12#\n\x1fINVENTORY_ERROR_INVALID_REQUEST\x10\x07\x32\x95\x05\n\x10InventoryService\x12\x63\n\nCommitSeat\x12).ticketbuster.inventory.CommitSeatRequest\x1a*.ticketbuster.inventory.CommitSeatResponse\x12\x66\n\x0b\x43ommitSeats\x12*.ticketbuster.inventory.CommitSeatsRequest\x1a+.ticketbuster.inventory.CommitSeatsResponse\x12o\n\x0eGetSeatDetails\x12-.ticketbuster.inventory.GetSeatDetailsRequest\x1a..ticketbuster.inventory.GetSeatDetailsResponse\x12]\n\x08LockSeat\x12\'.ticketbuster.inventory.LockSeatRequest\x1a(.ticketbuster.inventory.LockSeatResponse\x12\x66\n\x0bReleaseSeat\x12*.ticketbuster.inventory.ReleaseSeatRequest\x1a+.ticketbuster.inventory.ReleaseSeatResponse\x12|\n\x17GetMultipleSeatsDetails\x12/.ticketbuster.inventory.GetMultipleSeatsRequest\x1a\x30.ticketbuster.inventory.GetMultipleSeatsResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'inventory_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_SEATSTATUS']._serialized_start=1230
-  _globals['_SEATSTATUS']._serialized_end=1344
-  _globals['_INVENTORYERRORCODE']._serialized_start=1347
-  _globals['_INVENTORYERRORCODE']._serialized_end=1659
+  _globals['_SEATSTATUS']._serialized_start=1488
+  _globals['_SEATSTATUS']._serialized_end=1602
+  _globals['_INVENTORYERRORCODE']._serialized_start=1605
+  _globals['_INVENTORYERRORCODE']._serialized_end=1917
   _globals['_COMMITSEATREQUEST']._serialized_start=57
   _globals['_COMMITSEATREQUEST']._serialized_end=151
   _globals['_COMMITSEATRESPONSE']._serialized_start=154
   _globals['_COMMITSEATRESPONSE']._serialized_end=319
-  _globals['_GETSEATDETAILSREQUEST']._serialized_start=321
-  _globals['_GETSEATDETAILSREQUEST']._serialized_end=361
-  _globals['_GETSEATDETAILSRESPONSE']._serialized_start=363
-  _globals['_GETSEATDETAILSRESPONSE']._serialized_end=475
-  _globals['_SEATDETAILS']._serialized_start=478
-  _globals['_SEATDETAILS']._serialized_end=714
-  _globals['_LOCKSEATREQUEST']._serialized_start=716
-  _globals['_LOCKSEATREQUEST']._serialized_end=798
-  _globals['_LOCKSEATRESPONSE']._serialized_start=800
-  _globals['_LOCKSEATRESPONSE']._serialized_end=926
-  _globals['_RELEASESEATREQUEST']._serialized_start=928
-  _globals['_RELEASESEATREQUEST']._serialized_end=1002
-  _globals['_RELEASESEATRESPONSE']._serialized_start=1004
-  _globals['_RELEASESEATRESPONSE']._serialized_end=1059
-  _globals['_GETMULTIPLESEATSREQUEST']._serialized_start=1061
-  _globals['_GETMULTIPLESEATSREQUEST']._serialized_end=1104
-  _globals['_GETMULTIPLESEATSRESPONSE']._serialized_start=1106
-  _globals['_GETMULTIPLESEATSRESPONSE']._serialized_end=1228
-  _globals['_INVENTORYSERVICE']._serialized_start=1662
-  _globals['_INVENTORYSERVICE']._serialized_end=2219
+  _globals['_COMMITSEATSREQUEST']._serialized_start=321
+  _globals['_COMMITSEATSREQUEST']._serialized_end=417
+  _globals['_COMMITSEATSRESPONSE']._serialized_start=420
+  _globals['_COMMITSEATSRESPONSE']._serialized_end=559
+  _globals['_GETSEATDETAILSREQUEST']._serialized_start=561
+  _globals['_GETSEATDETAILSREQUEST']._serialized_end=601
+  _globals['_GETSEATDETAILSRESPONSE']._serialized_start=603
+  _globals['_GETSEATDETAILSRESPONSE']._serialized_end=715
+  _globals['_SEATDETAILS']._serialized_start=718
+  _globals['_SEATDETAILS']._serialized_end=954
+  _globals['_LOCKSEATREQUEST']._serialized_start=956
+  _globals['_LOCKSEATREQUEST']._serialized_end=1038
+  _globals['_LOCKSEATRESPONSE']._serialized_start=1040
+  _globals['_LOCKSEATRESPONSE']._serialized_end=1166
+  _globals['_RELEASESEATREQUEST']._serialized_start=1168
+  _globals['_RELEASESEATREQUEST']._serialized_end=1242
+  _globals['_RELEASESEATRESPONSE']._serialized_start=1244
+  _globals['_RELEASESEATRESPONSE']._serialized_end=1299
+  _globals['_GETMULTIPLESEATSREQUEST']._serialized_start=1301
+  _globals['_GETMULTIPLESEATSREQUEST']._serialized_end=1362
+  _globals['_GETMULTIPLESEATSRESPONSE']._serialized_start=1364
+  _globals['_GETMULTIPLESEATSRESPONSE']._serialized_end=1486
+  _globals['_INVENTORYSERVICE']._serialized_start=1920
+  _globals['_INVENTORYSERVICE']._serialized_end=2581
 # @@protoc_insertion_point(module_scope)
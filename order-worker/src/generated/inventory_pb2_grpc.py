@@ -45,6 +45,11 @@ class InventoryServiceStub(object):
                 request_serializer=inventory__pb2.CommitSeatRequest.SerializeToString,
                 response_deserializer=inventory__pb2.CommitSeatResponse.FromString,
                 _registered_method=True)
+        self.CommitSeats = channel.unary_unary(
+                '/ticketbuster.inventory.InventoryService/CommitSeats',
+                request_serializer=inventory__pb2.CommitSeatsRequest.SerializeToString,
+                response_deserializer=inventory__pb2.CommitSeatsResponse.FromString,
+                _registered_method=True)
         self.GetSeatDetails = channel.unary_unary(
                 '/ticketbuster.inventory.InventoryService/GetSeatDetails',
                 request_serializer=inventory__pb2.GetSeatDetailsRequest.SerializeToString,
@@ -84,6 +89,14 @@ class InventoryServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def CommitSeats(self, request, context):
+        """Commit every seat of a multi-seat (cart) order in one transaction:
+        either all seats are sold or none is
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GetSeatDetails(self, request, context):
         """Get seat details for validation and pricing
         Used before processing payment
@@ -122,6 +135,11 @@ def add_InventoryServiceServicer_to_server(servicer, server):
                     request_deserializer=inventory__pb2.CommitSeatRequest.FromString,
                     response_serializer=inventory__pb2.CommitSeatResponse.SerializeToString,
             ),
+            'CommitSeats': grpc.unary_unary_rpc_method_handler(
+                    servicer.CommitSeats,
+                    request_deserializer=inventory__pb2.CommitSeatsRequest.FromString,
+                    response_serializer=inventory__pb2.CommitSeatsResponse.SerializeToString,
+            ),
             'GetSeatDetails': grpc.unary_unary_rpc_method_handler(
                     servicer.GetSeatDetails,
                     request_deserializer=inventory__pb2.GetSeatDetailsRequest.FromString,
@@ -186,6 +204,33 @@ class InventoryService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def CommitSeats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ticketbuster.inventory.InventoryService/CommitSeats',
+            inventory__pb2.CommitSeatsRequest.SerializeToString,
+            inventory__pb2.CommitSeatsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetSeatDetails(request,
             target,
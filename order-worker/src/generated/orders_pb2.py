@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: orders.proto
+# Protobuf Python Version: 6.31.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    6,
+    31,
+    1,
+    '',
+    'orders.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from . import common_pb2 as common__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0corders.proto\x12\x13ticketbuster.orders\x1a\x0c\x63ommon.proto\"\xa8\x01\n\x12\x43reateOrderRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\x05\x12\x0f\n\x07seat_id\x18\x03 \x01(\x05\x12\x14\n\x0ctotal_amount\x18\x04 \x01(\x01\x12\x1d\n\x15processing_complexity\x18\x05 \x01(\x05\x12\x16\n\x0epayment_method\x18\x06 \x01(\t\x12\x11\n\tclient_ip\x18\x07 \x01(\t\"}\n\x13\x43reateOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x12\n\norder_uuid\x18\x02 \x01(\t\x12\x0f\n\x07message\x18\x03 \x01(\t\x12\x30\n\x06status\x18\x04 \x01(\x0e\x32 .ticketbuster.orders.OrderStatus\"+\n\x15GetOrderStatusRequest\x12\x12\n\norder_uuid\x18\x01 \x01(\t\"[\n\x16GetOrderStatusResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x30\n\x05order\x18\x02 \x01(\x0b\x32!.ticketbuster.orders.OrderDetails\"\xb5\x02\n\x0cOrderDetails\x12\x12\n\norder_uuid\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x10\n\x08\x65vent_id\x18\x03 \x01(\x05\x12\x0f\n\x07seat_id\x18\x04 \x01(\x05\x12\x14\n\x0ctotal_amount\x18\x05 \x01(\x01\x12\x30\n\x06status\x18\x06 \x01(\x0e\x32 .ticketbuster.orders.OrderStatus\x12\x14\n\x0cqr_code_hash\x18\x07 \x01(\t\x12\x32\n\ncreated_at\x18\x08 \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp\x12\x34\n\x0c\x63ompleted_at\x18\t \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp\x12\x15\n\rerror_message\x18\n \x01(\t\"I\n\x12\x43\x61ncelOrderRequest\x12\x12\n\norder_uuid\x18\x01 \x01(\t\x12\x0f\n\x07user_id\x18\x02 \x01(\t\x12\x0e\n\x06reason\x18\x03 \x01(\t\"7\n\x13\x43\x61ncelOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\xa9\x01\n\x14GetUserOrdersRequest\x12\x0f\n\x07user_id\x18\x01 \x01(\t\x12\x33\n\npagination\x18\x02 \x01(\x0b\x32\x1f.ticketbuster.common.Pagination\x12\x37\n\rfilter_status\x18\x03 \x01(\x0e\x32 .ticketbuster.orders.OrderStatus\x12\x12\n\npage_token\x18\x04 \x01(\t\"\x98\x01\n\x15GetUserOrdersResponse\x12\x31\n\x06orders\x18\x01 \x03(\x0b\x32!.ticketbuster.orders.OrderDetails\x12\x33\n\npagination\x18\x02 \x01(\x0b\x32\x1f.ticketbuster.common.Pagination\x12\x17\n\x0fnext_page_token\x18\x03 \x01(\t\"\'\n\x11WatchOrderRequest\x12\x12\n\norder_uuid\x18\x01 \x01(\t\"\xc9\x01\n\x11OrderStatusUpdate\x12\x12\n\norder_uuid\x18\x01 \x01(\t\x12\x30\n\x06status\x18\x02 \x01(\x0e\x32 .ticketbuster.orders.OrderStatus\x12\x14\n\x0cqr_code_hash\x18\x03 \x01(\t\x12\x15\n\rerror_message\x18\x04 \x01(\t\x12\x32\n\nchanged_at\x18\x05 \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp\x12\r\n\x05\x66inal\x18\x06 \x01(\x08\"r\n\x15ValidateTicketRequest\x12\x0f\n\x07scan_id\x18\x01 \x01(\t\x12\x10\n\x08\x65vent_id\x18\x02 \x01(\x05\x12\x0f\n\x07gate_id\x18\x03 \x01(\t\x12\x0f\n\x07qr_data\x18\x04 \x01(\t\x12\x14\n\x0cqr_code_hash\x18\x05 \x01(\t\"\xce\x01\n\x16ValidateTicketResponse\x12\x0f\n\x07scan_id\x18\x01 \x01(\t\x12/\n\x06result\x18\x02 \x01(\x0e\x32\x1f.ticketbuster.orders.ScanResult\x12\x12\n\norder_uuid\x18\x03 \x01(\t\x12\x0f\n\x07seat_id\x18\x04 \x01(\x05\x12\x18\n\x10redeemed_gate_id\x18\x05 \x01(\t\x12\x33\n\x0bredeemed_at\x18\x06 \x01(\x0b\x32\x1e.ticketbuster.common.Timestamp*\xbb\x01\n\nScanResult\x12\x1b\n\x17SCAN_RESULT_UNSPECIFIED\x10\x00\x12\x18\n\x14SCAN_RESULT_ADMITTED\x10\x01\x12 \n\x1cSCAN_RESULT_ALREADY_REDEEMED\x10\x02\x12\x1e\n\x1aSCAN_RESULT_UNKNOWN_TICKET\x10\x03\x12\x1b\n\x17SCAN_RESULT_WRONG_EVENT\x10\x04\x12\x17\n\x13SCAN_RESULT_INVALID\x10\x05*\xb3\x01\n\x0bOrderStatus\x12\x1c\n\x18ORDER_STATUS_UNSPECIFIED\x10\x00\x12\x18\n\x14ORDER_STATUS_PENDING\x10\x01\x12\x1b\n\x17ORDER_STATUS_PROCESSING\x10\x02\x12\x1a\n\x16ORDER_STATUS_COMPLETED\x10\x03\x12\x17\n\x13ORDER_STATUS_FAILED\x10\x04\x12\x1a\n\x16ORDER_STATUS_CANCELLED\x10\x05\x32\x85\x04\n\x0cOrderService\x12`\n\x0b\x43reateOrder\x12\'.ticketbuster.orders.CreateOrderRequest\x1a(.ticketbuster.orders.CreateOrderResponse\x12i\n\x0eGetOrderStatus\x12*.ticketbuster.orders.GetOrderStatusRequest\x1a+.ticketbuster.orders.GetOrderStatusResponse\x12`\n\x0b\x43\x61ncelOrder\x12\'.ticketbuster.orders.CancelOrderRequest\x1a(.ticketbuster.orders.CancelOrderResponse\x12\x66\n\rGetUserOrders\x12).ticketbuster.orders.GetUserOrdersRequest\x1a*.ticketbuster.orders.GetUserOrdersResponse\x12^\n\nWatchOrder\x12&.ticketbuster.orders.WatchOrderRequest\x1a&.ticketbuster.orders.OrderStatusUpdate0\x01\x32}\n\x0bGateService\x12n\n\x0fValidateTickets\x12*.ticketbuster.orders.ValidateTicketRequest\x1a+.ticketbuster.orders.ValidateTicketResponse(\x01\x30\x01\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'orders_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  DESCRIPTOR._loaded_options = None
+  _globals['_SCANRESULT']._serialized_start=1829
+  _globals['_SCANRESULT']._serialized_end=2016
+  _globals['_ORDERSTATUS']._serialized_start=2019
+  _globals['_ORDERSTATUS']._serialized_end=2198
+  _globals['_CREATEORDERREQUEST']._serialized_start=52
+  _globals['_CREATEORDERREQUEST']._serialized_end=220
+  _globals['_CREATEORDERRESPONSE']._serialized_start=222
+  _globals['_CREATEORDERRESPONSE']._serialized_end=347
+  _globals['_GETORDERSTATUSREQUEST']._serialized_start=349
+  _globals['_GETORDERSTATUSREQUEST']._serialized_end=392
+  _globals['_GETORDERSTATUSRESPONSE']._serialized_start=394
+  _globals['_GETORDERSTATUSRESPONSE']._serialized_end=485
+  _globals['_ORDERDETAILS']._serialized_start=488
+  _globals['_ORDERDETAILS']._serialized_end=797
+  _globals['_CANCELORDERREQUEST']._serialized_start=799
+  _globals['_CANCELORDERREQUEST']._serialized_end=872
+  _globals['_CANCELORDERRESPONSE']._serialized_start=874
+  _globals['_CANCELORDERRESPONSE']._serialized_end=929
+  _globals['_GETUSERORDERSREQUEST']._serialized_start=932
+  _globals['_GETUSERORDERSREQUEST']._serialized_end=1101
+  _globals['_GETUSERORDERSRESPONSE']._serialized_start=1104
+  _globals['_GETUSERORDERSRESPONSE']._serialized_end=1256
+  _globals['_WATCHORDERREQUEST']._serialized_start=1258
+  _globals['_WATCHORDERREQUEST']._serialized_end=1297
+  _globals['_ORDERSTATUSUPDATE']._serialized_start=1300
+  _globals['_ORDERSTATUSUPDATE']._serialized_end=1501
+  _globals['_VALIDATETICKETREQUEST']._serialized_start=1503
+  _globals['_VALIDATETICKETREQUEST']._serialized_end=1617
+  _globals['_VALIDATETICKETRESPONSE']._serialized_start=1620
+  _globals['_VALIDATETICKETRESPONSE']._serialized_end=1826
+  _globals['_ORDERSERVICE']._serialized_start=2201
+  _globals['_ORDERSERVICE']._serialized_end=2718
+  _globals['_GATESERVICE']._serialized_start=2720
+  _globals['_GATESERVICE']._serialized_end=2845
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,380 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from . import orders_pb2 as orders__pb2
+
+GRPC_GENERATED_VERSION = '1.76.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in orders_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class OrderServiceStub(object):
+    """================================================
+    Order Service
+    Manages order processing and ticket generation
+    ================================================
+
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.CreateOrder = channel.unary_unary(
+                '/ticketbuster.orders.OrderService/CreateOrder',
+                request_serializer=orders__pb2.CreateOrderRequest.SerializeToString,
+                response_deserializer=orders__pb2.CreateOrderResponse.FromString,
+                _registered_method=True)
+        self.GetOrderStatus = channel.unary_unary(
+                '/ticketbuster.orders.OrderService/GetOrderStatus',
+                request_serializer=orders__pb2.GetOrderStatusRequest.SerializeToString,
+                response_deserializer=orders__pb2.GetOrderStatusResponse.FromString,
+                _registered_method=True)
+        self.CancelOrder = channel.unary_unary(
+                '/ticketbuster.orders.OrderService/CancelOrder',
+                request_serializer=orders__pb2.CancelOrderRequest.SerializeToString,
+                response_deserializer=orders__pb2.CancelOrderResponse.FromString,
+                _registered_method=True)
+        self.GetUserOrders = channel.unary_unary(
+                '/ticketbuster.orders.OrderService/GetUserOrders',
+                request_serializer=orders__pb2.GetUserOrdersRequest.SerializeToString,
+                response_deserializer=orders__pb2.GetUserOrdersResponse.FromString,
+                _registered_method=True)
+        self.WatchOrder = channel.unary_stream(
+                '/ticketbuster.orders.OrderService/WatchOrder',
+                request_serializer=orders__pb2.WatchOrderRequest.SerializeToString,
+                response_deserializer=orders__pb2.OrderStatusUpdate.FromString,
+                _registered_method=True)
+
+
+class OrderServiceServicer(object):
+    """================================================
+    Order Service
+    Manages order processing and ticket generation
+    ================================================
+
+    """
+
+    def CreateOrder(self, request, context):
+        """Create a new order (initiated by API Gateway)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetOrderStatus(self, request, context):
+        """Get order status
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CancelOrder(self, request, context):
+        """Cancel a pending order
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetUserOrders(self, request, context):
+        """Get user's order history
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchOrder(self, request, context):
+        """Stream status changes of an order until it reaches a final state
+        (replaces polling GetOrderStatus while the order is processed)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_OrderServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'CreateOrder': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreateOrder,
+                    request_deserializer=orders__pb2.CreateOrderRequest.FromString,
+                    response_serializer=orders__pb2.CreateOrderResponse.SerializeToString,
+            ),
+            'GetOrderStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetOrderStatus,
+                    request_deserializer=orders__pb2.GetOrderStatusRequest.FromString,
+                    response_serializer=orders__pb2.GetOrderStatusResponse.SerializeToString,
+            ),
+            'CancelOrder': grpc.unary_unary_rpc_method_handler(
+                    servicer.CancelOrder,
+                    request_deserializer=orders__pb2.CancelOrderRequest.FromString,
+                    response_serializer=orders__pb2.CancelOrderResponse.SerializeToString,
+            ),
+            'GetUserOrders': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUserOrders,
+                    request_deserializer=orders__pb2.GetUserOrdersRequest.FromString,
+                    response_serializer=orders__pb2.GetUserOrdersResponse.SerializeToString,
+            ),
+            'WatchOrder': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchOrder,
+                    request_deserializer=orders__pb2.WatchOrderRequest.FromString,
+                    response_serializer=orders__pb2.OrderStatusUpdate.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'ticketbuster.orders.OrderService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('ticketbuster.orders.OrderService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class OrderService(object):
+    """================================================
+    Order Service
+    Manages order processing and ticket generation
+    ================================================
+
+    """
+
+    @staticmethod
+    def CreateOrder(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ticketbuster.orders.OrderService/CreateOrder',
+            orders__pb2.CreateOrderRequest.SerializeToString,
+            orders__pb2.CreateOrderResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetOrderStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ticketbuster.orders.OrderService/GetOrderStatus',
+            orders__pb2.GetOrderStatusRequest.SerializeToString,
+            orders__pb2.GetOrderStatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CancelOrder(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ticketbuster.orders.OrderService/CancelOrder',
+            orders__pb2.CancelOrderRequest.SerializeToString,
+            orders__pb2.CancelOrderResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetUserOrders(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/ticketbuster.orders.OrderService/GetUserOrders',
+            orders__pb2.GetUserOrdersRequest.SerializeToString,
+            orders__pb2.GetUserOrdersResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchOrder(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/ticketbuster.orders.OrderService/WatchOrder',
+            orders__pb2.WatchOrderRequest.SerializeToString,
+            orders__pb2.OrderStatusUpdate.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+
+class GateServiceStub(object):
+    """================================================
+    Gate Service
+    Validates and redeems tickets scanned at venue gates
+    ================================================
+
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ValidateTickets = channel.stream_stream(
+                '/ticketbuster.orders.GateService/ValidateTickets',
+                request_serializer=orders__pb2.ValidateTicketRequest.SerializeToString,
+                response_deserializer=orders__pb2.ValidateTicketResponse.FromString,
+                _registered_method=True)
+
+
+class GateServiceServicer(object):
+    """================================================
+    Gate Service
+    Validates and redeems tickets scanned at venue gates
+    ================================================
+
+    """
+
+    def ValidateTickets(self, request_iterator, context):
+        """One stream per gate scanner: every scan gets a response with the same
+        scan_id, in order. A ticket is admitted once; later scans of it (at any
+        gate) are answered ALREADY_REDEEMED with the first redemption.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_GateServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ValidateTickets': grpc.stream_stream_rpc_method_handler(
+                    servicer.ValidateTickets,
+                    request_deserializer=orders__pb2.ValidateTicketRequest.FromString,
+                    response_serializer=orders__pb2.ValidateTicketResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'ticketbuster.orders.GateService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('ticketbuster.orders.GateService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class GateService(object):
+    """================================================
+    Gate Service
+    Validates and redeems tickets scanned at venue gates
+    ================================================
+
+    """
+
+    @staticmethod
+    def ValidateTickets(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/ticketbuster.orders.GateService/ValidateTickets',
+            orders__pb2.ValidateTicketRequest.SerializeToString,
+            orders__pb2.ValidateTicketResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -3,25 +3,56 @@ gRPC client for communicating with Catalog Service.
 Calls CommitSeat RPC to finalize seat purchases.
 """
 import logging
-import grpc
-from dataclasses import dataclass
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
 
 from .config import settings
+from .circuit_breaker import CircuitBreaker
+from .concurrency_limit import AIMDLimiter
+from .metrics import metrics
 
-# Note: These will be generated by grpcio-tools from inventory.proto
+# grpcio and the generated stubs are imported on first use (see _load_grpc)
+# so that importing this module stays cheap during worker startup.
+# Note: Stubs are generated by grpcio-tools from inventory.proto
 # Run: python -m grpc_tools.protoc -I../proto --python_out=./src/generated --grpc_python_out=./src/generated ../proto/inventory.proto ../proto/common.proto
-try:
-    from .generated import inventory_pb2
-    from .generated import inventory_pb2_grpc
-    GRPC_AVAILABLE = True
-except ImportError:
-    GRPC_AVAILABLE = False
-    inventory_pb2 = None
-    inventory_pb2_grpc = None
+grpc = None
+inventory_pb2 = None
+inventory_pb2_grpc = None
+GRPC_AVAILABLE: Optional[bool] = None
+_grpc_lock = threading.Lock()
 
 logger = logging.getLogger(__name__)
 
+_limit_rejections = metrics.counter(
+    "catalog_limit_rejections_total",
+    "CommitSeat calls rejected by the catalog concurrency limiter"
+)
+
+
+def _load_grpc() -> bool:
+    """
+    Import grpcio and the generated inventory stubs once.
+
+    Returns:
+        True if stubs are available, False to run in mock mode
+    """
+    global grpc, inventory_pb2, inventory_pb2_grpc, GRPC_AVAILABLE
+    if GRPC_AVAILABLE is None:
+        with _grpc_lock:
+            if GRPC_AVAILABLE is None:
+                try:
+                    import grpc as _grpc
+                    from .generated import inventory_pb2 as _pb2
+                    from .generated import inventory_pb2_grpc as _pb2_grpc
+                    grpc, inventory_pb2, inventory_pb2_grpc = _grpc, _pb2, _pb2_grpc
+                    GRPC_AVAILABLE = True
+                except ImportError as e:
+                    logger.warning(f"gRPC stubs could not be imported: {e}")
+                    GRPC_AVAILABLE = False
+    return GRPC_AVAILABLE
+
 
 @dataclass
 class CommitSeatResult:
@@ -30,12 +61,52 @@ class CommitSeatResult:
     message: str
     seat_status: Optional[str] = None
     committed_at: Optional[str] = None
+    # True when the call failed because the catalog is unavailable (or the
+    # circuit is open) rather than because the seat could not be sold
+    retryable: bool = False
+    # CommitSeats: seats that were already sold, locked or missing
+    unavailable_seat_ids: List[int] = field(default_factory=list)
+
+
+@dataclass
+class EventSeat:
+    """A seat of an event as listed by GetMultipleSeatsDetails."""
+    seat_id: int
+    price: float
+    sold: bool
+
+
+# gRPC status codes that indicate an unhealthy catalog rather than a
+# business outcome; these count as failures for the circuit breaker
+TRANSIENT_STATUS_CODES = (
+    "UNAVAILABLE",
+    "DEADLINE_EXCEEDED",
+    "RESOURCE_EXHAUSTED",
+    "INTERNAL",
+    "UNKNOWN",
+)
+
+# Codes meaning the catalog is shedding load; they shrink the concurrency limit
+OVERLOAD_STATUS_CODES = (
+    "UNAVAILABLE",
+    "DEADLINE_EXCEEDED",
+    "RESOURCE_EXHAUSTED",
+)
 
 
 class CatalogClient:
     """
     gRPC client for Catalog Service's InventoryService.
     Handles connection management and CommitSeat RPC calls.
+    
+    Calls go through a circuit breaker: once the error rate crosses the
+    configured threshold, commit_seat fails fast with retryable=True
+    instead of waiting for the RPC timeout.
+    
+    In-flight calls are capped by an AIMD limiter that backs off when the
+    catalog slows down or sheds load, so a congested catalog sees less
+    traffic instead of more. Calls that cannot get a slot within
+    CATALOG_LIMIT_WAIT seconds fail with retryable=True.
     """
     
     def __init__(self, address: str = None):
@@ -46,13 +117,30 @@ class CatalogClient:
             address: gRPC server address (host:port). Defaults to settings.
         """
         self.address = address or settings.grpc_catalog_address
-        self._channel: Optional[grpc.Channel] = None
+        self._channel: Optional["grpc.Channel"] = None
         self._stub = None
+        self.timeout = settings.grpc_commit_timeout
+        self.breaker = CircuitBreaker(
+            "catalog",
+            failure_rate=settings.catalog_breaker_failure_rate,
+            window_size=settings.catalog_breaker_window,
+            min_calls=settings.catalog_breaker_min_calls,
+            open_seconds=settings.catalog_breaker_open_seconds,
+            half_open_calls=settings.catalog_breaker_half_open_calls,
+        )
+        self.limiter = AIMDLimiter(
+            "catalog",
+            initial_limit=settings.catalog_limit_initial,
+            min_limit=settings.catalog_limit_min,
+            max_limit=settings.catalog_limit_max,
+            backoff_ratio=settings.catalog_limit_backoff,
+            latency_tolerance=settings.catalog_limit_latency_tolerance,
+        )
         logger.info(f"CatalogClient initialized for {self.address}")
     
     def connect(self):
         """Establish gRPC channel and create stub."""
-        if not GRPC_AVAILABLE:
+        if not _load_grpc():
             logger.warning("gRPC stubs not available - running in mock mode")
             return
             
@@ -71,6 +159,29 @@ class CatalogClient:
         except Exception as e:
             logger.error(f"Failed to connect to Catalog Service: {e}")
             raise
+
+    def wait_for_ready(self, timeout: float = None) -> bool:
+        """
+        Block until the gRPC channel is connected.
+
+        Args:
+            timeout: Seconds to wait (defaults to settings.startup_grpc_ready_timeout)
+
+        Returns:
+            True if the channel became ready (always True in mock mode)
+        """
+        if not _load_grpc():
+            return True
+        if not self._channel:
+            self.connect()
+
+        try:
+            grpc.channel_ready_future(self._channel).result(
+                timeout=timeout or settings.startup_grpc_ready_timeout
+            )
+            return True
+        except grpc.FutureTimeoutError:
+            return False
     
     def disconnect(self):
         """Close gRPC channel."""
@@ -99,7 +210,7 @@ class CatalogClient:
         Returns:
             CommitSeatResult with success status and message
         """
-        if not GRPC_AVAILABLE:
+        if not _load_grpc():
             # Mock mode for development without gRPC stubs
             logger.warning("gRPC not available - returning mock success")
             return CommitSeatResult(
@@ -108,52 +219,202 @@ class CatalogClient:
                 seat_status="sold"
             )
         
+        return self._guarded(lambda: self._commit_seat(seat_id, user_id, order_uuid, amount_paid))
+    
+    def commit_seats(
+        self,
+        seat_ids: List[int],
+        user_id: str,
+        order_uuid: str,
+        amount_paid: float
+    ) -> CommitSeatResult:
+        """
+        Commit every seat of a cart order in one all-or-nothing CommitSeats call.
+        
+        Goes through the same limiter and breaker as commit_seat (one slot
+        per order, whatever its number of seats).
+        
+        Args:
+            seat_ids: Seats of the order
+            user_id: UUID of the user purchasing
+            order_uuid: Order UUID for traceability
+            amount_paid: Total amount paid for all seats
+            
+        Returns:
+            CommitSeatResult; on failure unavailable_seat_ids lists the
+            seats that could not be sold
+        """
+        if not _load_grpc():
+            logger.warning("gRPC not available - returning mock success")
+            return CommitSeatResult(
+                success=True,
+                message="Mock commit successful (gRPC stubs not generated)",
+                seat_status="sold"
+            )
+        
+        return self._guarded(lambda: self._commit_seats(seat_ids, user_id, order_uuid, amount_paid))
+    
+    def _guarded(self, call: Callable[[], Tuple[CommitSeatResult, bool]]) -> CommitSeatResult:
+        """Run a commit RPC with a limiter slot, if the breaker allows it."""
+        if not self.limiter.acquire(timeout=settings.catalog_limit_wait):
+            _limit_rejections.inc()
+            return CommitSeatResult(
+                success=False,
+                message=f"Catalog concurrency limit reached ({self.limiter.limit} in flight)",
+                retryable=True
+            )
+        
+        if not self.breaker.allow_request():
+            self.limiter.release(ignore=True)
+            return CommitSeatResult(
+                success=False,
+                message="Catalog Service circuit open - failing fast",
+                retryable=True
+            )
+        
+        started = time.monotonic()
+        try:
+            result, overloaded = call()
+        except BaseException:
+            self.limiter.release(ignore=True)
+            raise
+        self.limiter.release(time.monotonic() - started, dropped=overloaded)
+        return result
+    
+    def _commit_seat(
+        self,
+        seat_id: int,
+        user_id: str,
+        order_uuid: str,
+        amount_paid: float
+    ) -> Tuple[CommitSeatResult, bool]:
+        """CommitSeat RPC behind the limiter and breaker."""
+        request = inventory_pb2.CommitSeatRequest(
+            seat_id=seat_id,
+            user_id=user_id,
+            order_uuid=order_uuid,
+            amount_paid=amount_paid
+        )
+        return self._call("CommitSeat", request, lambda response: CommitSeatResult(
+            success=response.success,
+            message=response.message,
+            seat_status=response.seat_status if hasattr(response, 'seat_status') else None,
+            committed_at=str(response.committed_at) if hasattr(response, 'committed_at') else None
+        ))
+    
+    def _commit_seats(
+        self,
+        seat_ids: List[int],
+        user_id: str,
+        order_uuid: str,
+        amount_paid: float
+    ) -> Tuple[CommitSeatResult, bool]:
+        """CommitSeats RPC behind the limiter and breaker."""
+        request = inventory_pb2.CommitSeatsRequest(
+            seat_ids=seat_ids,
+            user_id=user_id,
+            order_uuid=order_uuid,
+            amount_paid=amount_paid
+        )
+        return self._call("CommitSeats", request, lambda response: CommitSeatResult(
+            success=response.success,
+            message=response.message,
+            committed_at=str(response.committed_at),
+            unavailable_seat_ids=list(response.unavailable_seat_ids)
+        ))
+    
+    def _call(self, method: str, request, to_result) -> Tuple[CommitSeatResult, bool]:
+        """
+        Call a commit RPC and record the outcome on the breaker.
+        
+        Returns:
+            Tuple of (result, overloaded); overloaded is True when the
+            catalog shed the call (limiter backoff signal)
+        """
         if not self._stub:
             self.connect()
         
         try:
-            # Create request
-            request = inventory_pb2.CommitSeatRequest(
-                seat_id=seat_id,
-                user_id=user_id,
-                order_uuid=order_uuid,
-                amount_paid=amount_paid
-            )
-            
-            # Call RPC with timeout
-            response = self._stub.CommitSeat(request, timeout=30.0)
+            response = getattr(self._stub, method)(request, timeout=self.timeout)
+            self.breaker.record_success()
             
             logger.info(
-                f"CommitSeat response: success={response.success}, "
-                f"message={response.message}"
+                "%s response: success=%s, message=%s",
+                method, response.success, response.message
             )
             
-            return CommitSeatResult(
-                success=response.success,
-                message=response.message,
-                seat_status=response.seat_status if hasattr(response, 'seat_status') else None,
-                committed_at=str(response.committed_at) if hasattr(response, 'committed_at') else None
-            )
+            return to_result(response), False
             
         except grpc.RpcError as e:
             status_code = e.code()
             details = e.details()
-            logger.error(f"gRPC error in CommitSeat: {status_code} - {details}")
+            logger.error(f"gRPC error in {method}: {status_code} - {details}")
+            
+            retryable = status_code.name in TRANSIENT_STATUS_CODES
+            if retryable:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
             
             return CommitSeatResult(
                 success=False,
-                message=f"gRPC error: {status_code.name} - {details}"
-            )
+                message=f"gRPC error: {status_code.name} - {details}",
+                retryable=retryable
+            ), status_code.name in OVERLOAD_STATUS_CODES
         except Exception as e:
-            logger.error(f"Unexpected error in CommitSeat: {e}")
+            # Not a catalog outcome; just release any half-open probe slot
+            self.breaker.record_ignored()
+            logger.error(f"Unexpected error in {method}: {e}")
             return CommitSeatResult(
                 success=False,
                 message=f"Unexpected error: {str(e)}"
+            ), False
+    
+    def list_event_seats(self, event_id: int) -> Optional[List[EventSeat]]:
+        """
+        List every seat of an event (GetMultipleSeatsDetails by event_id).
+        
+        Used to fill the sold-seat and seat price caches; skipped while the
+        circuit is open and not counted by the breaker or the concurrency
+        limiter.
+        
+        Returns:
+            Seats of the event, or None if the catalog could not be asked
+        """
+        if not _load_grpc() or self.breaker.is_open():
+            return None
+        if not self._stub:
+            self.connect()
+        
+        try:
+            response = self._stub.GetMultipleSeatsDetails(
+                inventory_pb2.GetMultipleSeatsRequest(event_id=event_id),
+                timeout=settings.sold_seat_warm_timeout
             )
+        except grpc.RpcError as e:
+            logger.warning(f"GetMultipleSeatsDetails failed for event {event_id}: {e.code().name}")
+            return None
+        
+        return [
+            EventSeat(seat.seat_id, seat.price, seat.status == inventory_pb2.SEAT_STATUS_SOLD)
+            for seat in response.seats
+        ]
+    
+    def get_sold_seats(self, event_id: int) -> Optional[List[int]]:
+        """
+        List the sold seats of an event (to warm the sold-seat cache).
+        
+        Returns:
+            Sold seat ids, or None if the catalog could not be asked
+        """
+        seats = self.list_event_seats(event_id)
+        if seats is None:
+            return None
+        return [seat.seat_id for seat in seats if seat.sold]
     
     def health_check(self) -> bool:
         """Check gRPC channel connectivity."""
-        if not GRPC_AVAILABLE:
+        if not _load_grpc():
             return True  # Mock mode always healthy
             
         if not self._channel:
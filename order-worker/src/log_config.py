@@ -0,0 +1,149 @@
+"""
+Logging setup for Order Worker.
+
+- LOG_FORMAT=json writes one JSON object per line (python-json-logger),
+  with extra= fields and the order correlation fields as keys.
+- LOG_ASYNC=true moves formatting and stdout writes to a background
+  thread: the logging call only enqueues the record (QueueHandler /
+  QueueListener). When the queue is full, records are dropped and counted
+  instead of blocking order processing.
+- order_context() tags every record logged while an order is handled
+  with its order_uuid/event_id/seat_id, and applies LOG_SAMPLE_RATE:
+  INFO/DEBUG lines of unsampled orders are discarded before they are
+  formatted or enqueued. The decision is a hash of the order_uuid, so an
+  order's lines are kept or dropped together (redeliveries included).
+  WARNING and above are always kept.
+"""
+import atexit
+import contextvars
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+from .config import settings
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+JSON_FORMAT = '%(asctime)s %(levelname)s %(name)s %(message)s'
+
+
+@dataclass(frozen=True)
+class OrderLogContext:
+    """Correlation fields of the order being processed."""
+    order_uuid: str
+    event_id: Optional[int]
+    seat_id: Optional[int]
+    sampled: bool
+
+
+_order_context: contextvars.ContextVar[Optional[OrderLogContext]] = contextvars.ContextVar(
+    "order_log_context", default=None
+)
+_listener: Optional[logging.handlers.QueueListener] = None
+dropped_records = 0
+_dropped_lock = threading.Lock()
+
+
+def is_sampled(order_uuid: str) -> bool:
+    """Whether success-path logs of this order are kept (LOG_SAMPLE_RATE)."""
+    rate = settings.log_sample_rate
+    if rate >= 1.0:
+        return True
+    if rate <= 0.0:
+        return False
+    return zlib.crc32(str(order_uuid).encode()) < rate * 0x100000000
+
+
+@contextmanager
+def order_context(order_uuid: str, event_id: Optional[int] = None, seat_id: Optional[int] = None):
+    """Correlate (and sample) all records logged by this thread inside the block."""
+    token = _order_context.set(
+        OrderLogContext(str(order_uuid), event_id, seat_id, is_sampled(order_uuid))
+    )
+    try:
+        yield
+    finally:
+        _order_context.reset(token)
+
+
+class OrderContextFilter(logging.Filter):
+    """Adds the order correlation fields to records and drops unsampled ones."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _order_context.get()
+        if context is None:
+            return True
+        if not context.sampled and record.levelno < logging.WARNING:
+            return False
+        record.order_uuid = context.order_uuid
+        record.event_id = context.event_id
+        record.seat_id = context.seat_id
+        return True
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that enqueues the record as-is.
+
+    The stock prepare() formats the message in the calling thread; here the
+    listener thread does it (message arguments must not be mutated after
+    logging, which holds for the worker's str/number arguments).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        global dropped_records
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with _dropped_lock:
+                dropped_records += 1
+
+
+def _formatter() -> logging.Formatter:
+    if settings.log_format == "json":
+        from pythonjsonlogger.json import JsonFormatter
+        return JsonFormatter(
+            JSON_FORMAT,
+            rename_fields={"asctime": "timestamp", "levelname": "level", "name": "logger"},
+            static_fields={"worker": settings.worker_name},
+        )
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logging():
+    """Install the root handler according to LOG_FORMAT / LOG_ASYNC / LOG_SAMPLE_RATE."""
+    global _listener
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(_formatter())
+
+    if settings.log_async:
+        handler = _NonBlockingQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+        _listener = logging.handlers.QueueListener(handler.queue, stream)
+        _listener.start()
+        atexit.register(stop_logging)
+    else:
+        handler = stream
+    handler.addFilter(OrderContextFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, settings.log_level.upper()))
+
+
+def stop_logging():
+    """Flush queued records (LOG_ASYNC) and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
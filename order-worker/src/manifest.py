@@ -0,0 +1,187 @@
+"""
+Per-event ticket manifests for offline gate devices.
+
+A manifest lists the valid tickets of one event as fixed-size records
+sorted by ticket hash, behind a small header, so a device can mmap the
+file and binary-search it without parsing anything.
+
+Layout (little-endian):
+
+    header (32 bytes)
+        magic          4s    b"TBMF"
+        version        uint16
+        kind           uint16  0 = full, 1 = delta
+        event_id       uint32
+        count          uint32  number of records
+        watermark      int64   newest completed_at included (Unix ms)
+        base           int64   delta: watermark of the previous file (Unix ms); full: 0
+    records (12 bytes each, sorted by key)
+        key            8s    first 16 hex digits of qr_code_hash as raw bytes
+        seat_id        uint32
+
+Keys compare as bytes (memcmp), which is the same order as the hex
+strings. 64 bits of the hash are plenty to tell an event's tickets apart.
+
+Delta files hold the tickets completed after the previous file's
+watermark (minus DELTA_OVERLAP, so orders committed late are not missed;
+devices may see a ticket twice, which is harmless). A device checks the
+full manifest and then each delta. Deltas only add tickets.
+"""
+import logging
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Tuple
+
+from sqlalchemy import select
+
+from .config import settings
+from .database import get_session
+from .cart import completed_tickets
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TBMF"
+VERSION = 1
+KIND_FULL = 0
+KIND_DELTA = 1
+HEADER = struct.Struct("<4sHHIIqq")
+RECORD = struct.Struct("<8sI")
+KEY_SIZE = 8
+DELTA_OVERLAP = timedelta(seconds=60)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def ticket_key(qr_hash: str) -> bytes:
+    """Manifest key of a qr_code_hash."""
+    return bytes.fromhex(qr_hash[:KEY_SIZE * 2])
+
+
+def _to_ms(value: datetime) -> int:
+    return int((value - _EPOCH).total_seconds() * 1000)
+
+
+def _from_ms(value: int) -> datetime:
+    return _EPOCH + timedelta(milliseconds=value)
+
+
+def _completed_tickets(event_id: int, since: Optional[datetime]) -> Iterator[Tuple[str, int, datetime]]:
+    """Stream (qr_code_hash, seat_id, completed_at) sorted by hash with a server-side cursor."""
+    tickets = completed_tickets(event_id)
+    query = (
+        select(tickets.c.qr_code_hash, tickets.c.seat_id, tickets.c.completed_at)
+        .order_by(tickets.c.qr_code_hash.collate("C"))
+    )
+    if since is not None:
+        query = query.where(tickets.c.completed_at > since - DELTA_OVERLAP)
+
+    with get_session() as session:
+        result = session.execute(
+            query.execution_options(stream_results=True, yield_per=settings.manifest_batch_size)
+        )
+        for partition in result.partitions():
+            yield from partition
+
+
+def write_manifest(event_id: int, path: str, since: Optional[datetime] = None) -> Tuple[int, Optional[datetime]]:
+    """
+    Export an event's completed tickets to `path`.
+
+    The file is written next to `path` and renamed into place, so devices
+    never see a partial manifest.
+
+    Args:
+        event_id: Event to export
+        path: Output file
+        since: Write a delta of tickets completed after this watermark
+
+    Returns:
+        Tuple of (records written, watermark)
+    """
+    kind = KIND_FULL if since is None else KIND_DELTA
+    count = 0
+    watermark = since
+    previous = b""
+    tmp_path = f"{path}.tmp"
+
+    with open(tmp_path, "wb", buffering=1024 * 1024) as f:
+        f.write(b"\0" * HEADER.size)
+        for qr_hash, seat_id, completed_at in _completed_tickets(event_id, since):
+            key = ticket_key(qr_hash)
+            if key == previous:
+                logger.warning(f"Duplicate manifest key {key.hex()} in event {event_id}, keeping the first")
+                continue
+            f.write(RECORD.pack(key, seat_id))
+            previous = key
+            count += 1
+            if completed_at is not None and (watermark is None or completed_at > watermark):
+                watermark = completed_at
+        f.seek(0)
+        f.write(HEADER.pack(
+            MAGIC, VERSION, kind, event_id, count,
+            _to_ms(watermark) if watermark else 0,
+            _to_ms(since) if since else 0
+        ))
+
+    os.replace(tmp_path, path)
+    logger.info(
+        f"Wrote {'delta' if since else 'full'} manifest for event {event_id}: "
+        f"{count} tickets, {os.path.getsize(path)} bytes -> {path}"
+    )
+    return count, watermark
+
+
+class Manifest:
+    """Read-only, memory-mapped manifest with binary-search lookups."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.kind, self.event_id, self.count, watermark, base = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {VERSION} ticket manifest")
+        if HEADER.size + self.count * RECORD.size > len(self._map):
+            self._map.close()
+            raise ValueError(f"{path} is truncated")
+        self.watermark = _from_ms(watermark) if watermark else None
+        self.base = _from_ms(base) if base else None
+
+    def lookup(self, qr_hash: str) -> Optional[int]:
+        """Seat of the ticket with this hash, or None if it is not listed."""
+        key = ticket_key(qr_hash)
+        data = self._map
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = HEADER.size + mid * RECORD.size
+            probe = data[offset:offset + KEY_SIZE]
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return RECORD.unpack_from(data, offset)[1]
+        return None
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self) -> "Manifest":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_watermark(path: str) -> Optional[datetime]:
+    """Watermark stored in a manifest header (to chain the next delta)."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+    magic, version, _, _, _, watermark, _ = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a ticket manifest")
+    return _from_ms(watermark) if watermark else None
@@ -0,0 +1,251 @@
+"""
+In-memory stand-in for RabbitMQConnection.
+
+Implements the part of the RabbitMQConnection interface the worker uses
+(consume, publish_notification, park_order/unpark_orders, call_later,
+health_check) on top of in-process queues, so process_order can be driven
+without a broker: traffic replays (replay_traffic.py) and test harnesses.
+
+Differences from RabbitMQ worth knowing when reading results:
+- requeued messages go to the back of the queue (RabbitMQ keeps their
+  position) with retry_count incremented, so a failing message neither
+  starves the others nor loops forever (it reaches the DLQ);
+- messages rejected after their retries land in the DLQ list directly
+  (no dead-letter exchange needed).
+"""
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, Dict, List, Tuple, Union
+
+from .config import settings
+from .log_config import order_context
+from .rabbitmq import OrderMessage
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryBroker:
+    """
+    Single-process broker with RabbitMQConnection's consumer-side API.
+
+    Thread-safe publishing: producers (e.g. a replay feeder thread) call
+    publish_order() while consume() runs the callback on its own thread.
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, Deque[Tuple[bytes, dict]]] = {}
+        self._timers: List[Tuple[float, int, Callable[[], None]]] = []
+        self._timer_ids = itertools.count()
+        self._cond = threading.Condition()
+        self._consuming = False
+        self._finishing = False
+        self._closed = False
+        self.notifications: List[dict] = []
+        self.acked = 0
+        self.requeued = 0
+        self.dead_lettered = 0
+        self._pending = 0  # deliveries whose Future result is not settled yet
+        # main.signal_handler calls rabbitmq._channel.stop_consuming()
+        self._channel = self
+
+    @property
+    def parking_queue(self) -> str:
+        return f"{settings.orders_queue}_parked"
+
+    @property
+    def dead_letter_queue(self) -> str:
+        return f"{settings.orders_queue}_dlq"
+
+    def connect(self) -> bool:
+        self._closed = False
+        return True
+
+    def disconnect(self):
+        with self._cond:
+            self._closed = True
+            self._consuming = False
+            self._cond.notify_all()
+
+    def health_check(self) -> bool:
+        return not self._closed
+
+    def queue_size(self, queue: str = None) -> int:
+        """Messages waiting in a queue (defaults to orders_queue)."""
+        with self._cond:
+            return len(self._queues.get(queue or settings.orders_queue, ()))
+
+    def publish(self, queue: str, body: bytes, headers: dict = None):
+        """Append a message to a queue."""
+        with self._cond:
+            self._queues.setdefault(queue, deque()).append((body, headers or {}))
+            self._cond.notify_all()
+
+    def publish_order(self, body: bytes, headers: dict = None):
+        """Enqueue an order message as the gateway would."""
+        self.publish(settings.orders_queue, body, headers)
+
+    def publish_notification(self, notification_type: str, data: dict, queue: str = None) -> bool:
+        with self._cond:
+            self.notifications.append({"type": notification_type, "data": data})
+        return True
+
+    def park_order(self, message: OrderMessage, reason: str) -> bool:
+        self.publish(
+            self.parking_queue,
+            json.dumps(message.to_dict()).encode(),
+            {"x-parked-reason": reason, "x-parked-by": settings.worker_name}
+        )
+        return True
+
+    def unpark_orders(self, limit: int) -> int:
+        resumed = 0
+        with self._cond:
+            parked = self._queues.get(self.parking_queue)
+            while parked and resumed < limit:
+                body, _ = parked.popleft()
+                self._queues.setdefault(settings.orders_queue, deque()).append((body, {}))
+                resumed += 1
+            if resumed:
+                self._cond.notify_all()
+        return resumed
+
+    def call_later(self, delay: float, callback: Callable[[], None]):
+        """Run callback on the consumer thread after `delay` seconds."""
+        with self._cond:
+            heapq.heappush(self._timers, (time.monotonic() + delay, next(self._timer_ids), callback))
+            self._cond.notify_all()
+
+    def process_events(self, time_limit: float = 0):
+        """Deferred results settle on their own threads; only waits."""
+        time.sleep(time_limit)
+
+    def stop_consuming(self):
+        with self._cond:
+            self._consuming = False
+            self._cond.notify_all()
+
+    def finish(self):
+        """Let consume() return once the consumed queue is empty."""
+        with self._cond:
+            self._finishing = True
+            self._cond.notify_all()
+
+    def drain(self, callback: Callable[[OrderMessage], bool], queue: str = None):
+        """Consume until the queue is empty (including requeued retries and
+        deferred results), then return."""
+        with self._cond:
+            finishing, self._finishing = self._finishing, True
+        try:
+            self.consume(callback, queue)
+        finally:
+            with self._cond:
+                self._finishing = finishing
+
+    def consume(
+        self,
+        callback: Callable[[OrderMessage], bool],
+        queue: str = None
+    ):
+        """
+        Deliver messages to callback until stop_consuming() is called
+        (or, after finish(), until the queue is empty).
+
+        Acks, requeues and dead-letters like RabbitMQConnection.consume
+        (retry_count >= 3 goes to the DLQ). A callback may return a Future,
+        settled when it completes.
+
+        Args:
+            callback: Same contract as RabbitMQConnection.consume
+            queue: Queue to consume (defaults to settings.orders_queue)
+        """
+        queue = queue or settings.orders_queue
+        with self._cond:
+            self._consuming = True
+
+        while True:
+            item = None
+            due: List[Callable[[], None]] = []
+            with self._cond:
+                if not self._consuming:
+                    return
+                now = time.monotonic()
+                while self._timers and self._timers[0][0] <= now:
+                    due.append(heapq.heappop(self._timers)[2])
+                pending = self._queues.get(queue)
+                if pending:
+                    item = pending.popleft()
+                elif not due:
+                    if self._finishing and not self._pending:
+                        return
+                    timeout = self._timers[0][0] - now if self._timers else None
+                    self._cond.wait(timeout)
+                    continue
+
+            for timer in due:
+                timer()
+            if item is not None:
+                self._deliver(queue, item, callback)
+
+    def _deliver(self, queue: str, item: Tuple[bytes, dict], callback: Callable[[OrderMessage], Union[bool, Future]]):
+        """Run the callback for one message and settle it."""
+        body, headers = item
+        try:
+            data = json.loads(body.decode("utf-8"))
+            message = OrderMessage.from_dict(data)
+        except ValueError as e:
+            logger.error(f"Invalid JSON in message: {e}")
+            self._dead_letter(body, headers, "invalid JSON")
+            return
+
+        with order_context(message.order_uuid, message.event_id, message.seat_id):
+            try:
+                success = callback(message)
+            except Exception as e:
+                logger.error(f"Error processing message: {e}")
+                success = False
+
+        if isinstance(success, Future):
+            with self._cond:
+                self._pending += 1
+            success.add_done_callback(lambda future: self._settle_later(queue, item, data, message, future))
+            return
+        self._settle(queue, item, data, message, success)
+
+    def _settle(self, queue: str, item: Tuple[bytes, dict], data: dict, message: OrderMessage, success: bool):
+        body, headers = item
+        if success:
+            with self._cond:
+                self.acked += 1
+        elif message.retry_count >= 3:
+            self._dead_letter(body, headers, "rejected")
+        else:
+            with self._cond:
+                self.requeued += 1
+            data["retry_count"] = message.retry_count + 1
+            self.publish(queue, json.dumps(data).encode(), headers)
+
+    def _settle_later(self, queue: str, item: Tuple[bytes, dict], data: dict, message: OrderMessage, future: Future):
+        """Settle a deferred result (on the thread that completed it)."""
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            logger.error(f"Error processing message: {error}")
+        success = not future.cancelled() and error is None and future.result()
+        self._settle(queue, item, data, message, success)
+        with self._cond:
+            self._pending -= 1
+            self._cond.notify_all()
+
+    def _dead_letter(self, body: bytes, headers: dict, reason: str):
+        with self._cond:
+            self.dead_lettered += 1
+        self.publish(
+            self.dead_letter_queue,
+            body,
+            dict(headers, **{"x-death": [{"reason": reason, "queue": settings.orders_queue}]})
+        )
@@ -0,0 +1,120 @@
+"""
+Prometheus metrics for Order Worker.
+
+Minimal text-format exposition (no client library): gauges read their
+value from a callback at scrape time, counters are incremented in place.
+start_metrics_server() serves GET /metrics from a daemon thread.
+"""
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Counter:
+    """Monotonic counter."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class MetricsRegistry:
+    """Named gauges and counters rendered in Prometheus text format."""
+
+    def __init__(self, prefix: str = "order_worker"):
+        self.prefix = prefix
+        self._gauges: Dict[str, tuple] = {}
+        self._counters: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def gauge(self, name: str, help_text: str, callback: Callable[[], float]):
+        """Register (or replace) a gauge whose value is read from callback()."""
+        with self._lock:
+            self._gauges[name] = (help_text, callback)
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        """Return the counter `name`, creating it on first use."""
+        with self._lock:
+            counter = self._counters.get(name)
+            if counter is None:
+                counter = self._counters[name] = Counter(name, help_text)
+            return counter
+
+    def render(self) -> str:
+        """Exposition text for all metrics."""
+        with self._lock:
+            gauges = list(self._gauges.items())
+            counters = list(self._counters.values())
+
+        lines = []
+        for name, (help_text, callback) in gauges:
+            try:
+                value = float(callback())
+            except Exception as e:
+                logger.debug(f"Gauge {name} failed: {e}")
+                continue
+            full_name = f"{self.prefix}_{name}"
+            lines += [f"# HELP {full_name} {help_text}", f"# TYPE {full_name} gauge", f"{full_name} {value}"]
+        for counter in counters:
+            full_name = f"{self.prefix}_{counter.name}"
+            lines += [
+                f"# HELP {full_name} {counter.help}",
+                f"# TYPE {full_name} counter",
+                f"{full_name} {counter.value}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes are too frequent for the access log
+        pass
+
+
+def start_metrics_server(port: int = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics on `port` from a daemon thread.
+
+    Returns:
+        The server, or None if the port could not be bound
+    """
+    port = port or settings.metrics_port
+    try:
+        server = ThreadingHTTPServer(("", port), _MetricsHandler)
+    except OSError as e:
+        logger.error(f"Could not start metrics server on port {port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info(f"Metrics available on :{port}/metrics")
+    return server
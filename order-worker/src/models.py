@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
 from sqlalchemy import (
-    Column, Integer, Numeric, DateTime, Text, String,
+    Column, Integer, Numeric, DateTime, Text, String, Index,
     Enum as SQLEnum
 )
 from sqlalchemy.dialects.postgresql import UUID
@@ -43,9 +43,22 @@ class Order(Base):
     - created_at: TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     - updated_at: TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     - completed_at: TIMESTAMP
+    - processing_token: UUID (delivery that last started processing)
+    - lease_expires_at: TIMESTAMP (end of its processing lease, see order_state)
+    
+    idx_orders_user_created (user_id, created_at, id) backs keyset
+    pagination in GetUserOrders (scanned backwards for newest-first).
+    
+    created_at is part of the mapped primary key so ORM updates include
+    it and are pruned to one partition when the table is partitioned
+    (k8s/partition_orders.sql); on the plain table id alone is unique.
     """
     __tablename__ = "orders"
-    __table_args__ = {"schema": "db_orders"}
+    __table_args__ = (
+        Index("idx_orders_user_created", "user_id", "created_at", "id"),
+        Index("idx_orders_qr_hash", "qr_code_hash"),
+        {"schema": "db_orders"},
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     order_uuid = Column(UUID(as_uuid=True), unique=True, nullable=False, index=True, default=uuid.uuid4)
@@ -59,9 +72,11 @@ class Order(Base):
     processing_complexity = Column(Integer, nullable=True)
     payment_reference = Column(String(255), nullable=True)
     error_message = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
+    processing_token = Column(UUID(as_uuid=True), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
     
     def __repr__(self):
         return f"<Order(uuid={self.order_uuid}, status={self.status})>"
@@ -84,3 +99,72 @@ class Order(Base):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
         }
+
+
+class OrderItem(Base):
+    """
+    One seat of a multi-seat (cart) order (db_orders.order_items).
+
+    The parent orders row carries the first seat and the order totals;
+    every seat of the cart, the first included, has an item with its own
+    QR ticket. Single-seat orders have no items.
+    """
+    __tablename__ = "order_items"
+    __table_args__ = (
+        Index("idx_order_items_qr_hash", "qr_code_hash"),
+        Index("idx_order_items_event_seat", "event_id", "seat_id"),
+        {"schema": "db_orders"},
+    )
+    
+    order_uuid = Column(UUID(as_uuid=True), primary_key=True)
+    seat_id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, nullable=False)
+    qr_code_hash = Column(Text, nullable=True)
+    qr_code_base64 = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class OrderTiming(Base):
+    """
+    Per-order stage durations in milliseconds (db_orders.order_timings).
+
+    Written by process_order together with the final status update; see
+    src/timings.py for the stages and the rollup query.
+    """
+    __tablename__ = "order_timings"
+    __table_args__ = (
+        Index("idx_order_timings_event_recorded", "event_id", "recorded_at"),
+        {"schema": "db_orders"},
+    )
+    
+    order_uuid = Column(UUID(as_uuid=True), primary_key=True)
+    event_id = Column(Integer, nullable=False)
+    status = Column(String(50), nullable=False)
+    created_at = Column(DateTime, nullable=True)
+    recorded_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    queue_wait_ms = Column(Integer, nullable=True)
+    db_ms = Column(Integer, nullable=False, default=0)
+    cpu_sim_ms = Column(Integer, nullable=False, default=0)
+    qr_render_ms = Column(Integer, nullable=False, default=0)
+    commit_ms = Column(Integer, nullable=False, default=0)
+    total_ms = Column(Integer, nullable=False)
+
+
+class TicketRedemption(Base):
+    """
+    A ticket admitted at a venue gate (db_orders.ticket_redemptions).
+
+    One row per ticket (order and seat): the first accepted scan. Written
+    behind by src/gate_service.py.
+    """
+    __tablename__ = "ticket_redemptions"
+    __table_args__ = (
+        Index("idx_ticket_redemptions_event", "event_id"),
+        {"schema": "db_orders"},
+    )
+    
+    order_uuid = Column(UUID(as_uuid=True), primary_key=True)
+    seat_id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, nullable=False)
+    gate_id = Column(String(100), nullable=False)
+    redeemed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,165 @@
+"""
+Order status change events over Postgres LISTEN/NOTIFY.
+
+process_order calls notify_status_change() inside the same transaction
+as each status update, so the notification is delivered only if (and
+when) the change commits. OrderEventHub holds one LISTEN connection per
+process and fans notifications out to any number of in-process watchers
+(the WatchOrder streaming RPC).
+"""
+import json
+import logging
+import queue
+import select
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from sqlalchemy import func, select as sql_select
+from sqlalchemy.orm import Session
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statuses after which an order no longer changes. FAILED is not one of
+# them: retryable errors record FAILED and a redelivery can still move the
+# order to PROCESSING or COMPLETED.
+FINAL_STATUSES = frozenset({"COMPLETED", "CANCELLED"})
+
+
+def notify_status_change(
+    session: Session,
+    order_uuid: str,
+    status: str,
+    qr_code_hash: Optional[str] = None,
+    error_message: Optional[str] = None
+):
+    """
+    Queue a NOTIFY for an order status change in the session's transaction.
+
+    Postgres delivers it to listeners on commit and drops it on rollback.
+    """
+    payload = {
+        "order_uuid": order_uuid,
+        "status": status,
+        "changed_at": datetime.utcnow().isoformat(),
+    }
+    if qr_code_hash:
+        payload["qr_code_hash"] = qr_code_hash
+    if error_message:
+        # NOTIFY payloads are limited to 8000 bytes
+        payload["error_message"] = error_message[:1000]
+
+    session.execute(
+        sql_select(func.pg_notify(settings.order_events_channel, json.dumps(payload)))
+    )
+
+
+class OrderEventHub:
+    """
+    Single LISTEN connection fanned out to per-order subscriber queues.
+
+    Subscribers receive the decoded NOTIFY payload dicts. Queues are
+    bounded; a watcher that stops reading loses updates rather than
+    blocking the listener thread.
+    """
+
+    def __init__(self, channel: str = None, queue_size: int = 16):
+        self.channel = channel or settings.order_events_channel
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[queue.Queue]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start the listener thread (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="order-events-listener",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Ask the listener thread to exit."""
+        self._stop.set()
+
+    def subscribe(self, order_uuid: str) -> queue.Queue:
+        """Register interest in an order; returns the queue updates arrive on."""
+        updates: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(order_uuid, set()).add(updates)
+        return updates
+
+    def unsubscribe(self, order_uuid: str, updates: queue.Queue):
+        """Remove a queue returned by subscribe()."""
+        with self._lock:
+            watchers = self._subscribers.get(order_uuid)
+            if watchers is not None:
+                watchers.discard(updates)
+                if not watchers:
+                    del self._subscribers[order_uuid]
+
+    @property
+    def watcher_count(self) -> int:
+        """Number of active subscriber queues."""
+        with self._lock:
+            return sum(len(watchers) for watchers in self._subscribers.values())
+
+    def dispatch(self, payload: dict):
+        """Deliver one decoded notification to the order's watchers."""
+        with self._lock:
+            watchers = list(self._subscribers.get(payload.get("order_uuid"), ()))
+        for updates in watchers:
+            try:
+                updates.put_nowait(payload)
+            except queue.Full:
+                logger.warning(f"Dropping status update for slow watcher of {payload.get('order_uuid')}")
+
+    def _run(self):
+        """Listener loop with reconnect/backoff."""
+        delay = 1.0
+        while not self._stop.is_set():
+            try:
+                self._listen()
+                delay = 1.0
+            except Exception as e:
+                logger.error(f"Order events listener error: {e}; reconnecting in {delay:.0f}s")
+                self._stop.wait(delay)
+                delay = min(delay * 2, 30.0)
+
+    def _listen(self):
+        """Hold a LISTEN connection until stopped or it breaks."""
+        import psycopg2
+        import psycopg2.extensions
+
+        conn = psycopg2.connect(settings.database_listen_url)
+        try:
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            logger.info(f"Listening for order status events on '{self.channel}'")
+
+            while not self._stop.is_set():
+                # Wake up periodically to notice stop requests
+                readable, _, _ = select.select([conn], [], [], 1.0)
+                if not readable:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    try:
+                        self.dispatch(json.loads(notify.payload))
+                    except ValueError:
+                        logger.warning(f"Ignoring malformed order event: {notify.payload!r}")
+        finally:
+            conn.close()
+
+
+# Process-wide hub used by the WatchOrder RPC (started by main)
+order_event_hub = OrderEventHub()
@@ -0,0 +1,343 @@
+"""
+gRPC OrderService server for Order Worker.
+Serves order reads (GetOrderStatus, GetUserOrders) straight from the
+db_orders.orders table.
+
+- GetOrderStatus is read-through cached (src.cache.order_status_cache);
+  process_order invalidates the entry on every status transition.
+- GetUserOrders uses keyset pagination over the
+  (user_id, created_at, id) index and never loads the QR payload columns.
+- WatchOrder streams status changes pushed through Postgres NOTIFY
+  (see src.order_events) instead of having clients poll.
+- GateService (src.gate_service) shares the server when enabled.
+"""
+import base64
+import calendar
+import logging
+import queue
+import threading
+import time
+import uuid
+from concurrent import futures
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import grpc
+from sqlalchemy import select, tuple_
+
+from .cache import order_status_cache
+from .config import settings
+from .database import get_session
+from .generated import common_pb2, orders_pb2, orders_pb2_grpc
+from .models import Order
+from .order_events import FINAL_STATUSES, order_event_hub
+
+logger = logging.getLogger(__name__)
+
+# Columns needed to build OrderDetails (qr_code_base64 deliberately excluded)
+ORDER_DETAIL_COLUMNS = (
+    Order.id,
+    Order.order_uuid,
+    Order.user_id,
+    Order.event_id,
+    Order.seat_id,
+    Order.total_amount,
+    Order.status,
+    Order.qr_code_hash,
+    Order.error_message,
+    Order.created_at,
+    Order.completed_at,
+)
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class InvalidPageToken(ValueError):
+    """Raised when a GetUserOrders page_token cannot be decoded."""
+
+
+def _to_timestamp(value: datetime) -> common_pb2.Timestamp:
+    """Convert a naive UTC datetime to a common.Timestamp."""
+    return common_pb2.Timestamp(
+        seconds=calendar.timegm(value.utctimetuple()),
+        nanos=value.microsecond * 1000
+    )
+
+
+def _to_status(status: str) -> int:
+    """Map the DB status string to the OrderStatus proto enum."""
+    try:
+        return orders_pb2.OrderStatus.Value(f"ORDER_STATUS_{status}")
+    except ValueError:
+        return orders_pb2.ORDER_STATUS_UNSPECIFIED
+
+
+def _to_order_details(row) -> orders_pb2.OrderDetails:
+    """Build OrderDetails from a row selected with ORDER_DETAIL_COLUMNS."""
+    details = orders_pb2.OrderDetails(
+        order_uuid=str(row.order_uuid),
+        user_id=str(row.user_id),
+        event_id=row.event_id,
+        seat_id=row.seat_id,
+        total_amount=float(row.total_amount) if row.total_amount else 0.0,
+        status=_to_status(row.status),
+        qr_code_hash=row.qr_code_hash or "",
+        error_message=row.error_message or "",
+    )
+    if row.created_at:
+        details.created_at.CopyFrom(_to_timestamp(row.created_at))
+    if row.completed_at:
+        details.completed_at.CopyFrom(_to_timestamp(row.completed_at))
+    return details
+
+
+def _to_status_update(payload: dict) -> orders_pb2.OrderStatusUpdate:
+    """Build an OrderStatusUpdate from a NOTIFY payload (see notify_status_change)."""
+    update = orders_pb2.OrderStatusUpdate(
+        order_uuid=payload["order_uuid"],
+        status=_to_status(payload["status"]),
+        qr_code_hash=payload.get("qr_code_hash", ""),
+        error_message=payload.get("error_message", ""),
+        final=payload["status"] in FINAL_STATUSES,
+    )
+    if payload.get("changed_at"):
+        update.changed_at.CopyFrom(_to_timestamp(datetime.fromisoformat(payload["changed_at"])))
+    return update
+
+
+def _snapshot_update(details: orders_pb2.OrderDetails) -> orders_pb2.OrderStatusUpdate:
+    """Current state of an order as the first message of a WatchOrder stream."""
+    update = orders_pb2.OrderStatusUpdate(
+        order_uuid=details.order_uuid,
+        status=details.status,
+        qr_code_hash=details.qr_code_hash,
+        error_message=details.error_message,
+        final=orders_pb2.OrderStatus.Name(details.status).replace("ORDER_STATUS_", "") in FINAL_STATUSES,
+    )
+    update.changed_at.CopyFrom(
+        details.completed_at if details.HasField("completed_at") else details.created_at
+    )
+    return update
+
+
+def encode_page_token(created_at: datetime, order_id: int) -> str:
+    """Encode the keyset position of the last row of a page."""
+    raw = f"{created_at.isoformat()}|{order_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_page_token(token: str) -> Tuple[datetime, int]:
+    """Decode a token produced by encode_page_token."""
+    try:
+        created_at, order_id = base64.urlsafe_b64decode(token.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(order_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidPageToken(f"Invalid page_token: {token!r}") from e
+
+
+def load_order_details(order_uuid: uuid.UUID) -> Optional[orders_pb2.OrderDetails]:
+    """Fetch one order from the database (no cache)."""
+    with get_session() as session:
+        row = session.execute(
+            select(*ORDER_DETAIL_COLUMNS).where(Order.order_uuid == order_uuid)
+        ).first()
+    return _to_order_details(row) if row else None
+
+
+def get_order_status(order_uuid: uuid.UUID) -> Optional[orders_pb2.OrderDetails]:
+    """
+    Read-through cached order lookup.
+
+    Returned messages are shared with the cache; copy before mutating.
+    Missing orders are not cached: the row is usually inserted moments
+    later by a worker on another pod, whose invalidation never reaches
+    this cache.
+    """
+    return order_status_cache.get_or_load(
+        str(order_uuid),
+        lambda: load_order_details(order_uuid),
+        cache_none=False
+    )
+
+
+def get_user_orders(
+    user_id: uuid.UUID,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    page_token: str = "",
+    status: Optional[str] = None
+) -> Tuple[List[orders_pb2.OrderDetails], str]:
+    """
+    Fetch one page of a user's orders, newest first.
+
+    Args:
+        user_id: Order owner
+        page_size: Rows per page (clamped to 1..MAX_PAGE_SIZE)
+        page_token: Cursor returned by the previous page ("" for the first)
+        status: Optional status filter (e.g. "COMPLETED")
+
+    Returns:
+        Tuple of (orders, next_page_token); next_page_token is "" on the last page
+    """
+    page_size = max(1, min(page_size or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE))
+
+    query = select(*ORDER_DETAIL_COLUMNS).where(Order.user_id == user_id)
+    if status:
+        query = query.where(Order.status == status)
+    if page_token:
+        created_at, order_id = decode_page_token(page_token)
+        query = query.where(
+            tuple_(Order.created_at, Order.id) < tuple_(created_at, order_id)
+        )
+    # Fetch one extra row to know whether another page exists
+    query = query.order_by(Order.created_at.desc(), Order.id.desc()).limit(page_size + 1)
+
+    with get_session() as session:
+        rows = session.execute(query).all()
+
+    next_page_token = ""
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_page_token = encode_page_token(last.created_at, last.id)
+
+    return [_to_order_details(row) for row in rows], next_page_token
+
+
+class OrderServiceServicer(orders_pb2_grpc.OrderServiceServicer):
+    """
+    Read side of ticketbuster.orders.OrderService.
+    CreateOrder/CancelOrder are not served by the worker (UNIMPLEMENTED).
+    """
+
+    def __init__(self, max_watchers: int = None):
+        self.max_watchers = max_watchers or settings.watch_order_max_streams
+        # Each WatchOrder stream holds a server thread for up to WATCH_ORDER_TIMEOUT
+        self._watchers = threading.BoundedSemaphore(self.max_watchers)
+
+    def GetOrderStatus(self, request, context):
+        try:
+            order_uuid = uuid.UUID(request.order_uuid)
+        except ValueError:
+            return orders_pb2.GetOrderStatusResponse(success=False)
+
+        details = get_order_status(order_uuid)
+        if details is None:
+            return orders_pb2.GetOrderStatusResponse(success=False)
+
+        response = orders_pb2.GetOrderStatusResponse(success=True)
+        response.order.CopyFrom(details)
+        return response
+
+    def GetUserOrders(self, request, context):
+        try:
+            user_id = uuid.UUID(request.user_id)
+        except ValueError:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "user_id must be a UUID")
+
+        status = None
+        if request.filter_status != orders_pb2.ORDER_STATUS_UNSPECIFIED:
+            status = orders_pb2.OrderStatus.Name(request.filter_status).replace("ORDER_STATUS_", "")
+
+        page_size = request.pagination.page_size or DEFAULT_PAGE_SIZE
+        try:
+            orders, next_page_token = get_user_orders(
+                user_id,
+                page_size=page_size,
+                page_token=request.page_token,
+                status=status
+            )
+        except InvalidPageToken as e:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, str(e))
+
+        response = orders_pb2.GetUserOrdersResponse(
+            orders=orders,
+            next_page_token=next_page_token
+        )
+        response.pagination.page_size = min(page_size, MAX_PAGE_SIZE)
+        return response
+
+    def WatchOrder(self, request, context):
+        try:
+            order_uuid = uuid.UUID(request.order_uuid)
+        except ValueError:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "order_uuid must be a UUID")
+        if not self._watchers.acquire(blocking=False):
+            context.abort(
+                grpc.StatusCode.RESOURCE_EXHAUSTED,
+                f"{self.max_watchers} WatchOrder streams already open, poll GetOrderStatus instead"
+            )
+
+        key = str(order_uuid)
+        # Subscribe before reading the current state so a transition that
+        # commits in between is delivered instead of missed
+        updates = order_event_hub.subscribe(key)
+        try:
+            last_status = None
+            details = load_order_details(order_uuid)
+            if details is not None:
+                snapshot = _snapshot_update(details)
+                last_status = snapshot.status
+                yield snapshot
+                if snapshot.final:
+                    return
+
+            deadline = time.monotonic() + settings.watch_order_timeout
+            while context.is_active() and time.monotonic() < deadline:
+                try:
+                    payload = updates.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+
+                update = _to_status_update(payload)
+                if update.status == last_status:
+                    continue
+                last_status = update.status
+                yield update
+                if update.final:
+                    return
+        finally:
+            order_event_hub.unsubscribe(key, updates)
+            self._watchers.release()
+
+
+def start_order_server() -> grpc.Server:
+    """
+    Start the OrderService gRPC server in background threads.
+    
+    Each open WatchOrder or ValidateTickets stream occupies one server
+    thread. Both are capped (WATCH_ORDER_MAX_STREAMS, GATE_MAX_STREAMS)
+    below ORDER_SERVER_WORKERS so that streams cannot starve
+    GetOrderStatus/GetUserOrders.
+    """
+    streams = settings.watch_order_max_streams
+    if settings.gate_service_enabled:
+        streams += settings.gate_max_streams
+    if streams >= settings.order_server_workers:
+        logger.warning(
+            f"Up to {streams} streams can hold all {settings.order_server_workers} "
+            f"order server threads; unary reads will queue behind them"
+        )
+    order_event_hub.start()
+    server = grpc.server(
+        futures.ThreadPoolExecutor(
+            max_workers=settings.order_server_workers,
+            thread_name_prefix="order-rpc"
+        )
+    )
+    orders_pb2_grpc.add_OrderServiceServicer_to_server(OrderServiceServicer(), server)
+    if settings.gate_service_enabled:
+        from .gate_service import add_gate_service
+        add_gate_service(server)
+    server.add_insecure_port(f"[::]:{settings.order_server_port}")
+    server.start()
+    logger.info(f"OrderService gRPC server listening on port {settings.order_server_port}")
+    return server
+
+
+def stop_order_server(server: grpc.Server, grace: float = 5):
+    """Stop the server, then flush GateService redemptions."""
+    server.stop(grace=grace).wait()
+    if settings.gate_service_enabled:
+        from .gate_service import stop_gate_service
+        stop_gate_service()
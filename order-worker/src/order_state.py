@@ -0,0 +1,216 @@
+"""
+Order state machine with compare-and-set transitions.
+
+Every status change is a single conditional statement:
+
+    UPDATE db_orders.orders SET status = :to, ...
+    WHERE order_uuid = :order_uuid [AND created_at = :created_at]
+      AND status IN (:allowed_from)
+    RETURNING id
+
+so there is no SELECT-then-UPDATE round trip and no lock held between
+them. A transition that matches no row lost a race with another
+delivery of the same order (or the order is missing): the caller treats
+the order as already handled and skips the rest of its work instead of
+overwriting the newer state.
+
+Allowed transitions (ALLOWED_FROM):
+
+    PROCESSING  <- PENDING, PROCESSING, FAILED   (FAILED: retry of an error;
+                                                  PROCESSING: lease expired)
+    COMPLETED   <- PROCESSING, FAILED            (a successful seat commit
+                                                  wins over a concurrent failure)
+    FAILED      <- PENDING, PROCESSING
+    CANCELLED   <- PENDING, PROCESSING
+
+COMPLETED and CANCELLED are final.
+
+Processing lease: start_processing stores the delivery's processing_token
+and a lease_expires_at ORDER_PROCESSING_LEASE seconds ahead. A PROCESSING
+row is only taken over once its lease expired or was released (parked
+orders), so two concurrent deliveries of an order cannot both start it;
+the loser gets OrderLeased. Later transitions of the owner pass its
+token and match only while the row still carries it; transitions without
+a token leave a row under a live lease alone. Every transition clears the
+lease.
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .metrics import metrics
+from .models import Order, OrderStatus
+from .order_events import notify_status_change
+from .partitioning import order_conflict_columns, order_key
+
+logger = logging.getLogger(__name__)
+
+ALLOWED_FROM: Dict[OrderStatus, FrozenSet[OrderStatus]] = {
+    OrderStatus.PROCESSING: frozenset({OrderStatus.PENDING, OrderStatus.PROCESSING, OrderStatus.FAILED}),
+    OrderStatus.COMPLETED: frozenset({OrderStatus.PROCESSING, OrderStatus.FAILED}),
+    OrderStatus.FAILED: frozenset({OrderStatus.PENDING, OrderStatus.PROCESSING}),
+    OrderStatus.CANCELLED: frozenset({OrderStatus.PENDING, OrderStatus.PROCESSING}),
+}
+
+_conflicts = metrics.counter(
+    "order_transition_conflicts_total",
+    "Order status transitions rejected because the order was already handled"
+)
+
+
+class OrderLeased(Exception):
+    """Another delivery holds an unexpired processing lease on the order."""
+
+
+def _allowed(to: OrderStatus) -> list:
+    return sorted(status.value for status in ALLOWED_FROM[to])
+
+
+def _unleased(now: datetime):
+    """Rows not under a live processing lease (any status but PROCESSING, or its lease is over)."""
+    return or_(
+        Order.status != OrderStatus.PROCESSING.value,
+        Order.lease_expires_at.is_(None),
+        Order.lease_expires_at <= now
+    )
+
+
+def _startable(now: datetime):
+    """Rows start_processing may take over."""
+    return and_(Order.status.in_(_allowed(OrderStatus.PROCESSING)), _unleased(now))
+
+
+def _key_filter(order_uuid, created_at: Optional[datetime]) -> list:
+    return [getattr(Order, column) == value for column, value in order_key(order_uuid, created_at).items()]
+
+
+def start_processing(
+    session: Session,
+    token: uuid.UUID,
+    lease: float = None,
+    **values
+) -> Optional[Tuple[int, datetime]]:
+    """
+    Insert an order as PROCESSING, or move an existing one to PROCESSING.
+
+    The upsert only updates a row whose status allows the transition and
+    that no other delivery holds a live lease on, so a redelivered
+    COMPLETED order is left alone.
+
+    Args:
+        session: Session whose transaction the upsert joins
+        token: Processing token of this delivery
+        lease: Lease length in seconds (default ORDER_PROCESSING_LEASE)
+        **values: Order columns (order_uuid, user_id, created_at, ...)
+
+    Returns:
+        (id, created_at) of the order, or None if it was already handled
+
+    Raises:
+        OrderLeased: The order is PROCESSING under another delivery's lease
+    """
+    now = values.setdefault("updated_at", datetime.utcnow())
+    lease_expires_at = now + timedelta(seconds=settings.order_processing_lease if lease is None else lease)
+    row = session.execute(
+        pg_insert(Order)
+        .values(
+            status=OrderStatus.PROCESSING.value,
+            processing_token=token,
+            lease_expires_at=lease_expires_at,
+            **values
+        )
+        .on_conflict_do_update(
+            index_elements=order_conflict_columns(),
+            set_={
+                "status": OrderStatus.PROCESSING.value,
+                "updated_at": now,
+                "processing_token": token,
+                "lease_expires_at": lease_expires_at,
+            },
+            where=_startable(now)
+        )
+        .returning(Order.id, Order.created_at)
+    ).one_or_none()
+    if row is None:
+        _conflicts.inc()
+        status = session.execute(
+            select(Order.status).where(*_key_filter(values["order_uuid"], values.get("created_at")))
+        ).scalar()
+        if status == OrderStatus.PROCESSING.value:
+            raise OrderLeased(f"Order {values['order_uuid']} is being processed by another delivery")
+        return None
+    notify_status_change(session, str(values["order_uuid"]), OrderStatus.PROCESSING.value)
+    return row.id, row.created_at
+
+
+def release(session: Session, order_uuid, created_at: Optional[datetime], token: uuid.UUID) -> bool:
+    """
+    Give up the processing lease on an order left PROCESSING (e.g. parked),
+    so its next delivery can start it right away.
+
+    Returns:
+        True if this token held the lease
+    """
+    row = session.execute(
+        update(Order)
+        .where(*_key_filter(order_uuid, created_at))
+        .where(Order.status == OrderStatus.PROCESSING.value, Order.processing_token == token)
+        .values(lease_expires_at=None)
+        .returning(Order.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    return row is not None
+
+
+def transition(
+    session: Session,
+    order_uuid,
+    created_at: Optional[datetime],
+    to: OrderStatus,
+    token: Optional[uuid.UUID] = None,
+    **values
+) -> bool:
+    """
+    Move an order to `to` if its current status allows it.
+
+    On success a status NOTIFY (with qr_code_hash / error_message from
+    `values`) is queued in the same transaction.
+
+    Args:
+        session: Session whose transaction the update joins
+        order_uuid: Order to update
+        created_at: Partition key of the order, if known
+        to: New status
+        token: Processing token of the delivery that started the order;
+               without one, an order under a live lease is not updated
+        **values: Other columns to set with the status
+
+    Returns:
+        True if the order was updated, False if it was already handled
+    """
+    now = datetime.utcnow()
+    owner = Order.processing_token == token if token is not None else _unleased(now)
+    row = session.execute(
+        update(Order)
+        .where(*_key_filter(order_uuid, created_at))
+        .where(Order.status.in_(_allowed(to)), owner)
+        .values(status=to.value, updated_at=now, lease_expires_at=None, **values)
+        .returning(Order.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        _conflicts.inc()
+        logger.info("Order %s not moved to %s: already handled", order_uuid, to.value)
+        return False
+    notify_status_change(
+        session, str(order_uuid), to.value,
+        qr_code_hash=values.get("qr_code_hash"),
+        error_message=values.get("error_message")
+    )
+    return True
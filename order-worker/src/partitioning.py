@@ -0,0 +1,282 @@
+"""
+Time partitioning and QR archival for db_orders.orders.
+
+With ORDERS_PARTITIONED=true (after running k8s/partition_orders.sql) the
+orders table is range-partitioned by created_at into monthly partitions.
+Uniqueness then includes the partition key, so the worker:
+
+- derives created_at from the gateway message timestamp, making
+  redeliveries land on (and upsert) the same row, and
+- includes created_at in every lookup so Postgres prunes to one partition.
+
+Maintenance (archive_orders.py, run as a CronJob):
+
+- ensure_partitions() creates upcoming monthly partitions,
+- archive_past_event_qr() moves QR images of past events (orders and
+  cart seats in order_items) to db_orders.orders_archive and
+  db_orders.order_items_archive as bytea and clears qr_code_base64 in
+  place,
+- retire_partitions() archives and drops whole months past retention
+  (DETACH + DROP instead of a long DELETE and the vacuum it leaves behind).
+"""
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from .config import settings
+from .database import get_session
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_NAME = re.compile(r"^orders_(\d{4})_(\d{2})$")
+
+# Archive rows of orders whose QR is past its event (or whose partition is
+# being retired). Re-archiving an order refreshes it but never loses a
+# QR image that was archived earlier.
+_ARCHIVE_COLUMNS = """
+    order_uuid, user_id, event_id, seat_id, total_amount, status,
+    qr_code_hash, qr_code_png, created_at, completed_at
+"""
+_ARCHIVE_SELECT = """
+    o.order_uuid, o.user_id, o.event_id, o.seat_id, o.total_amount, o.status,
+    o.qr_code_hash, decode(o.qr_code_base64, 'base64'), o.created_at, o.completed_at
+"""
+_ARCHIVE_CONFLICT = """
+    ON CONFLICT (order_uuid) DO UPDATE SET
+        status = EXCLUDED.status,
+        qr_code_hash = EXCLUDED.qr_code_hash,
+        qr_code_png = COALESCE(EXCLUDED.qr_code_png, orders_archive.qr_code_png),
+        completed_at = EXCLUDED.completed_at,
+        archived_at = CURRENT_TIMESTAMP
+"""
+
+_ARCHIVE_QR_SQL = text(f"""
+    WITH batch AS (
+        SELECT o.id, o.created_at
+        FROM db_orders.orders o
+        JOIN db_catalog.events e ON e.id = o.event_id
+        WHERE o.qr_code_base64 IS NOT NULL
+          AND e.date < CURRENT_TIMESTAMP - make_interval(days => :grace_days)
+        LIMIT :batch_size
+        FOR UPDATE OF o SKIP LOCKED
+    ), archived AS (
+        INSERT INTO db_orders.orders_archive ({_ARCHIVE_COLUMNS})
+        SELECT {_ARCHIVE_SELECT}
+        FROM db_orders.orders o
+        JOIN batch b ON b.id = o.id AND b.created_at = o.created_at
+        {_ARCHIVE_CONFLICT}
+    )
+    UPDATE db_orders.orders o
+    SET qr_code_base64 = NULL
+    FROM batch b
+    WHERE o.id = b.id AND o.created_at = b.created_at
+""")
+
+# Same for cart seats, whose tickets live in order_items
+_ARCHIVE_ITEMS_QR_SQL = text("""
+    WITH batch AS (
+        SELECT i.order_uuid, i.seat_id
+        FROM db_orders.order_items i
+        JOIN db_catalog.events e ON e.id = i.event_id
+        WHERE i.qr_code_base64 IS NOT NULL
+          AND e.date < CURRENT_TIMESTAMP - make_interval(days => :grace_days)
+        LIMIT :batch_size
+        FOR UPDATE OF i SKIP LOCKED
+    ), archived AS (
+        INSERT INTO db_orders.order_items_archive (order_uuid, seat_id, event_id, qr_code_hash, qr_code_png, created_at)
+        SELECT i.order_uuid, i.seat_id, i.event_id, i.qr_code_hash, decode(i.qr_code_base64, 'base64'), i.created_at
+        FROM db_orders.order_items i
+        JOIN batch b ON b.order_uuid = i.order_uuid AND b.seat_id = i.seat_id
+        ON CONFLICT (order_uuid, seat_id) DO UPDATE SET
+            qr_code_hash = EXCLUDED.qr_code_hash,
+            qr_code_png = COALESCE(EXCLUDED.qr_code_png, order_items_archive.qr_code_png),
+            archived_at = CURRENT_TIMESTAMP
+    )
+    UPDATE db_orders.order_items i
+    SET qr_code_base64 = NULL
+    FROM batch b
+    WHERE i.order_uuid = b.order_uuid AND i.seat_id = b.seat_id
+""")
+
+_ARCHIVE_TABLES = ("db_orders.orders_archive", "db_orders.order_items_archive")
+
+
+def order_created_at(timestamp: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a gateway message timestamp into a naive UTC datetime.
+
+    Args:
+        timestamp: ISO 8601 string such as "2026-01-20T14:30:00.000Z"
+
+    Returns:
+        Naive UTC datetime (matching the TIMESTAMP columns), or None if
+        missing or unparseable
+    """
+    if not timestamp:
+        return None
+    try:
+        value = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        logger.warning(f"Unparseable order timestamp: {timestamp!r}")
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def order_conflict_columns() -> List[str]:
+    """Columns of the unique constraint used by the order upsert."""
+    if settings.orders_partitioned:
+        return ["order_uuid", "created_at"]
+    return ["order_uuid"]
+
+
+def order_key(order_uuid, created_at: Optional[datetime]) -> dict:
+    """
+    filter_by() arguments identifying one order.
+
+    Includes created_at when the table is partitioned so the lookup is
+    pruned to a single partition.
+    """
+    if settings.orders_partitioned and created_at is not None:
+        return {"order_uuid": order_uuid, "created_at": created_at}
+    return {"order_uuid": order_uuid}
+
+
+def ensure_partitions(months_ahead: int = None) -> int:
+    """
+    Create monthly partitions from the current month up to `months_ahead`.
+
+    Returns:
+        Number of partitions created
+    """
+    months_ahead = settings.partition_months_ahead if months_ahead is None else months_ahead
+    with get_session() as session:
+        created = session.execute(
+            text("SELECT db_orders.ensure_order_partitions(CURRENT_DATE, :months)"),
+            {"months": months_ahead}
+        ).scalar()
+    logger.info(f"Order partitions ensured ({months_ahead} months ahead, {created} created)")
+    return created
+
+
+def _missing_archive_tables() -> List[str]:
+    """Archive tables that do not exist yet (database predating them in init.sql)."""
+    with get_session() as session:
+        return [
+            table for table in _ARCHIVE_TABLES
+            if session.execute(text("SELECT to_regclass(:name)"), {"name": table}).scalar() is None
+        ]
+
+
+def _archive_batches(statement, grace_days: int, batch_size: int) -> int:
+    """Run an archival statement batch by batch until a short batch; returns rows archived."""
+    total = 0
+    while True:
+        with get_session() as session:
+            archived = session.execute(
+                statement,
+                {"grace_days": grace_days, "batch_size": batch_size}
+            ).rowcount
+        total += archived
+        if archived < batch_size:
+            return total
+
+
+def archive_past_event_qr(grace_days: int = None, batch_size: int = None) -> int:
+    """
+    Move QR images of past events into the archive tables.
+
+    Single-seat tickets go from orders to db_orders.orders_archive, cart
+    seats from order_items to db_orders.order_items_archive. Works in
+    batches (one transaction each, SKIP LOCKED so it never waits on the
+    worker) until nothing is left. Skipped with a warning when the
+    archive tables are missing (re-apply k8s/init.sql to create them).
+
+    Args:
+        grace_days: Days after the event date before its QR codes are archived
+        batch_size: Rows per transaction
+
+    Returns:
+        Number of tickets archived
+    """
+    grace_days = settings.archive_grace_days if grace_days is None else grace_days
+    batch_size = batch_size or settings.archive_batch_size
+
+    missing = _missing_archive_tables()
+    if missing:
+        logger.warning(f"Skipping QR archival: {', '.join(missing)} missing (apply k8s/init.sql)")
+        return 0
+
+    orders = _archive_batches(_ARCHIVE_QR_SQL, grace_days, batch_size)
+    items = _archive_batches(_ARCHIVE_ITEMS_QR_SQL, grace_days, batch_size)
+
+    logger.info(
+        f"Archived QR codes of {orders} orders and {items} cart seats "
+        f"for events older than {grace_days} days"
+    )
+    return orders + items
+
+
+def _partition_start(name: str) -> Optional[date]:
+    """First day covered by a monthly partition, from its orders_YYYY_MM name."""
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def retire_partitions(retention_months: int = None) -> List[str]:
+    """
+    Archive and drop monthly partitions older than the retention window.
+
+    Every row of a retired partition is copied to db_orders.orders_archive
+    first; the partition is then detached and dropped, which costs the
+    same regardless of how many rows it held.
+
+    Args:
+        retention_months: Whole months to keep besides the current one
+            (0 disables retirement)
+
+    Returns:
+        Names of the dropped partitions
+    """
+    retention_months = settings.partition_retention_months if retention_months is None else retention_months
+    if retention_months <= 0:
+        return []
+
+    today = date.today()
+    months = today.year * 12 + today.month - 1 - retention_months
+    cutoff = date(months // 12, months % 12 + 1, 1)
+
+    with get_session() as session:
+        names = session.execute(text("""
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            JOIN pg_namespace n ON n.oid = p.relnamespace
+            WHERE n.nspname = 'db_orders' AND p.relname = 'orders'
+        """)).scalars().all()
+
+    retired = []
+    for name in sorted(names):
+        start = _partition_start(name)
+        if start is None or start >= cutoff:
+            continue
+        with get_session() as session:
+            session.execute(text(f"""
+                INSERT INTO db_orders.orders_archive ({_ARCHIVE_COLUMNS})
+                SELECT {_ARCHIVE_SELECT}
+                FROM db_orders."{name}" o
+                {_ARCHIVE_CONFLICT}
+            """))
+            session.execute(text(f'ALTER TABLE db_orders.orders DETACH PARTITION db_orders."{name}"'))
+            session.execute(text(f'DROP TABLE db_orders."{name}"'))
+        logger.info(f"Retired order partition {name}")
+        retired.append(name)
+
+    return retired
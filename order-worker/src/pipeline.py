@@ -0,0 +1,268 @@
+"""
+Staged (SEDA) execution of order processing.
+
+A Pipeline is a list of Stages connected by bounded queues. Each stage
+has its own worker threads (sized for what it waits on: the database,
+the catalog, the broker) and, for CPU-bound work that holds the GIL, an
+optional process pool of its own. A stage that falls behind fills its
+input queue, which blocks the workers of the stage feeding it, and so on
+back to submit().
+
+submit() admits at most max_inflight jobs (by default the capacity of
+all queues and workers), so the first stage's queue never needs more
+room than that. Beyond it, submit() blocks, or with block=False raises
+PipelineFull at once: the broker consumer uses the latter, because its
+connection thread must keep running to settle finished jobs and publish
+for the stages. The refused message is requeued; the worker's prefetch
+keeps that rare (see main._prefetch_count).
+
+A handler receives the job (and the stage's process pool, if it has
+one) and returns None to pass the job to the next stage; anything else
+finishes the job with that result. The last stage's return value is the
+result of jobs that reach it. A handler that raises hands the job to
+on_error, whose return value is the result. Results are delivered
+through the concurrent.futures.Future returned by submit(), which the
+brokers accept in place of a callback's bool (see
+RabbitMQConnection.consume).
+
+Handlers run in a copy of the submitter's context, so log records keep
+the order's fields (src.log_config.order_context).
+"""
+import contextvars
+import logging
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from typing import Any, Callable, List, Optional
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# How often idle and blocked workers check for shutdown (seconds)
+_POLL_INTERVAL = 0.5
+
+
+@dataclass
+class Stage:
+    """
+    One step of a pipeline.
+
+    Args:
+        name: Stage name (metrics, thread names)
+        handler: handler(job) or, with processes, handler(job, pool)
+        workers: Threads taking jobs from the stage's queue
+        queue_size: Jobs that may wait for this stage
+        processes: Size of a process pool owned by the stage (0 = none)
+    """
+    name: str
+    handler: Callable[..., Any]
+    workers: int = 1
+    queue_size: int = 16
+    processes: int = 0
+    pool: Optional[ProcessPoolExecutor] = field(default=None, repr=False)
+
+
+class PipelineStopped(Exception):
+    """The pipeline shut down before the job finished."""
+
+
+class PipelineFull(Exception):
+    """submit(block=False) found max_inflight jobs in the pipeline."""
+
+
+@dataclass
+class _Work:
+    job: Any
+    future: Future
+    context: contextvars.Context
+
+
+class Pipeline:
+    """
+    Bounded-queue pipeline of stages with per-stage worker pools.
+
+    Args:
+        stages: Stages in order
+        on_error: on_error(job, exception) -> result, for handlers that raise
+        max_inflight: Jobs admitted at once (default: capacity)
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        on_error: Callable[[Any, Exception], Any],
+        max_inflight: int = None
+    ):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.on_error = on_error
+        self.max_inflight = max_inflight or self.capacity
+        # The first queue holds at most max_inflight jobs (admission bounds it)
+        self._queues = [queue.Queue()] + [queue.Queue(maxsize=stage.queue_size) for stage in stages[1:]]
+        self._slots = threading.Semaphore(self.max_inflight)
+        self._inflight = 0
+        self._idle = threading.Condition()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def capacity(self) -> int:
+        """Jobs the stages can hold: every queue full and every worker busy."""
+        return sum(stage.queue_size + stage.workers for stage in self.stages)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def depth(self, stage: str) -> int:
+        """Jobs waiting in a stage's queue."""
+        for index, candidate in enumerate(self.stages):
+            if candidate.name == stage:
+                return self._queues[index].qsize()
+        raise KeyError(stage)
+
+    def start(self):
+        """Start the stage workers (and process pools)."""
+        for index, stage in enumerate(self.stages):
+            if stage.processes and stage.pool is None:
+                # spawn: forking a process that runs gRPC/pika threads is unsafe
+                stage.pool = ProcessPoolExecutor(max_workers=stage.processes, mp_context=get_context("spawn"))
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._run, args=(index,), name=f"pipeline-{stage.name}-{n}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+        logger.info(
+            "Pipeline started: "
+            + " -> ".join(
+                f"{stage.name}({stage.workers}{f'+{stage.processes}p' if stage.processes else ''})"
+                for stage in self.stages
+            )
+            + f", max in flight {self.max_inflight}"
+        )
+
+    def register_metrics(self):
+        """Expose queue depth per stage and the jobs in flight as gauges."""
+        for index, stage in enumerate(self.stages):
+            metrics.gauge(
+                f"pipeline_{stage.name}_queue_depth",
+                f"Jobs waiting for the {stage.name} stage",
+                self._queues[index].qsize
+            )
+        metrics.gauge("pipeline_inflight", "Jobs admitted to the pipeline and not finished", lambda: self._inflight)
+
+    def submit(self, job: Any, block: bool = True) -> Future:
+        """
+        Admit a job, blocking while max_inflight jobs are in the pipeline.
+
+        Args:
+            job: Job handed to the first stage
+            block: False to raise PipelineFull instead of waiting for room
+
+        Returns:
+            Future resolved with the job's result (cancelled once the
+            pipeline is shut down)
+        """
+        future: Future = Future()
+        if self._stopped.is_set():
+            future.cancel()
+            return future
+        if not block:
+            if not self._slots.acquire(blocking=False):
+                raise PipelineFull(f"{self.max_inflight} jobs in flight")
+        else:
+            while not self._slots.acquire(timeout=_POLL_INTERVAL):
+                if self._stopped.is_set():
+                    future.cancel()
+                    return future
+        with self._idle:
+            self._inflight += 1
+        future.set_running_or_notify_cancel()
+        self._queues[0].put(_Work(job, future, contextvars.copy_context()))
+        return future
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """Wait until no job is in flight; returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._inflight == 0, timeout)
+
+    def shutdown(self, timeout: float = 5.0):
+        """
+        Stop the workers after their current job.
+
+        Jobs still queued are abandoned (their futures fail with
+        PipelineStopped and the broker requeues their messages); call
+        wait_idle() first to let them finish.
+        """
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        for inbox in self._queues:
+            while True:
+                try:
+                    self._finish(inbox.get_nowait(), cancelled=True)
+                except queue.Empty:
+                    break
+        for stage in self.stages:
+            if stage.pool is not None:
+                stage.pool.shutdown(wait=True)
+                stage.pool = None
+
+    def _run(self, index: int):
+        stage = self.stages[index]
+        inbox = self._queues[index]
+        last = index == len(self.stages) - 1
+        while not self._stopped.is_set():
+            try:
+                work = inbox.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            try:
+                if stage.pool is not None:
+                    result = work.context.run(stage.handler, work.job, stage.pool)
+                else:
+                    result = work.context.run(stage.handler, work.job)
+            except Exception as e:
+                try:
+                    result = work.context.run(self.on_error, work.job, e)
+                except Exception as error:
+                    logger.exception(f"Pipeline error handler failed in stage {stage.name}: {error}")
+                    self._finish(work, exception=error)
+                    continue
+                self._finish(work, result)
+                continue
+
+            if result is not None or last:
+                self._finish(work, result)
+            else:
+                self._forward(index + 1, work)
+
+    def _forward(self, index: int, work: _Work):
+        """Put a job on the next stage's queue, waiting for room (backpressure)."""
+        while True:
+            try:
+                self._queues[index].put(work, timeout=_POLL_INTERVAL)
+                return
+            except queue.Full:
+                if self._stopped.is_set():
+                    self._finish(work, cancelled=True)
+                    return
+
+    def _finish(self, work: _Work, result: Any = None, exception: Exception = None, cancelled: bool = False):
+        with self._idle:
+            self._inflight -= 1
+            if self._inflight == 0:
+                self._idle.notify_all()
+        self._slots.release()
+        if cancelled:
+            work.future.set_exception(PipelineStopped())
+        elif exception is not None:
+            work.future.set_exception(exception)
+        else:
+            work.future.set_result(result)
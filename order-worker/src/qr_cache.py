@@ -0,0 +1,199 @@
+"""
+Content-addressed cache of rendered QR images.
+
+A QR image is a pure function of its ticket data, which qr_hash
+identifies, and of the QR parameters in generate_qr_code, so retries,
+redeliveries and regenerations of an order can reuse an image instead of
+rendering it again. Keys are "<qr_hash>-<RENDER_VERSION>"; bump
+RENDER_VERSION whenever the rendering parameters change.
+
+Two tiers:
+- memory: per-process LRU bounded by QR_CACHE_MEMORY_BYTES,
+- disk (QR_CACHE_DIR, e.g. a volume shared by all pods): one PNG per key
+  under a two-character fan-out directory, written to a temporary file
+  and renamed into place, so readers never see a partial image and
+  concurrent writers of the same key are harmless. Hits refresh the
+  file's mtime; when the directory grows past QR_CACHE_DISK_BYTES the
+  least recently used files are deleted down to 90% of the limit.
+"""
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from .config import settings
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+RENDER_VERSION = "v1"
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Re-measure the shared directory after this many writes (other pods write too)
+_RESCAN_EVERY = 256
+
+_memory_hits = metrics.counter("qr_cache_memory_hits_total", "QR images served from the in-memory cache")
+_disk_hits = metrics.counter("qr_cache_disk_hits_total", "QR images served from the shared disk cache")
+_misses = metrics.counter("qr_cache_misses_total", "QR images that had to be rendered")
+_evictions = metrics.counter("qr_cache_disk_evictions_total", "QR images evicted from the disk cache")
+
+
+class QRArtifactCache:
+    """Two-tier (memory LRU + optional shared directory) cache of PNG bytes."""
+
+    def __init__(self, memory_bytes: int, directory: str = "", disk_bytes: int = 0):
+        self.memory_bytes = memory_bytes
+        self.directory = directory
+        self.disk_bytes = disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_used = 0
+        self._disk_used: Optional[int] = None
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+
+    @staticmethod
+    def key(qr_hash: str) -> str:
+        return f"{qr_hash}-{RENDER_VERSION}"
+
+    def get(self, qr_hash: str) -> Optional[bytes]:
+        """Cached image for a ticket, or None."""
+        key = self.key(qr_hash)
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        if data is not None:
+            _memory_hits.inc()
+            return data
+
+        data = self._read(key)
+        if data is None:
+            _misses.inc()
+            return None
+        _disk_hits.inc()
+        self._remember(key, data)
+        return data
+
+    def put(self, qr_hash: str, data: bytes):
+        """Store a rendered image in both tiers."""
+        key = self.key(qr_hash)
+        self._remember(key, data)
+        if self.directory:
+            try:
+                self._write(key, data)
+            except OSError as e:
+                logger.warning(f"Could not write QR cache entry {key}: {e}")
+
+    def _remember(self, key: str, data: bytes):
+        if len(data) > self.memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_used -= len(previous)
+            self._memory[key] = data
+            self._memory_used += len(data)
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= len(evicted)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.png")
+
+    def _read(self, key: str) -> Optional[bytes]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if not data.startswith(_PNG_SIGNATURE):
+            logger.warning(f"Discarding corrupt QR cache entry {path}")
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _write(self, key: str, data: bytes):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        with self._lock:
+            self._writes += 1
+            rescan = self._disk_used is None or self._writes % _RESCAN_EVERY == 0
+            if self._disk_used is not None:
+                self._disk_used += len(data)
+            over = self._disk_used is not None and self._disk_used > self.disk_bytes
+        if self.disk_bytes and (rescan or over):
+            self._evict()
+
+    def _evict(self):
+        """Measure the directory and delete the least recently used files past the limit."""
+        if not self._evict_lock.acquire(blocking=False):
+            return  # another thread is already evicting
+        try:
+            entries = []
+            for shard in os.scandir(self.directory):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    if entry.name.startswith(".tmp-"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue  # removed by another pod
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            used = sum(size for _, size, _ in entries)
+
+            if used > self.disk_bytes:
+                target = int(self.disk_bytes * 0.9)
+                evicted = 0
+                for _, size, path in sorted(entries):
+                    if used <= target:
+                        break
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        continue
+                    used -= size
+                    evicted += 1
+                _evictions.inc(evicted)
+                logger.info(f"QR disk cache: evicted {evicted} images, {used} bytes in use")
+
+            with self._lock:
+                self._disk_used = used
+        except OSError as e:
+            logger.warning(f"QR disk cache eviction failed: {e}")
+        finally:
+            self._evict_lock.release()
+
+
+qr_cache = QRArtifactCache(
+    memory_bytes=settings.qr_cache_memory_bytes,
+    directory=settings.qr_cache_dir,
+    disk_bytes=settings.qr_cache_disk_bytes
+)
@@ -6,28 +6,58 @@ based on processing_complexity for K8s autoscaling demos.
 import hashlib
 import io
 import logging
+import threading
 import time
-from typing import Tuple
+from typing import Optional, Tuple
 
-import qrcode
-from PIL import Image
+from .config import settings
+from .qr_cache import qr_cache
+from .timings import StageTimings
 
 logger = logging.getLogger(__name__)
 
+# Block hashed per round in "buffer" CPU load mode. hashlib releases the
+# GIL for inputs larger than 2047 bytes, so this mode scales across cores
+# when orders are processed on a thread pool.
+BUFFER_BLOCK_SIZE = 64 * 1024
+
+# Chained 32-byte iterations that cost the same as one buffer round,
+# measured once per process (see _calibrate_buffer_mode)
+_iterations_per_round: Optional[float] = None
+_calibration_lock = threading.Lock()
+
+
+def warm_up() -> bool:
+    """
+    Import the QR/imaging libraries ahead of the first order.
+
+    qrcode (and PIL, which it loads to render PNGs) are imported lazily so
+    they don't slow down module import; the worker calls this concurrently
+    with its dependency connects during startup.
+    """
+    import qrcode.image.pil  # noqa: F401 - loads qrcode and PIL
+    
+    if settings.cpu_load_mode == "buffer":
+        _calibrate_buffer_mode()
+    return True
+
 
 def generate_qr_code(
     order_uuid: str,
     user_id: str,
     event_id: int,
     seat_id: int,
-    processing_complexity: int = 5
+    processing_complexity: int = 5,
+    timings=None
 ) -> Tuple[str, bytes, float]:
     """
     Generate QR code for a ticket with CPU-intensive simulation.
     
     The processing_complexity parameter (1-10) determines how much
     CPU work is done. This is used to demonstrate Kubernetes
-    Horizontal Pod Autoscaler (HPA) scaling under load.
+    Horizontal Pod Autoscaler (HPA) scaling under load. The simulation
+    always runs; the rendered image comes from the QR cache when the
+    ticket was rendered before.
     
     Args:
         order_uuid: Order UUID for the ticket
@@ -35,17 +65,20 @@ def generate_qr_code(
         event_id: Event ID
         seat_id: Seat ID
         processing_complexity: 1-10, higher = more CPU work
+        timings: Optional StageTimings; cpu_sim and qr_render are added to it
         
     Returns:
         Tuple of (qr_hash, qr_image_bytes, processing_time_seconds)
     """
+    import qrcode
+
     start_time = time.time()
     
     # Create ticket data for QR code
-    ticket_data = f"TICKET:{order_uuid}|USER:{user_id}|EVENT:{event_id}|SEAT:{seat_id}"
+    ticket_data = build_ticket_data(order_uuid, user_id, event_id, seat_id)
     
     # Generate base hash
-    qr_hash = hashlib.sha256(ticket_data.encode()).hexdigest()[:32]
+    qr_hash = compute_qr_hash(ticket_data)
     
     # CPU-intensive work based on complexity (1-10)
     # This simulates real-world heavy processing like:
@@ -53,38 +86,69 @@ def generate_qr_code(
     # - Cryptographic operations
     # - Complex validations
     _simulate_cpu_load(processing_complexity, qr_hash)
+    render_started = time.time()
+    if timings is not None:
+        timings.add("cpu_sim", render_started - start_time)
     
-    # Generate actual QR code image
-    qr = qrcode.QRCode(
-        version=2,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(ticket_data)
-    qr.make(fit=True)
-    
-    # Create image
-    qr_image = qr.make_image(fill_color="black", back_color="white")
-    
-    # Convert to bytes
-    img_buffer = io.BytesIO()
-    qr_image.save(img_buffer, format='PNG')
-    qr_bytes = img_buffer.getvalue()
+    # Reuse the image if this ticket was rendered before (retries,
+    # redeliveries, regenerations); parameter changes need a new
+    # qr_cache.RENDER_VERSION
+    qr_bytes = qr_cache.get(qr_hash)
+    if qr_bytes is None:
+        # Generate actual QR code image
+        qr = qrcode.QRCode(
+            version=2,
+            error_correction=qrcode.constants.ERROR_CORRECT_H,
+            box_size=10,
+            border=4,
+        )
+        qr.add_data(ticket_data)
+        qr.make(fit=True)
+        
+        # Create image
+        qr_image = qr.make_image(fill_color="black", back_color="white")
+        
+        # Convert to bytes
+        img_buffer = io.BytesIO()
+        qr_image.save(img_buffer, format='PNG')
+        qr_bytes = img_buffer.getvalue()
+        qr_cache.put(qr_hash, qr_bytes)
     
     processing_time = time.time() - start_time
+    if timings is not None:
+        timings.add("qr_render", start_time + processing_time - render_started)
     
     logger.info(
-        f"Generated QR code: hash={qr_hash[:8]}..., "
-        f"complexity={processing_complexity}, "
-        f"time={processing_time:.3f}s, "
-        f"size={len(qr_bytes)} bytes"
+        "Generated QR code: hash=%.8s..., complexity=%s, time=%.3fs, size=%d bytes",
+        qr_hash, processing_complexity, processing_time, len(qr_bytes),
+        extra={"complexity": processing_complexity, "qr_bytes": len(qr_bytes)}
     )
     
     return qr_hash, qr_bytes, processing_time
 
 
-def _simulate_cpu_load(complexity: int, seed: str):
+def generate_qr_code_timed(
+    order_uuid: str,
+    user_id: str,
+    event_id: int,
+    seat_id: int,
+    processing_complexity: int = 5
+) -> Tuple[str, bytes, float, StageTimings]:
+    """
+    generate_qr_code for a process pool: the cpu_sim and qr_render
+    timings are returned instead of added to the caller's StageTimings.
+    
+    Returns:
+        Tuple of (qr_hash, qr_image_bytes, processing_time_seconds, timings)
+    """
+    timings = StageTimings()
+    qr_hash, qr_bytes, processing_time = generate_qr_code(
+        order_uuid, user_id, event_id, seat_id, processing_complexity, timings
+    )
+    return qr_hash, qr_bytes, processing_time, timings
+
+
+def _simulate_cpu_load(complexity: int, seed: str, mode: str = None):
     """
     Simulate CPU-intensive work based on complexity level.
     
@@ -97,7 +161,15 @@ def _simulate_cpu_load(complexity: int, seed: str):
     
     This uses iterative hashing which is CPU-bound and
     creates measurable load for K8s autoscaling.
+    
+    Modes (settings.cpu_load_mode):
+    - "chain": sha256 over 32-byte digests in a Python loop. Holds the
+      GIL, so threads cannot run it in parallel.
+    - "buffer": same single-core duration, but hashes 64 KB blocks that
+      hashlib processes with the GIL released.
     """
+    mode = mode or settings.cpu_load_mode
+    
     # Clamp complexity to 1-10
     complexity = max(1, min(10, complexity))
     
@@ -109,16 +181,75 @@ def _simulate_cpu_load(complexity: int, seed: str):
     # Cap at reasonable maximum
     iterations = min(iterations, 5_000_000)
     
-    logger.debug(f"Running {iterations:,} hash iterations for complexity {complexity}")
+    if mode == "buffer":
+        rounds = max(1, round(iterations / _calibrate_buffer_mode()))
+        logger.debug(f"Running {rounds:,} buffer hash rounds for complexity {complexity}")
+        _buffer_hash(seed.encode(), rounds)
+        return
     
-    # CPU-bound work: iterative hashing
-    data = seed.encode()
+    logger.debug(f"Running {iterations:,} hash iterations for complexity {complexity}")
+    _chain_hash(seed.encode(), iterations)
+
+
+def _chain_hash(data: bytes, iterations: int) -> bytes:
+    """CPU-bound work: iterative hashing of small digests (GIL held)."""
     for i in range(iterations):
         data = hashlib.sha256(data).digest()
         
         # Periodically do some extra work to prevent optimization
         if i % 10000 == 0:
             _ = hashlib.sha512(data).hexdigest()
+    return data
+
+
+def _buffer_hash(seed: bytes, rounds: int) -> bytes:
+    """CPU-bound work: chained hashing of large blocks (GIL released)."""
+    block = (seed * (BUFFER_BLOCK_SIZE // len(seed) + 1))[:BUFFER_BLOCK_SIZE]
+    digest = hashlib.sha256(seed).digest()
+    for _ in range(rounds):
+        h = hashlib.sha256(digest)
+        h.update(block)
+        digest = h.digest()
+    return digest
+
+
+def _calibrate_buffer_mode() -> float:
+    """
+    Measure how many chain-mode iterations one buffer round is worth.
+    
+    Keeps the complexity -> duration contract identical across modes on
+    the current hardware. Runs once (~30ms), normally from warm_up().
+    """
+    global _iterations_per_round
+    if _iterations_per_round is None:
+        with _calibration_lock:
+            if _iterations_per_round is None:
+                sample_iterations = 20_000
+                start = time.perf_counter()
+                _chain_hash(b"calibration", sample_iterations)
+                per_iteration = (time.perf_counter() - start) / sample_iterations
+                
+                sample_rounds = 64
+                start = time.perf_counter()
+                _buffer_hash(b"calibration", sample_rounds)
+                per_round = (time.perf_counter() - start) / sample_rounds
+                
+                _iterations_per_round = max(per_round / per_iteration, 1.0)
+                logger.info(
+                    f"CPU load calibration: 1 buffer round = "
+                    f"{_iterations_per_round:.1f} chain iterations"
+                )
+    return _iterations_per_round
+
+
+def build_ticket_data(order_uuid: str, user_id: str, event_id: int, seat_id: int) -> str:
+    """Ticket payload encoded in the QR image."""
+    return f"TICKET:{order_uuid}|USER:{user_id}|EVENT:{event_id}|SEAT:{seat_id}"
+
+
+def compute_qr_hash(ticket_data: str) -> str:
+    """Hash stored in orders.qr_code_hash for a ticket payload."""
+    return hashlib.sha256(ticket_data.encode()).hexdigest()[:32]
 
 
 def verify_qr_hash(qr_hash: str, expected_data: str) -> bool:
@@ -132,5 +263,4 @@ def verify_qr_hash(qr_hash: str, expected_data: str) -> bool:
     Returns:
         True if hash matches, False otherwise
     """
-    expected_hash = hashlib.sha256(expected_data.encode()).hexdigest()[:32]
-    return qr_hash == expected_hash
+    return qr_hash == compute_qr_hash(expected_data)
@@ -1,21 +1,33 @@
 """
 RabbitMQ consumer and publisher for Order Worker.
-Consumes from orders_queue and publishes to notifications_queue.
+Consumes from orders_queue (and its shard queues, see src.sharding) and
+publishes to notifications_queue.
 """
 import json
 import logging
+import threading
 import time
-from typing import Callable, Optional, Any
-from dataclasses import dataclass
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, asdict
 
 import pika
 from pika.adapters.blocking_connection import BlockingChannel
 from pika.spec import Basic, BasicProperties
 
+from .capture import CaptureWriter
 from .config import settings
+from .log_config import order_context
+from .metrics import metrics
+from .sharding import consumer_priority, order_route, shard_queue_names, shards_enabled
 
 logger = logging.getLogger(__name__)
 
+_publish_seconds = metrics.counter(
+    "notification_publish_seconds_total", "Time spent publishing notifications"
+)
+_published = metrics.counter("notifications_published_total", "Notifications published")
+
 
 @dataclass
 class OrderMessage:
@@ -32,15 +44,27 @@ class OrderMessage:
     retry_count: int = 0
     priority: int = 5
     client_metadata: Optional[dict] = None
+    # Cart orders: every seat of the order (seat_id is the first one)
+    seat_ids: Optional[List[int]] = None
+    
+    @property
+    def seats(self) -> List[int]:
+        """Seats of the order (one unless it is a cart)."""
+        return self.seat_ids or [self.seat_id]
+    
+    @property
+    def is_cart(self) -> bool:
+        return bool(self.seat_ids) and len(self.seat_ids) > 1
     
     @classmethod
     def from_dict(cls, data: dict) -> "OrderMessage":
         """Create OrderMessage from dictionary."""
+        seat_ids = data.get("seat_ids") or None
         return cls(
             order_uuid=data.get("order_uuid"),
             user_id=data.get("user_id"),
             event_id=data.get("event_id"),
-            seat_id=data.get("seat_id"),
+            seat_id=data.get("seat_id") or (seat_ids[0] if seat_ids else None),
             total_amount=data.get("total_amount", 0.0),
             processing_complexity=data.get("processing_complexity", 5),
             timestamp=data.get("timestamp"),
@@ -49,7 +73,12 @@ class OrderMessage:
             retry_count=data.get("retry_count", 0),
             priority=data.get("priority", 5),
             client_metadata=data.get("client_metadata"),
+            seat_ids=seat_ids,
         )
+    
+    def to_dict(self) -> dict:
+        """Convert back to the wire format consumed by from_dict."""
+        return asdict(self)
 
 
 class RabbitMQConnection:
@@ -63,6 +92,28 @@ class RabbitMQConnection:
         self._channel: Optional[BlockingChannel] = None
         self._reconnect_delay = 5
         self._max_reconnect_delay = 60
+        self._capture: Optional[CaptureWriter] = None
+        self._subscriptions: List[Tuple[str, Optional[dict]]] = []
+        self._on_message = None
+        self._consumer_tags: List[str] = []
+        self._consumer_thread: Optional[int] = None
+        self._prefetch_count = settings.prefetch_count
+        self._reconnect_hooks: List[Callable[[], None]] = []
+    
+    @property
+    def consumer_count(self) -> int:
+        """Consumers consume() creates on the channel: the orders queue and each shard queue."""
+        return 1 + (len(shard_queue_names()) if shards_enabled() else 0)
+    
+    @property
+    def parking_queue(self) -> str:
+        """Queue holding orders parked while the catalog circuit is open."""
+        return f"{settings.orders_queue}_parked"
+    
+    @property
+    def dead_letter_queue(self) -> str:
+        """Queue holding orders rejected after exhausting their retries."""
+        return f"{settings.orders_queue}_dlq"
         
     def connect(self) -> bool:
         """
@@ -90,7 +141,7 @@ class RabbitMQConnection:
             self._channel = self._connection.channel()
             
             # Set QoS (prefetch count)
-            self._channel.basic_qos(prefetch_count=settings.prefetch_count)
+            self._channel.basic_qos(prefetch_count=self._prefetch_count)
             
             # Declare queues (idempotent)
             self._declare_queues()
@@ -126,7 +177,7 @@ class RabbitMQConnection:
             # Recreate channel (connection should still be open)
             if self._connection and self._connection.is_open:
                 self._channel = self._connection.channel()
-                self._channel.basic_qos(prefetch_count=settings.prefetch_count)
+                self._channel.basic_qos(prefetch_count=self._prefetch_count)
                 self._channel.queue_declare(
                     queue=settings.orders_queue,
                     durable=True
@@ -137,10 +188,19 @@ class RabbitMQConnection:
         
         # Dead letter queue for orders
         self._channel.queue_declare(
-            queue=f"{settings.orders_queue}_dlq",
+            queue=self.dead_letter_queue,
+            durable=True
+        )
+        
+        # Parking queue for orders waiting on the catalog circuit breaker
+        self._channel.queue_declare(
+            queue=self.parking_queue,
             durable=True
         )
         
+        if shards_enabled():
+            self._declare_shards()
+        
         # Notifications queue (published to by this worker)
         self._channel.queue_declare(
             queue=settings.notifications_queue,
@@ -149,7 +209,35 @@ class RabbitMQConnection:
         
         logger.info(
             f"Declared queues: {settings.orders_queue}, "
-            f"{settings.orders_queue}_dlq, {settings.notifications_queue}"
+            f"{self.dead_letter_queue}, {self.parking_queue}, "
+            f"{settings.notifications_queue}"
+        )
+    
+    def _declare_shards(self):
+        """Declare the consistent-hash exchange and bind the shard queues to it."""
+        self._channel.exchange_declare(
+            exchange=settings.order_shard_exchange,
+            exchange_type="x-consistent-hash",
+            durable=True
+        )
+        for queue in shard_queue_names():
+            self._channel.queue_declare(
+                queue=queue,
+                durable=True,
+                arguments={
+                    "x-queue-type": "quorum",
+                    "x-single-active-consumer": True,
+                }
+            )
+            # Routing key of a consistent-hash binding is its weight
+            self._channel.queue_bind(
+                queue=queue,
+                exchange=settings.order_shard_exchange,
+                routing_key="1"
+            )
+        logger.info(
+            f"Declared {settings.order_shards} order shards on exchange "
+            f"{settings.order_shard_exchange} (key: {settings.order_shard_key})"
         )
     
     def disconnect(self):
@@ -163,6 +251,19 @@ class RabbitMQConnection:
         
         self._connection = None
         self._channel = None
+        
+        if self._capture:
+            self._capture.close()
+            self._capture = None
+    
+    def on_reconnect(self, callback: Callable[[], None]):
+        """
+        Call `callback` after every successful reconnect.
+        
+        Timers set with call_later belong to the connection they were set
+        on and are lost with it; periodic tasks re-arm themselves here.
+        """
+        self._reconnect_hooks.append(callback)
     
     def reconnect_with_backoff(self) -> bool:
         """
@@ -179,6 +280,11 @@ class RabbitMQConnection:
             
             if self.connect():
                 self._reconnect_delay = 5  # Reset delay on success
+                for hook in self._reconnect_hooks:
+                    try:
+                        hook()
+                    except Exception as e:
+                        logger.error(f"Reconnect hook failed: {e}")
                 return True
             
             # Exponential backoff
@@ -186,19 +292,30 @@ class RabbitMQConnection:
     
     def consume(
         self,
-        callback: Callable[[OrderMessage], bool],
+        callback: Callable[[OrderMessage], Union[bool, Future]],
         queue: str = None
     ):
         """
         Start consuming messages from orders queue.
         
+        With sharding enabled (and no explicit queue) this also subscribes
+        to every shard queue, with this worker's rendezvous priority; the
+        broker keeps one active consumer per shard.
+        
+        With CAPTURE_FILE set, every delivery is recorded (see src.capture).
+        
+        The callback may return a Future instead (e.g. src.pipeline's
+        submit()); the message is settled from its result on the consumer
+        thread when it completes, and requeued if it fails or is cancelled.
+        Notifications and parking called from other threads meanwhile are
+        run on the consumer thread as well, as pika channels are not
+        thread-safe.
+        
         Args:
             callback: Function to process each message.
                       Should return True if processed successfully.
             queue: Queue name (defaults to settings.orders_queue)
         """
-        queue = queue or settings.orders_queue
-        
         def on_message(
             channel: BlockingChannel,
             method: Basic.Deliver,
@@ -206,70 +323,246 @@ class RabbitMQConnection:
             body: bytes
         ):
             """Handle incoming message."""
-            try:
-                # Parse message
-                data = json.loads(body.decode('utf-8'))
-                message = OrderMessage.from_dict(data)
-                
-                logger.info(
-                    f"Received order: {message.order_uuid}, "
-                    f"event={message.event_id}, seat={message.seat_id}"
-                )
-                
-                # Process message
-                success = callback(message)
-                
-                if success:
-                    # Acknowledge message
-                    channel.basic_ack(delivery_tag=method.delivery_tag)
-                    logger.info(f"Order {message.order_uuid} processed successfully")
-                else:
-                    # Reject and requeue (or send to DLQ if retry_count > threshold)
-                    if message.retry_count >= 3:
-                        # Send to DLQ
-                        channel.basic_reject(
-                            delivery_tag=method.delivery_tag,
-                            requeue=False
-                        )
-                        logger.warning(
-                            f"Order {message.order_uuid} sent to DLQ after "
-                            f"{message.retry_count} retries"
+            message = self._parse(channel, method, body)
+            if message is None:
+                return
+            
+            with order_context(message.order_uuid, message.event_id, message.seat_id):
+                try:
+                    logger.info(
+                        "Received order: %s, event=%s, seat=%s",
+                        message.order_uuid, message.event_id, message.seat_id
+                    )
+                    
+                    # Process message
+                    result = callback(message)
+                    
+                    if isinstance(result, Future):
+                        # Settled on this thread once the pipeline finishes it
+                        result.add_done_callback(
+                            lambda future: self._run_threadsafe(
+                                lambda: settle_later(channel, method, message, future)
+                            )
                         )
                     else:
-                        # Requeue for retry
-                        channel.basic_nack(
-                            delivery_tag=method.delivery_tag,
-                            requeue=True
-                        )
-                        logger.warning(f"Order {message.order_uuid} requeued for retry")
-                        
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON in message: {e}")
-                channel.basic_reject(delivery_tag=method.delivery_tag, requeue=False)
+                        self._settle(channel, method, message, result)
+                            
+                except Exception as e:
+                    logger.error(f"Error processing message: {e}")
+                    channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+        
+        def settle_later(channel: BlockingChannel, method: Basic.Deliver, message: OrderMessage, future: Future):
+            """Settle a message whose result was deferred (runs on the consumer thread)."""
+            if channel is not self._channel or not channel.is_open:
+                return  # delivered on a channel since closed: the broker redelivers it
+            with order_context(message.order_uuid, message.event_id, message.seat_id):
+                try:
+                    error = "cancelled" if future.cancelled() else future.exception()
+                    if error is not None:
+                        logger.error(f"Error processing message: {error}")
+                        channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+                    else:
+                        self._settle(channel, method, message, future.result())
+                except Exception as e:
+                    logger.error(f"Error settling message: {e}")
+        
+        self._start_consuming(on_message, queue)
+    
+    def consume_batch(
+        self,
+        callback: Callable[[List[OrderMessage]], List[bool]],
+        max_batch: int = 50,
+        max_wait_ms: float = 20.0,
+        queue: str = None
+    ):
+        """
+        Start consuming messages in batches.
+        
+        Deliveries are collected until max_batch messages arrived or
+        max_wait_ms passed since the first one, then handed to the
+        callback together. The prefetch count is raised to max_batch if
+        it is lower, so a batch can fill up. A partial batch left when
+        consuming stops is processed before returning.
+        
+        Each message is settled as in consume() (ack, requeue, or DLQ
+        after 3 retries) by its own result, but every run of consecutive
+        successes is acked with a single basic_ack(multiple=True). If the
+        callback raises, the whole batch is requeued with one nack.
+        
+        Args:
+            callback: Function processing a batch; returns one result per
+                      message, in order (True if processed successfully)
+            max_batch: Most messages per batch
+            max_wait_ms: Longest a message waits for its batch to fill
+            queue: Queue name (defaults to settings.orders_queue)
+        """
+        batch: List[Tuple[Basic.Deliver, OrderMessage]] = []
+        batch_channel: Optional[BlockingChannel] = None
+        timer = None
+        timer_connection = None
+        
+        def flush():
+            nonlocal batch, timer
+            if timer is not None:
+                if timer_connection is self._connection:
+                    self._connection.remove_timeout(timer)
+                timer = None
+            pending, batch = batch, []
+            if not pending:
+                return
+            channel = batch_channel
+            if channel is not self._channel or not channel.is_open:
+                return  # delivered on a channel since closed: the broker redelivers them
+            messages = [message for _, message in pending]
+            logger.info("Received batch of %d orders", len(messages))
+            try:
+                results = list(callback(messages))
+                if len(results) != len(messages):
+                    raise ValueError(f"{len(results)} results for {len(messages)} messages")
             except Exception as e:
-                logger.error(f"Error processing message: {e}")
-                channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+                logger.error(f"Error processing batch: {e}")
+                channel.basic_nack(delivery_tag=pending[-1][0].delivery_tag, multiple=True, requeue=True)
+                return
+            self._settle_batch(channel, pending, results)
+        
+        def on_message(
+            channel: BlockingChannel,
+            method: Basic.Deliver,
+            properties: BasicProperties,
+            body: bytes
+        ):
+            """Add an incoming message to the batch."""
+            nonlocal batch_channel, timer, timer_connection
+            message = self._parse(channel, method, body)
+            if message is None:
+                return
+            if batch and batch_channel is not channel:
+                flush()  # left over from a connection lost since
+            batch_channel = channel
+            batch.append((method, message))
+            if len(batch) >= max_batch:
+                flush()
+            elif timer is None:
+                timer_connection = self._connection
+                timer = self._connection.call_later(max_wait_ms / 1000, flush)
+        
+        if self._prefetch_count < max_batch:
+            self.set_prefetch(max_batch)
+        self._start_consuming(on_message, queue)
+        # Process the last, partial batch instead of leaving it to redelivery
+        flush()
+    
+    def _parse(self, channel: BlockingChannel, method: Basic.Deliver, body: bytes) -> Optional[OrderMessage]:
+        """Decode a delivery (recording it with CAPTURE_FILE); None if it was rejected."""
+        if self._capture:
+            self._capture.write(body, time.time(), method.redelivered)
+        try:
+            # Parse message
+            data = json.loads(body.decode('utf-8'))
+            return OrderMessage.from_dict(data)
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in message: {e}")
+            channel.basic_reject(delivery_tag=method.delivery_tag, requeue=False)
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+        return None
+    
+    def _settle(self, channel: BlockingChannel, method: Basic.Deliver, message: OrderMessage, success: bool):
+        """Ack, requeue or dead-letter a message by its processing result."""
+        if success:
+            # Acknowledge message
+            channel.basic_ack(delivery_tag=method.delivery_tag)
+            logger.info("Order %s processed successfully", message.order_uuid)
+        else:
+            self._settle_failure(channel, method, message)
+    
+    def _settle_failure(self, channel: BlockingChannel, method: Basic.Deliver, message: OrderMessage):
+        # Reject and requeue (or send to DLQ if retry_count > threshold)
+        if message.retry_count >= 3:
+            # Send to DLQ
+            channel.basic_reject(
+                delivery_tag=method.delivery_tag,
+                requeue=False
+            )
+            logger.warning(
+                f"Order {message.order_uuid} sent to DLQ after "
+                f"{message.retry_count} retries"
+            )
+        else:
+            # Requeue for retry
+            channel.basic_nack(
+                delivery_tag=method.delivery_tag,
+                requeue=True
+            )
+            logger.warning(f"Order {message.order_uuid} requeued for retry")
+    
+    def _settle_batch(self, channel: BlockingChannel, pending: List[Tuple[Basic.Deliver, OrderMessage]], results: List[bool]):
+        """
+        Settle a batch in delivery order, acking each run of successes at once.
+        
+        A multiple ack covers every unsettled delivery up to its tag, so a
+        run is acked before the failure that ends it is settled, and every
+        earlier delivery is settled by then.
+        """
+        run: List[OrderMessage] = []
+        last_tag = None
+        
+        def ack_run():
+            if run:
+                channel.basic_ack(delivery_tag=last_tag, multiple=len(run) > 1)
+                for message in run:
+                    with order_context(message.order_uuid, message.event_id, message.seat_id):
+                        logger.info("Order %s processed successfully", message.order_uuid)
+                run.clear()
+        
+        for (method, message), success in zip(pending, results):
+            if success:
+                run.append(message)
+                last_tag = method.delivery_tag
+                continue
+            ack_run()
+            with order_context(message.order_uuid, message.event_id, message.seat_id):
+                self._settle_failure(channel, method, message)
+        ack_run()
+    
+    def _start_consuming(self, on_message: Callable, queue: str = None):
+        """Subscribe on_message to the orders queue (and shard queues) and run the consumer loop."""
+        shard_queues = shard_queue_names() if queue is None and shards_enabled() else []
+        queue = queue or settings.orders_queue
+        if settings.capture_file and self._capture is None:
+            self._capture = CaptureWriter(settings.capture_file)
         
         # Start consuming
-        self._channel.basic_consume(
-            queue=queue,
-            on_message_callback=on_message,
-            auto_ack=False
-        )
+        self._subscriptions = [(queue, None)] + [
+            (shard_queue, {"x-priority": consumer_priority(settings.worker_name, shard)})
+            for shard, shard_queue in enumerate(shard_queues)
+        ]
+        self._on_message = on_message
+        self._consumer_thread = threading.get_ident()
+        self._subscribe()
         
-        logger.info(f"Started consuming from {queue}")
+        logger.info(
+            f"Started consuming from {queue}"
+            + (f" and {len(shard_queues)} shard queues" if shard_queues else "")
+        )
         
-        try:
-            self._channel.start_consuming()
-        except pika.exceptions.ConnectionClosedByBroker:
-            logger.warning("Connection closed by broker, attempting reconnect")
-            self.reconnect_with_backoff()
-        except pika.exceptions.AMQPChannelError as e:
-            logger.error(f"Channel error: {e}")
-            raise
-        except KeyboardInterrupt:
-            logger.info("Received shutdown signal")
-            self._channel.stop_consuming()
+        while True:
+            try:
+                self._channel.start_consuming()
+                return
+            except pika.exceptions.ConnectionClosedByBroker:
+                logger.warning("Connection closed by broker, attempting reconnect")
+                self.reconnect_with_backoff()
+                self._subscribe()
+                logger.info(f"Resumed consuming from {queue} after reconnect")
+            except pika.exceptions.AMQPChannelError as e:
+                logger.error(f"Channel error: {e}")
+                raise
+            except KeyboardInterrupt:
+                logger.info("Received shutdown signal")
+                self._channel.stop_consuming()
+                return
     
     def publish_notification(
         self,
@@ -288,6 +581,11 @@ class RabbitMQConnection:
         Returns:
             True if published successfully
         """
+        if not self._on_consumer_thread():
+            return bool(self._run_threadsafe(
+                lambda: self.publish_notification(notification_type, data, queue), wait=True
+            ))
+        
         queue = queue or settings.notifications_queue
         
         try:
@@ -298,6 +596,7 @@ class RabbitMQConnection:
                 "worker": settings.worker_name
             }
             
+            started = time.perf_counter()
             self._channel.basic_publish(
                 exchange="",
                 routing_key=queue,
@@ -308,13 +607,169 @@ class RabbitMQConnection:
                 )
             )
             
-            logger.info(f"Published {notification_type} notification to {queue}")
+            _publish_seconds.inc(time.perf_counter() - started)
+            _published.inc()
+            logger.info("Published %s notification to %s", notification_type, queue)
             return True
             
         except Exception as e:
             logger.error(f"Failed to publish notification: {e}")
             return False
     
+    def park_order(self, message: OrderMessage, reason: str) -> bool:
+        """
+        Move an order to the parking queue until the catalog recovers.
+        
+        Args:
+            message: Order to park (republished unchanged)
+            reason: Why the order was parked (stored as a header)
+            
+        Returns:
+            True if the order was published to the parking queue
+        """
+        if not self._on_consumer_thread():
+            return bool(self._run_threadsafe(lambda: self.park_order(message, reason), wait=True))
+        
+        try:
+            self._channel.basic_publish(
+                exchange="",
+                routing_key=self.parking_queue,
+                body=json.dumps(message.to_dict()),
+                properties=pika.BasicProperties(
+                    delivery_mode=2,  # Persistent
+                    content_type="application/json",
+                    headers={
+                        "x-parked-reason": reason,
+                        "x-parked-by": settings.worker_name,
+                    }
+                )
+            )
+            logger.warning(f"Order {message.order_uuid} parked: {reason}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to park order {message.order_uuid}: {e}")
+            return False
+    
+    def unpark_orders(self, limit: int) -> int:
+        """
+        Move up to `limit` parked orders back to the orders queue
+        (or their shard, when sharding is enabled).
+        
+        Must be called from the consumer thread (e.g. via call_later).
+        
+        Returns:
+            Number of orders resumed
+        """
+        resumed = 0
+        while resumed < limit:
+            method, properties, body = self._channel.basic_get(
+                queue=self.parking_queue,
+                auto_ack=False
+            )
+            if method is None:
+                break
+            
+            try:
+                exchange, routing_key = order_route(json.loads(body))
+            except ValueError:
+                exchange, routing_key = order_route()
+            self._channel.basic_publish(
+                exchange=exchange,
+                routing_key=routing_key,
+                body=body,
+                properties=pika.BasicProperties(
+                    delivery_mode=2,  # Persistent
+                    content_type="application/json"
+                )
+            )
+            self._channel.basic_ack(delivery_tag=method.delivery_tag)
+            resumed += 1
+        
+        if resumed:
+            logger.info(f"Resumed {resumed} parked orders to {settings.orders_queue}")
+        return resumed
+    
+    def _subscribe(self):
+        """Start a consumer for every subscription recorded by consume()."""
+        self._consumer_tags = [
+            self._channel.basic_consume(
+                queue=queue,
+                on_message_callback=self._on_message,
+                auto_ack=False,
+                arguments=arguments
+            )
+            for queue, arguments in self._subscriptions
+        ]
+    
+    def set_prefetch(self, prefetch_count: int):
+        """
+        Apply a new prefetch count while consuming (consumer thread only).
+        
+        basic.qos only affects consumers created after it, so the consumers
+        are cancelled and re-created. Unacked messages stay with the channel
+        and are settled as usual; deliveries not yet dispatched are requeued
+        by pika, and a shard queue may briefly move to another worker.
+        The count also applies to later reconnects; an unchanged count
+        does nothing.
+        """
+        if prefetch_count == self._prefetch_count:
+            return
+        self._prefetch_count = prefetch_count
+        if not (self._channel and self._channel.is_open):
+            return
+        self._channel.basic_qos(prefetch_count=prefetch_count)
+        if self._consumer_tags:
+            for tag in self._consumer_tags:
+                self._channel.basic_cancel(tag)
+            self._subscribe()
+        logger.info(f"Prefetch count set to {prefetch_count}")
+    
+    def call_later(self, delay: float, callback: Callable[[], None]):
+        """Schedule callback on the connection's I/O loop (consumer thread)."""
+        self._connection.call_later(delay, callback)
+    
+    def process_events(self, time_limit: float = 0):
+        """
+        Run pending I/O and callbacks from other threads (deferred acks,
+        publishes) while not consuming, e.g. to settle the orders still
+        in flight during shutdown. Consumer thread only.
+        """
+        if self._connection and self._connection.is_open:
+            self._connection.process_data_events(time_limit=time_limit)
+    
+    def _on_consumer_thread(self) -> bool:
+        return self._consumer_thread is None or self._consumer_thread == threading.get_ident()
+    
+    def _run_threadsafe(self, fn: Callable[[], Any], wait: bool = False, timeout: float = 30.0) -> Any:
+        """
+        Run fn on the consumer thread.
+        
+        Args:
+            fn: Function using the channel
+            wait: Wait for fn to run and return its result
+            timeout: Longest wait (the result is then None)
+        """
+        done = threading.Event()
+        result = []
+        
+        def run():
+            try:
+                result.append(fn())
+            finally:
+                done.set()
+        
+        try:
+            self._connection.add_callback_threadsafe(run)
+        except Exception as e:
+            logger.error(f"Connection unavailable for consumer-thread call: {e}")
+            return None
+        if not wait:
+            return None
+        if not done.wait(timeout):
+            logger.error(f"Consumer thread did not run a call within {timeout:g}s")
+            return None
+        return result[0] if result else None
+    
     def health_check(self) -> bool:
         """Check RabbitMQ connection health."""
         return (
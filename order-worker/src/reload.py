@@ -0,0 +1,130 @@
+"""
+Live configuration reload.
+
+Settings are normally read once at startup. With CONFIG_RELOAD_FILE set
+(an env-format file, typically a key of a mounted ConfigMap), the worker
+re-reads its configuration when that file changes, and on SIGHUP; values
+in the file override the environment (see config.load_settings).
+
+Only the settings in RELOADABLE are applied live. Most of them are read
+at use time and take effect on the next order; the rest have a hook
+registered with on_change() that pushes the new value into a live object
+(basic_qos, DB pool, gRPC timeout, limiter bounds, ...). Any other change
+is logged as requiring a restart and left alone.
+
+Reloads run on the consumer thread (poll() is scheduled with
+RabbitMQConnection.call_later); the SIGHUP handler only sets a flag.
+"""
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from pydantic import ValidationError
+
+from .config import Settings, load_settings, settings
+
+logger = logging.getLogger(__name__)
+
+RELOADABLE = frozenset({
+    "prefetch_count",
+    "db_pool_size",
+    "db_max_overflow",
+    "grpc_commit_timeout",
+    "catalog_breaker_failure_rate",
+    "catalog_breaker_min_calls",
+    "catalog_breaker_open_seconds",
+    "catalog_breaker_half_open_calls",
+    "catalog_limit_min",
+    "catalog_limit_max",
+    "catalog_limit_backoff",
+    "catalog_limit_latency_tolerance",
+    "catalog_limit_wait",
+    "parked_resume_interval",
+    "parked_resume_batch",
+    "sold_seat_cache_enabled",
+    "sold_seat_cache_ttl",
+    "sold_seat_warm_timeout",
+    "seat_price_check_enabled",
+    "seat_price_cache_ttl",
+    "order_status_cache_ttl",
+    "order_timings_enabled",
+    "cpu_load_mode",
+    "config_reload_interval",
+    "log_level",
+    "log_sample_rate",
+})
+
+
+class ConfigReloader:
+    """Applies changed RELOADABLE settings to the global settings object."""
+
+    def __init__(self):
+        self._hooks: List[Tuple[frozenset, Callable[[], None]]] = []
+        self._requested = threading.Event()
+        self._mtime = self._file_mtime()
+
+    def on_change(self, fields: Iterable[str], callback: Callable[[], None]):
+        """Call `callback` after a reload that changed any of `fields`."""
+        self._hooks.append((frozenset(fields), callback))
+
+    def request(self):
+        """Ask for a reload on the next poll (safe from a signal handler)."""
+        self._requested.set()
+
+    def poll(self) -> Dict[str, Tuple[Any, Any]]:
+        """Reload if requested or if the overrides file changed."""
+        mtime = self._file_mtime()
+        if not self._requested.is_set() and mtime == self._mtime:
+            return {}
+        self._requested.clear()
+        self._mtime = mtime
+        return self.reload()
+
+    def reload(self) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Re-read the configuration and apply what changed.
+
+        Returns:
+            {field: (old, new)} for every setting applied
+        """
+        try:
+            fresh = load_settings()
+        except ValidationError as e:
+            logger.error(f"Configuration reload rejected, keeping current settings: {e}")
+            return {}
+
+        changed: Dict[str, Tuple[Any, Any]] = {}
+        needs_restart = []
+        for name in Settings.model_fields:
+            old, new = getattr(settings, name), getattr(fresh, name)
+            if old == new:
+                continue
+            if name in RELOADABLE:
+                setattr(settings, name, new)
+                changed[name] = (old, new)
+            else:
+                needs_restart.append(name)
+
+        for name, (old, new) in changed.items():
+            logger.info(f"Configuration reloaded: {name} {old!r} -> {new!r}")
+        if needs_restart:
+            logger.warning(f"Changed settings need a restart to apply: {', '.join(sorted(needs_restart))}")
+
+        for fields, callback in self._hooks:
+            if fields & changed.keys():
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Failed to apply reloaded settings {', '.join(sorted(fields))}: {e}")
+        return changed
+
+    def _file_mtime(self) -> float:
+        path = settings.config_reload_file
+        try:
+            return os.stat(path).st_mtime if path else 0.0
+        except OSError:
+            return 0.0
+
+
+reloader = ConfigReloader()
@@ -0,0 +1,163 @@
+"""
+Seat price cache for Order Worker.
+
+Keeps each event's seat -> price table, loaded in bulk from the catalog
+(GetMultipleSeatsDetails by event_id), so process_order can reject an
+order whose seats do not belong to its event or whose total_amount does
+not match the seat prices before inserting it or spending CPU on its QR
+code. Orders without an amount (offline sync) only have their seats
+checked. The catalog commit stays authoritative; this only fails tampered
+or stale orders early.
+
+Tables expire after SEAT_PRICE_CACHE_TTL. An order that fails against a
+table older than RECHECK_AFTER seconds reloads the event once before it
+is rejected, so a price change or a newly added seat is picked up
+without letting rejected orders hammer the catalog. If the catalog
+cannot be asked the order is let through (checked at commit instead).
+An event's table is also dropped when the catalog refuses a commit for
+any reason but a sold seat (invalidate_event), since the table let that
+order through.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+from .config import settings
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Seconds a table must have been trusted before a failed check reloads it
+RECHECK_AFTER = 10.0
+# Amounts are DECIMAL(10,2); anything below a cent is rounding
+AMOUNT_TOLERANCE = 0.005
+
+_rejections = metrics.counter(
+    "orders_rejected_total",
+    "Orders rejected before processing (unknown seat or amount mismatch)"
+)
+
+PriceLoader = Callable[[int], Optional[Dict[int, float]]]
+
+
+class SeatPriceCache:
+    """
+    Per-event seat price tables with LRU eviction over events and a TTL.
+
+    Args:
+        max_events: Events kept (least recently used dropped first)
+        ttl: Seconds an event's table is trusted
+    """
+
+    def __init__(self, max_events: int = 256, ttl: float = 300.0):
+        self.max_events = max_events
+        self.ttl = ttl
+        self._events: "OrderedDict[int, tuple]" = OrderedDict()  # event_id -> (prices, loaded_at)
+        self._lock = threading.Lock()
+        self._load_locks: Dict[int, threading.Lock] = {}
+
+    def prices(self, event_id: int, loader: PriceLoader, max_age: float = None) -> Optional[Dict[int, float]]:
+        """
+        An event's seat prices, loading them on a miss.
+
+        Concurrent misses for one event share a single load.
+
+        Args:
+            event_id: Event to look up
+            loader: Returns {seat_id: price} for an event, or None on failure
+            max_age: Reload if the table is older than this (default: ttl)
+
+        Returns:
+            {seat_id: price}, or None if the catalog could not be asked
+        """
+        max_age = self.ttl if max_age is None else max_age
+        table = self._get(event_id, max_age)
+        if table is not None:
+            return table
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(event_id, threading.Lock())
+        with load_lock:
+            table = self._get(event_id, max_age)
+            if table is not None:
+                return table
+            try:
+                table = loader(event_id)
+            except Exception as e:
+                logger.warning(f"Could not load seat prices for event {event_id}: {e}")
+                table = None
+            if table is not None:
+                self.load(event_id, table.items())
+                logger.info(f"Seat price cache loaded for event {event_id}: {len(table)} seats")
+            return table
+
+    def load(self, event_id: int, seat_prices: Iterable):
+        """Replace an event's table with (seat_id, price) pairs."""
+        with self._lock:
+            self._events[event_id] = (dict(seat_prices), time.monotonic())
+            self._events.move_to_end(event_id)
+            while len(self._events) > self.max_events:
+                evicted, _ = self._events.popitem(last=False)
+                self._load_locks.pop(evicted, None)
+
+    def invalidate_event(self, event_id: int):
+        """Forget an event's table (reloaded on its next order)."""
+        with self._lock:
+            self._events.pop(event_id, None)
+
+    def check(self, event_id: int, seat_ids: Iterable[int], total_amount: float, loader: PriceLoader) -> Optional[str]:
+        """
+        Validate an order's seats and amount.
+
+        A missing or zero total_amount counts as not supplied: only the
+        seats are checked.
+
+        Returns:
+            Rejection reason, or None if the order may proceed
+        """
+        seat_ids = list(seat_ids)
+        reason = self._check(self.prices(event_id, loader), event_id, seat_ids, total_amount)
+        if reason is not None:
+            # Possibly a stale table: reload once, unless it is fresh
+            reason = self._check(self.prices(event_id, loader, max_age=RECHECK_AFTER), event_id, seat_ids, total_amount)
+        if reason is not None:
+            _rejections.inc()
+        return reason
+
+    @staticmethod
+    def _check(table: Optional[Dict[int, float]], event_id: int, seat_ids, total_amount: float) -> Optional[str]:
+        if table is None:
+            return None
+        missing = [seat_id for seat_id in seat_ids if seat_id not in table]
+        if missing:
+            return f"Seat not found for event {event_id}: {', '.join(map(str, missing))}"
+        if not total_amount:
+            # Not supplied (offline sync posts none, the gateway sends 0.0)
+            return None
+        expected = sum(table[seat_id] for seat_id in seat_ids)
+        if abs(float(total_amount) - expected) > AMOUNT_TOLERANCE:
+            return f"Amount mismatch: paid {float(total_amount):.2f}, expected {expected:.2f}"
+        return None
+
+    def _get(self, event_id: int, max_age: float) -> Optional[Dict[int, float]]:
+        with self._lock:
+            entry = self._events.get(event_id)
+            if entry is None:
+                return None
+            table, loaded_at = entry
+            if time.monotonic() - loaded_at > min(max_age, self.ttl):
+                return None
+            self._events.move_to_end(event_id)
+            return table
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+# Process-wide cache used by process_order
+seat_prices = SeatPriceCache(
+    max_events=settings.seat_price_cache_events,
+    ttl=settings.seat_price_cache_ttl
+)
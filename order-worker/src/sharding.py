@@ -0,0 +1,64 @@
+"""
+Consistent-hash sharding of order queues.
+
+With ORDER_SHARDS > 0 the gateway publishes orders to a consistent-hash
+exchange (rabbitmq_consistent_hash_exchange plugin) keyed by event/seat,
+which spreads them over ORDER_SHARDS queues. Orders competing for the same
+seat always land in the same shard queue.
+
+Every worker subscribes to every shard queue. The queues are quorum
+queues with single active consumer, so only one worker consumes a shard
+at a time and orders for a seat are processed one after the other (the
+second one is then rejected by the sold-seat cache without a CommitSeat).
+Which worker is active is decided by consumer priority: each worker
+subscribes with a rendezvous-hash weight of (worker name, shard), so
+shards spread evenly across pods, and the broker moves a shard to its new
+highest-weight worker when pods join or leave.
+"""
+import hashlib
+from typing import List, Optional, Tuple
+
+from .config import settings
+
+
+def shards_enabled() -> bool:
+    """Whether orders are sharded across queues."""
+    return settings.order_shards > 0
+
+
+def shard_queue_names() -> List[str]:
+    """Names of the shard queues, in shard order."""
+    return [f"{settings.orders_queue}.shard-{shard}" for shard in range(settings.order_shards)]
+
+
+def shard_routing_key(event_id, seat_id) -> str:
+    """
+    Routing key hashed by the exchange.
+
+    Must match the gateway (api-gateway/src/rabbitmq.js).
+    """
+    if settings.order_shard_key == "event":
+        return str(event_id)
+    return f"{event_id}:{seat_id}"
+
+
+def order_route(data: Optional[dict] = None) -> Tuple[str, str]:
+    """
+    (exchange, routing_key) for republishing an order message.
+
+    Args:
+        data: Decoded order message; needs event_id/seat_id when sharded
+    """
+    if shards_enabled() and data and data.get("event_id") is not None:
+        return settings.order_shard_exchange, shard_routing_key(data.get("event_id"), data.get("seat_id"))
+    return "", settings.orders_queue
+
+
+def consumer_priority(worker_name: str, shard: int) -> int:
+    """
+    Rendezvous-hash weight of a worker for a shard, used as x-priority.
+
+    Worker names must be unique per pod (WORKER_NAME from the pod name).
+    """
+    digest = hashlib.sha1(f"{worker_name}:{shard}".encode()).digest()
+    return int.from_bytes(digest[:4], "big") % 1_000_000 + 1
@@ -0,0 +1,183 @@
+"""
+Sold-seat negative cache for Order Worker.
+
+Remembers which seats of each event are known to be sold, so an order
+that lost the race for its seat fails before the CPU-heavy QR stage
+instead of after a doomed CommitSeat. Seats are only marked from
+authoritative answers (a successful CommitSeat, a "Seat already sold"
+reply, or the catalog's seat listing), so a hit is never a guess.
+
+Seat ids of one event are close together (SERIAL), so each event keeps
+an exact bitset over its id range: one bit per seat.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# CommitSeat message returned by the catalog for a seat sold to someone else
+SEAT_ALREADY_SOLD = "Seat already sold"
+
+
+class SeatBitset:
+    """Exact set of seat ids stored as bits relative to the lowest id seen."""
+
+    def __init__(self, max_span: int):
+        self.max_span = max_span
+        self._base: Optional[int] = None
+        self._bits = bytearray()
+        self.count = 0
+
+    def add(self, seat_id: int) -> bool:
+        """
+        Add a seat id.
+
+        Returns:
+            False if the id is too far from the others to store (ignored)
+        """
+        if self._base is None:
+            self._base = seat_id & ~7
+        if seat_id < self._base:
+            new_base = seat_id & ~7
+            if (len(self._bits) * 8) + (self._base - new_base) > self.max_span:
+                return False
+            self._bits[0:0] = bytes((self._base - new_base) // 8)
+            self._base = new_base
+
+        offset = seat_id - self._base
+        if offset >= self.max_span:
+            return False
+        byte, bit = divmod(offset, 8)
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte - len(self._bits) + 1))
+        if not self._bits[byte] & (1 << bit):
+            self._bits[byte] |= 1 << bit
+            self.count += 1
+        return True
+
+    def __contains__(self, seat_id: int) -> bool:
+        if self._base is None or seat_id < self._base:
+            return False
+        byte, bit = divmod(seat_id - self._base, 8)
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << bit))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class SoldSeatCache:
+    """
+    Per-event sold-seat bitsets with LRU eviction over events and a TTL.
+
+    The TTL bounds how long a seat freed by a cancellation keeps being
+    reported as sold; after it an event starts over (and is re-warmed).
+
+    Args:
+        max_events: Events kept (least recently used dropped first)
+        ttl: Seconds an event's bitset is trusted
+        max_span: Largest seat id range stored per event, in seats
+    """
+
+    def __init__(self, max_events: int = 256, ttl: float = 600.0, max_span: int = 1 << 20):
+        self.max_events = max_events
+        self.ttl = ttl
+        self.max_span = max_span
+        self._events: "OrderedDict[int, tuple]" = OrderedDict()  # event_id -> (bitset, expires_at)
+        self._warmed: set = set()
+        self._warming: set = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.hits = 0
+
+    def is_sold(self, event_id: int, seat_id: int) -> bool:
+        """True only if the seat is known to be sold."""
+        with self._lock:
+            bitset = self._bitset(event_id, create=False)
+            if bitset is not None and seat_id in bitset:
+                self.hits += 1
+                return True
+            return False
+
+    def mark_sold(self, event_id: int, seat_id: int):
+        """Record an authoritative sale."""
+        with self._lock:
+            self._bitset(event_id, create=True).add(seat_id)
+
+    def load(self, event_id: int, sold_seat_ids: Iterable[int]):
+        """Add an event's full list of sold seats and mark it warmed."""
+        with self._lock:
+            bitset = self._bitset(event_id, create=True)
+            for seat_id in sold_seat_ids:
+                bitset.add(seat_id)
+            self._warmed.add(event_id)
+
+    def warm_async(self, event_id: int, loader: Callable[[int], Optional[Iterable[int]]]):
+        """
+        Load an event's sold seats in the background the first time it is seen.
+
+        Args:
+            event_id: Event to warm
+            loader: Returns the sold seat ids of an event, or None on failure
+                (the event is then retried on a later order)
+        """
+        with self._lock:
+            if event_id in self._warmed or event_id in self._warming:
+                return
+            self._warming.add(event_id)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sold-seats-warm")
+        self._executor.submit(self._warm, event_id, loader)
+
+    def _warm(self, event_id: int, loader: Callable[[int], Optional[Iterable[int]]]):
+        try:
+            sold = loader(event_id)
+            if sold is not None:
+                sold = list(sold)
+                self.load(event_id, sold)
+                logger.info(f"Sold-seat cache warmed for event {event_id}: {len(sold)} sold seats")
+        except Exception as e:
+            logger.warning(f"Could not warm sold-seat cache for event {event_id}: {e}")
+        finally:
+            with self._lock:
+                self._warming.discard(event_id)
+
+    def invalidate_event(self, event_id: int):
+        """Forget everything known about an event."""
+        with self._lock:
+            self._events.pop(event_id, None)
+            self._warmed.discard(event_id)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def _bitset(self, event_id: int, create: bool) -> Optional[SeatBitset]:
+        """Look up (or create) an event's bitset under the lock."""
+        entry = self._events.get(event_id)
+        now = time.monotonic()
+        if entry is not None and entry[1] < now:
+            del self._events[event_id]
+            self._warmed.discard(event_id)
+            entry = None
+        if entry is None:
+            if not create:
+                return None
+            entry = self._events[event_id] = (SeatBitset(self.max_span), now + self.ttl)
+            while len(self._events) > self.max_events:
+                evicted, _ = self._events.popitem(last=False)
+                self._warmed.discard(evicted)
+        self._events.move_to_end(event_id)
+        return entry[0]
+
+
+# Process-wide cache used by process_order
+sold_seats = SoldSeatCache(
+    max_events=settings.sold_seat_cache_events,
+    ttl=settings.sold_seat_cache_ttl
+)
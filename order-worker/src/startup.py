@@ -0,0 +1,116 @@
+"""
+Startup helpers for Order Worker.
+Connects to all dependencies concurrently with jittered retries and
+records how long each step of the boot sequence took.
+"""
+import logging
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Collects named durations for the startup timing breakdown."""
+
+    def __init__(self, started_at: Optional[float] = None):
+        self._started_at = started_at if started_at is not None else time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    def record(self, name: str, seconds: float):
+        """Record the duration of a startup step."""
+        self.timings[name] = seconds
+
+    def elapsed(self) -> float:
+        """Seconds since the timer was started."""
+        return time.perf_counter() - self._started_at
+
+    def summary(self) -> str:
+        """Human-readable breakdown, e.g. 'database=0.120s, rabbitmq=0.080s'."""
+        return ", ".join(f"{name}={seconds:.3f}s" for name, seconds in self.timings.items())
+
+
+def retry_with_jitter(
+    connect: Callable[[], bool],
+    name: str,
+    max_attempts: int = None,
+    base_delay: float = None,
+    max_delay: float = None
+) -> bool:
+    """
+    Call connect() until it returns True or attempts run out.
+
+    Sleeps between attempts using exponential backoff with full jitter,
+    so a fleet of pods started together does not retry in lockstep.
+
+    Args:
+        connect: Callable returning True on success (exceptions count as failure)
+        name: Dependency name for logging
+        max_attempts: Defaults to settings.startup_max_attempts
+        base_delay: First backoff ceiling in seconds
+        max_delay: Upper bound for any single backoff
+
+    Returns:
+        True if a connection attempt succeeded
+    """
+    max_attempts = max_attempts or settings.startup_max_attempts
+    base_delay = base_delay if base_delay is not None else settings.startup_retry_base_delay
+    max_delay = max_delay if max_delay is not None else settings.startup_retry_max_delay
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            if connect():
+                return True
+            logger.warning(f"{name} connection attempt {attempt}/{max_attempts} failed")
+        except Exception as e:
+            logger.warning(f"{name} connection attempt {attempt}/{max_attempts} failed: {e}")
+
+        if attempt < max_attempts:
+            time.sleep(random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1)))))
+
+    return False
+
+
+def connect_dependencies(
+    connectors: Dict[str, Callable[[], bool]],
+    timer: StartupTimer
+) -> Dict[str, bool]:
+    """
+    Run every connector concurrently, each with its own jittered retries.
+
+    Args:
+        connectors: Mapping of dependency name -> connect callable
+        timer: StartupTimer that receives one entry per dependency
+
+    Returns:
+        Mapping of dependency name -> whether it connected
+    """
+    def run(name: str, connect: Callable[[], bool]) -> bool:
+        start = time.perf_counter()
+        ok = retry_with_jitter(connect, name)
+        timer.record(name, time.perf_counter() - start)
+        return ok
+
+    with ThreadPoolExecutor(
+        max_workers=len(connectors),
+        thread_name_prefix="startup"
+    ) as pool:
+        futures = {name: pool.submit(run, name, fn) for name, fn in connectors.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def gil_enabled() -> bool:
+    """
+    Whether the GIL is in effect.
+
+    False only on a free-threaded build (python3.13t) that still runs
+    without it: importing an extension module not marked as free-threading
+    safe turns the GIL back on, so check after the imports are done.
+    """
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_enabled is None else is_enabled()
@@ -0,0 +1,142 @@
+"""
+Per-order stage timings (db_orders.order_timings).
+
+process_order measures each stage of an order with a StageTimings and,
+with ORDER_TIMINGS_ENABLED, writes one row per order in the same
+transaction as its final status update (COMPLETED or FAILED), so recording
+costs no extra commit. Redeliveries overwrite the row.
+
+Stages (milliseconds):
+    queue_wait   gateway timestamp -> start of processing
+    db           initial order upsert
+    cpu_sim      QR CPU simulation
+    qr_render    QR image rendering
+    commit       CommitSeat call (including waiting for a limiter slot)
+    total        start of processing -> final status update
+
+Publishing the notification happens after that commit, so it is tracked
+by the notification_publish_seconds_total / notifications_published_total
+counters instead of per order.
+
+stage_rollup() (and the db_orders.v_order_stage_latency view) return
+p50/p95/p99 per event and stage.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database import get_session
+from .models import OrderTiming
+from .partitioning import order_created_at
+
+logger = logging.getLogger(__name__)
+
+_MAX_MS = 2 ** 31 - 1  # INTEGER columns
+
+STAGES = ("queue_wait", "db", "cpu_sim", "qr_render", "commit", "total")
+
+
+@dataclass
+class StageTimings:
+    """Stage durations of one order being processed."""
+    queue_wait_ms: Optional[int] = None
+    db_ms: int = 0
+    cpu_sim_ms: int = 0
+    qr_render_ms: int = 0
+    commit_ms: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    @classmethod
+    def start(cls, timestamp: Optional[str]) -> "StageTimings":
+        """Start timing an order; queue wait is measured from its gateway timestamp."""
+        timings = cls()
+        enqueued_at = order_created_at(timestamp)
+        if enqueued_at is not None:
+            waited = (datetime.utcnow() - enqueued_at).total_seconds()
+            timings.queue_wait_ms = min(max(0, int(waited * 1000)), _MAX_MS)
+        return timings
+
+    def add(self, stage: str, seconds: float):
+        """Add `seconds` to a stage (stages may run more than once)."""
+        name = f"{stage}_ms"
+        setattr(self, name, getattr(self, name) + int(seconds * 1000))
+
+    @contextmanager
+    def stage(self, stage: str):
+        """Time the enclosed block as `stage`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    @property
+    def total_ms(self) -> int:
+        return int((time.perf_counter() - self.started) * 1000)
+
+    def record(self, session: Session, order_uuid, event_id: int, created_at: Optional[datetime], status: str):
+        """
+        Upsert this order's row in the caller's transaction.
+
+        No-op unless ORDER_TIMINGS_ENABLED (the table comes from k8s/init.sql).
+        """
+        if not settings.order_timings_enabled:
+            return
+        values = {
+            "queue_wait_ms": self.queue_wait_ms,
+            "db_ms": self.db_ms,
+            "cpu_sim_ms": self.cpu_sim_ms,
+            "qr_render_ms": self.qr_render_ms,
+            "commit_ms": self.commit_ms,
+            "total_ms": self.total_ms,
+            "status": status,
+            "recorded_at": datetime.utcnow(),
+        }
+        session.execute(
+            pg_insert(OrderTiming)
+            .values(order_uuid=order_uuid, event_id=event_id, created_at=created_at, **values)
+            .on_conflict_do_update(index_elements=[OrderTiming.order_uuid], set_=values)
+        )
+
+
+def stage_rollup(
+    since: Optional[datetime] = None,
+    event_id: Optional[int] = None,
+    status: str = "COMPLETED"
+) -> List[dict]:
+    """
+    p50/p95/p99 of every stage, per event.
+
+    Args:
+        since: Only orders recorded at or after this time (UTC)
+        event_id: Only this event
+        status: Final order status to include
+
+    Returns:
+        One dict per event: {"event_id", "orders", "<stage>": [p50, p95, p99], ...}
+    """
+    percentiles = ",\n".join(
+        f"percentile_cont(ARRAY[0.5, 0.95, 0.99]) WITHIN GROUP (ORDER BY {stage}_ms) AS {stage}"
+        for stage in STAGES
+    )
+    with get_session() as session:
+        rows = session.execute(text(f"""
+            SELECT event_id, count(*) AS orders,
+                   {percentiles}
+            FROM db_orders.order_timings
+            WHERE status = :status
+              AND (CAST(:since AS TIMESTAMP) IS NULL OR recorded_at >= :since)
+              AND (CAST(:event_id AS INTEGER) IS NULL OR event_id = :event_id)
+            GROUP BY event_id
+            ORDER BY event_id
+        """), {"status": status, "since": since, "event_id": event_id}).mappings().all()
+    return [dict(row) for row in rows]
+
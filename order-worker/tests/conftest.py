@@ -0,0 +1,11 @@
+"""
+Unit tests for the order worker's in-memory components.
+
+Nothing here needs RabbitMQ, Postgres or the catalog: SQL is checked by
+compiling the statements, brokers and channels are small fakes.
+Run from order-worker/: python -m pytest -q tests
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
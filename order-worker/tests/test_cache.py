@@ -0,0 +1,73 @@
+import threading
+import time
+
+from src.cache import TTLCache
+
+
+def test_get_or_load_reads_through_once():
+    cache = TTLCache(maxsize=10, ttl=60)
+    calls = []
+    assert cache.get_or_load("a", lambda: calls.append(1) or "value") == "value"
+    assert cache.get_or_load("a", lambda: calls.append(1) or "other") == "value"
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_invalidate_forces_a_reload():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.get_or_load("a", lambda: 1)
+    cache.invalidate("a")
+    assert cache.get_or_load("a", lambda: 2) == 2
+
+
+def test_none_is_not_stored_unless_asked():
+    cache = TTLCache(maxsize=10, ttl=60)
+    assert cache.get_or_load("a", lambda: None, cache_none=False) is None
+    assert cache.get_or_load("a", lambda: "created", cache_none=False) == "created"
+    cache.get_or_load("b", lambda: None)
+    assert cache.get_or_load("b", lambda: "created") is None
+
+
+def test_value_loaded_across_an_invalidation_is_not_stored():
+    cache = TTLCache(maxsize=10, ttl=60)
+    loading, invalidated = threading.Event(), threading.Event()
+
+    def slow_loader():
+        loading.set()
+        invalidated.wait(5)
+        return "stale"
+
+    result = []
+    thread = threading.Thread(target=lambda: result.append(cache.get_or_load("a", slow_loader)))
+    thread.start()
+    assert loading.wait(5)
+    cache.invalidate("a")
+    invalidated.set()
+    thread.join(5)
+
+    assert result == ["stale"]  # the caller still gets what it loaded
+    assert cache.get("a") is None
+    assert cache.get_or_load("a", lambda: "fresh") == "fresh"
+
+
+def test_clear_also_discards_loads_in_flight():
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    def loader():
+        cache.clear()
+        return "stale"
+
+    assert cache.get_or_load("a", loader) == "stale"
+    assert len(cache) == 0
+
+
+def test_entries_expire_and_lru_evicts():
+    cache = TTLCache(maxsize=2, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None  # least recently used
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
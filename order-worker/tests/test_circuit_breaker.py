@@ -0,0 +1,75 @@
+import time
+
+from src.circuit_breaker import CircuitBreaker, CircuitState
+
+
+def breaker(**kwargs) -> CircuitBreaker:
+    options = dict(failure_rate=0.5, window_size=4, min_calls=4, open_seconds=0.05, half_open_calls=2)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+def test_opens_at_the_failure_rate_once_min_calls_were_seen():
+    cb = breaker()
+    cb.record_failure()
+    cb.record_failure()
+    cb.record_success()
+    assert cb.state == CircuitState.CLOSED  # 3 < min_calls
+    cb.record_failure()
+    assert cb.state == CircuitState.OPEN
+    assert cb.is_open()
+    assert not cb.allow_request()
+
+
+def test_stays_closed_below_the_failure_rate():
+    cb = breaker()
+    for _ in range(10):
+        cb.record_success()
+        cb.record_success()
+        cb.record_success()
+        cb.record_failure()
+    assert cb.state == CircuitState.CLOSED
+
+
+def test_half_open_probes_close_it():
+    changes = []
+    cb = breaker(min_calls=1)
+    cb.add_listener(lambda old, new: changes.append((old, new)))
+    cb.record_failure()
+    time.sleep(0.06)
+    assert cb.ready_for_probe()
+
+    assert cb.allow_request()
+    assert cb.state == CircuitState.HALF_OPEN
+    assert cb.allow_request()
+    assert not cb.allow_request()  # only half_open_calls probes at once
+    cb.record_success()
+    cb.record_success()
+
+    assert cb.state == CircuitState.CLOSED
+    assert changes == [
+        (CircuitState.CLOSED, CircuitState.OPEN),
+        (CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (CircuitState.HALF_OPEN, CircuitState.CLOSED),
+    ]
+
+
+def test_a_failed_probe_reopens_it():
+    cb = breaker(min_calls=1)
+    cb.record_failure()
+    time.sleep(0.06)
+    assert cb.allow_request()
+    cb.record_failure()
+    assert cb.state == CircuitState.OPEN
+    assert not cb.allow_request()
+
+
+def test_ignored_outcome_frees_the_probe_slot():
+    cb = breaker(min_calls=1, half_open_calls=1)
+    cb.record_failure()
+    time.sleep(0.06)
+    assert cb.allow_request()
+    assert not cb.allow_request()
+    cb.record_ignored()
+    assert cb.state == CircuitState.HALF_OPEN
+    assert cb.allow_request()
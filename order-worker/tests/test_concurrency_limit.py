@@ -0,0 +1,59 @@
+from src.concurrency_limit import AIMDLimiter
+
+
+def test_limit_grows_by_one_under_full_use_up_to_max():
+    limiter = AIMDLimiter("test", initial_limit=2, min_limit=1, max_limit=4)
+    for _ in range(10):
+        while limiter.acquire():
+            pass
+        for _ in range(limiter.inflight):
+            limiter.release(latency=0.01)
+    assert limiter.limit == 4
+
+
+def test_underused_limit_is_left_alone():
+    limiter = AIMDLimiter("test", initial_limit=10)
+    for _ in range(20):
+        assert limiter.acquire()
+        limiter.release(latency=0.01)
+    assert limiter.limit == 10
+
+
+def test_drops_back_off_down_to_min():
+    limiter = AIMDLimiter("test", initial_limit=10, min_limit=3, backoff_ratio=0.5)
+    assert limiter.acquire()
+    limiter.release(dropped=True)
+    assert limiter.limit == 5
+    for _ in range(10):
+        assert limiter.acquire()
+        limiter.release(dropped=True)
+    assert limiter.limit == 3
+
+
+def test_latency_above_tolerance_backs_off():
+    limiter = AIMDLimiter("test", initial_limit=10, backoff_ratio=0.5, latency_tolerance=2.0, long_window=1000)
+    for _ in range(5):
+        assert limiter.acquire()
+        limiter.release(latency=0.01)
+    for _ in range(30):
+        assert limiter.acquire()
+        limiter.release(latency=1.0)
+    assert limiter.limit < 10
+
+
+def test_acquire_times_out_at_the_limit():
+    limiter = AIMDLimiter("test", initial_limit=1)
+    assert limiter.acquire()
+    assert not limiter.acquire(timeout=0.05)
+    limiter.release(ignore=True)
+    assert limiter.limit == 1
+    assert limiter.acquire()
+
+
+def test_initial_limit_and_set_bounds_clamp():
+    limiter = AIMDLimiter("test", initial_limit=500, min_limit=1, max_limit=200)
+    assert limiter.limit == 200
+    limiter.set_bounds(1, 50)
+    assert limiter.limit == 50
+    limiter.set_bounds(80, 100)
+    assert limiter.limit == 80
@@ -0,0 +1,82 @@
+import time
+
+from datetime import datetime
+
+from src.gate_service import RedemptionWriter, Ticket, TicketIndex
+
+
+class FlakyWriter(RedemptionWriter):
+    """RedemptionWriter whose inserts fail until `healthy` is set."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.healthy = False
+        self.attempts = []
+
+    def _write(self, batch):
+        self.attempts.append(len(batch))
+        return self.healthy
+
+
+def redeem(writer: RedemptionWriter, count: int):
+    for seat_id in range(count):
+        writer.add(Ticket("order", "user", 1, seat_id, redeemed_gate="gate-1"))
+
+
+def test_failed_writes_back_off_and_pending_is_capped():
+    writer = FlakyWriter(flush_interval=0.05, batch_size=3, max_pending=10)
+    writer.start()
+    try:
+        redeem(writer, 20)
+        time.sleep(0.5)
+        # 0.05, 0.1, 0.2, ... between attempts instead of a busy loop
+        assert 2 <= len(writer.attempts) <= 6
+
+        writer.healthy = True
+        deadline = time.monotonic() + 3.0
+        while writer.attempts[-1] != 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        written = writer.attempts[-4:]
+        assert written == [3, 3, 3, 1]  # the newest 10, in batches
+    finally:
+        writer.stop()
+
+
+class LoadCountingIndex(TicketIndex):
+    """TicketIndex whose events hold two tickets, one already redeemed through `other_gate`."""
+
+    def __init__(self, **kwargs):
+        super().__init__(RedemptionWriter(), **kwargs)
+        self.loads = []
+        self.other_gate = None
+
+    def _load_tickets(self, event_id):
+        self.loads.append(event_id)
+        tickets = {f"hash-{seat_id}": Ticket("order", "user", event_id, seat_id) for seat_id in (1, 2)}
+        if self.other_gate:
+            tickets["hash-2"].redeemed_gate, tickets["hash-2"].redeemed_at = self.other_gate, datetime.utcnow()
+        return tickets, 0
+
+
+def test_expired_event_is_reloaded_keeping_local_redemptions():
+    index = LoadCountingIndex(ttl=0.05)
+    assert index.redeem(index.lookup(7, "hash-1"), "gate-1")
+    assert index.lookup(7, "hash-1").redeemed_gate == "gate-1"
+    assert index.loads == [7]
+
+    index.other_gate = "gate-9"
+    time.sleep(0.1)
+    assert index.lookup(7, "hash-2").redeemed_gate == "gate-9"
+    # Redeemed here before the reload, possibly not written yet
+    assert index.lookup(7, "hash-1").redeemed_gate == "gate-1"
+    assert index.loads == [7, 7]
+
+
+def test_least_recently_scanned_event_is_evicted():
+    index = LoadCountingIndex(max_events=2)
+    for event_id in (1, 2, 1, 3):
+        index.lookup(event_id, "hash-1")
+    assert len(index) == 2
+    index.lookup(1, "hash-1")
+    index.lookup(2, "hash-1")
+    assert index.loads == [1, 2, 3, 2]
@@ -0,0 +1,75 @@
+import hashlib
+from datetime import datetime, timedelta
+
+import pytest
+
+from src import manifest
+from src.manifest import KIND_DELTA, KIND_FULL, Manifest, read_watermark, write_manifest
+
+BASE = datetime(2026, 3, 1, 18, 0)
+
+
+def tickets(count: int, offset: int = 0):
+    """(qr_code_hash, seat_id, completed_at) sorted by hash, like the export query."""
+    rows = [
+        (hashlib.sha256(str(seat_id).encode()).hexdigest(), seat_id, BASE + timedelta(minutes=seat_id))
+        for seat_id in range(offset + 1, offset + count + 1)
+    ]
+    return sorted(rows)
+
+
+@pytest.fixture
+def exported(monkeypatch):
+    rows = {}
+    monkeypatch.setattr(manifest, "_completed_tickets", lambda event_id, since: iter(rows[since]))
+    return rows
+
+
+def test_full_manifest_round_trip(tmp_path, exported):
+    exported[None] = tickets(100)
+    path = str(tmp_path / "event-7.tbm")
+
+    count, watermark = write_manifest(7, path)
+
+    assert count == 100
+    assert watermark == BASE + timedelta(minutes=100)
+    assert read_watermark(path) == watermark
+    with Manifest(path) as m:
+        assert (m.kind, m.event_id, m.count, m.base) == (KIND_FULL, 7, 100, None)
+        for qr_hash, seat_id, _ in exported[None]:
+            assert m.lookup(qr_hash) == seat_id
+        assert m.lookup(hashlib.sha256(b"not a ticket").hexdigest()) is None
+
+
+def test_delta_records_its_base(tmp_path, exported):
+    since = BASE + timedelta(minutes=100)
+    exported[since] = tickets(5, offset=100)
+    path = str(tmp_path / "event-7.delta.tbm")
+
+    count, watermark = write_manifest(7, path, since=since)
+
+    assert count == 5
+    with Manifest(path) as m:
+        assert (m.kind, m.base, m.watermark) == (KIND_DELTA, since, watermark)
+        assert m.lookup(exported[since][0][0]) == exported[since][0][1]
+
+
+def test_empty_delta_keeps_the_previous_watermark(tmp_path, exported):
+    since = BASE
+    exported[since] = []
+    path = str(tmp_path / "empty.tbm")
+    assert write_manifest(7, path, since=since) == (0, since)
+    with Manifest(path) as m:
+        assert m.count == 0 and m.lookup("00" * 32) is None
+
+
+def test_truncated_or_foreign_files_are_refused(tmp_path, exported):
+    exported[None] = tickets(10)
+    path = tmp_path / "event.tbm"
+    write_manifest(7, str(path))
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError):
+        Manifest(str(path))
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        Manifest(str(path))
@@ -0,0 +1,39 @@
+from datetime import datetime
+
+import pytest
+
+from src.order_service import _snapshot_update, _to_status_update
+from src.generated import orders_pb2
+
+ORDER_UUID = "6f1c3a2e-8d4b-4c1e-9a7f-2b5d8e0c4a91"
+
+
+def status_update(status: str) -> orders_pb2.OrderStatusUpdate:
+    return _to_status_update({
+        "order_uuid": ORDER_UUID,
+        "status": status,
+        "changed_at": datetime(2026, 3, 1, 18, 0).isoformat(),
+    })
+
+
+@pytest.mark.parametrize("status", ["COMPLETED", "CANCELLED"])
+def test_terminal_status_ends_the_watch(status):
+    assert status_update(status).final
+
+
+@pytest.mark.parametrize("status", ["PENDING", "PROCESSING", "FAILED"])
+def test_non_terminal_status_keeps_watching(status):
+    # FAILED is retryable: a redelivery can still complete the order
+    assert not status_update(status).final
+
+
+def test_snapshot_of_failed_order_is_not_final():
+    details = orders_pb2.OrderDetails(
+        order_uuid=ORDER_UUID,
+        status=orders_pb2.OrderStatus.Value("ORDER_STATUS_FAILED"),
+        error_message="Database unavailable",
+    )
+    assert not _snapshot_update(details).final
+
+    details.status = orders_pb2.OrderStatus.Value("ORDER_STATUS_COMPLETED")
+    assert _snapshot_update(details).final
@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src import order_state
+from src.models import OrderStatus
+
+
+class Result:
+    def __init__(self, row=None, scalar=None):
+        self._row = row
+        self._scalar = scalar
+
+    def one_or_none(self):
+        return self._row
+
+    def first(self):
+        return self._row
+
+    def scalar(self):
+        return self._scalar
+
+
+class Row:
+    id = 1
+    created_at = datetime(2026, 1, 1)
+
+
+class RecordingSession:
+    """Compiles every statement for Postgres and answers with canned results."""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.sql = []
+
+    def execute(self, statement):
+        self.sql.append(str(statement.compile(dialect=postgresql.dialect())))
+        return self.results.pop(0) if self.results else Result()
+
+
+def order_values():
+    return dict(
+        order_uuid=uuid.uuid4(), user_id=uuid.uuid4(), event_id=1, seat_id=2,
+        total_amount=10, created_at=datetime(2026, 1, 1)
+    )
+
+
+def test_final_states_have_no_way_out():
+    for to, allowed in order_state.ALLOWED_FROM.items():
+        assert OrderStatus.COMPLETED not in allowed
+        assert OrderStatus.CANCELLED not in allowed
+
+
+def test_start_processing_only_takes_over_unleased_rows():
+    token = uuid.uuid4()
+    session = RecordingSession(Result(row=Row()))
+
+    assert order_state.start_processing(session, token, lease=60, **order_values()) == (1, Row.created_at)
+    upsert = session.sql[0]
+    assert "ON CONFLICT (order_uuid) DO UPDATE" in upsert
+    assert "processing_token = " in upsert and "lease_expires_at = " in upsert
+    # PROCESSING is only re-entered once the lease is gone or over
+    assert "db_orders.orders.lease_expires_at IS NULL" in upsert
+    assert "db_orders.orders.lease_expires_at <= " in upsert
+    assert "pg_notify" in session.sql[1]
+
+
+def test_start_processing_raises_while_another_delivery_holds_the_lease():
+    session = RecordingSession(Result(), Result(scalar=OrderStatus.PROCESSING.value))
+    with pytest.raises(order_state.OrderLeased):
+        order_state.start_processing(session, uuid.uuid4(), **order_values())
+
+
+def test_start_processing_skips_a_finished_order():
+    session = RecordingSession(Result(), Result(scalar=OrderStatus.COMPLETED.value))
+    assert order_state.start_processing(session, uuid.uuid4(), **order_values()) is None
+    assert len(session.sql) == 2  # no NOTIFY
+
+
+def test_transition_of_the_owner_matches_its_token():
+    session = RecordingSession(Result(row=Row()))
+    assert order_state.transition(session, uuid.uuid4(), None, OrderStatus.COMPLETED, uuid.uuid4())
+    update = session.sql[0]
+    assert "db_orders.orders.processing_token = " in update
+    assert "lease_expires_at=" in update  # the lease is cleared
+
+
+def test_transition_without_token_leaves_leased_rows_alone():
+    session = RecordingSession(Result())
+    assert not order_state.transition(session, uuid.uuid4(), None, OrderStatus.FAILED, error_message="x")
+    update = session.sql[0]
+    assert "processing_token = " not in update
+    assert "db_orders.orders.lease_expires_at <= " in update
+    assert len(session.sql) == 1  # no NOTIFY when nothing matched
+
+
+def test_release_requires_the_token():
+    session = RecordingSession(Result())
+    assert not order_state.release(session, uuid.uuid4(), None, uuid.uuid4())
+    assert "db_orders.orders.processing_token = " in session.sql[0]
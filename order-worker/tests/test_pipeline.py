@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from src.pipeline import Pipeline, PipelineFull, PipelineStopped, Stage
+
+
+def gated_pipeline(gate: threading.Event, max_inflight: int = None) -> Pipeline:
+    """One worker that holds every job until the gate opens, then a stage returning the job."""
+    return Pipeline(
+        [
+            Stage("hold", lambda job: None if gate.wait(5) else False, workers=1, queue_size=1),
+            Stage("done", lambda job: job, workers=1, queue_size=1),
+        ],
+        on_error=lambda job, error: False,
+        max_inflight=max_inflight
+    )
+
+
+def test_capacity_counts_queues_and_workers():
+    pipeline = gated_pipeline(threading.Event())
+    assert pipeline.capacity == 4
+    assert pipeline.max_inflight == 4
+
+
+def test_non_blocking_submit_refuses_when_full():
+    gate = threading.Event()
+    pipeline = gated_pipeline(gate, max_inflight=2)
+    pipeline.start()
+    try:
+        futures = [pipeline.submit(n, block=False) for n in range(2)]
+        with pytest.raises(PipelineFull):
+            pipeline.submit(2, block=False)
+        assert pipeline.inflight == 2
+
+        gate.set()
+        assert [future.result(5) for future in futures] == [0, 1]
+        assert pipeline.wait_idle(5)
+        assert pipeline.submit(3, block=False).result(5) == 3
+    finally:
+        pipeline.shutdown()
+
+
+def test_blocking_submit_waits_for_room():
+    gate = threading.Event()
+    pipeline = gated_pipeline(gate, max_inflight=1)
+    pipeline.start()
+    try:
+        first = pipeline.submit("a")
+        admitted = threading.Event()
+        second = []
+
+        def submit():
+            second.append(pipeline.submit("b"))
+            admitted.set()
+
+        threading.Thread(target=submit, daemon=True).start()
+        assert not admitted.wait(0.2)
+        gate.set()
+        assert first.result(5) == "a"
+        assert admitted.wait(5)
+        assert second[0].result(5) == "b"
+    finally:
+        pipeline.shutdown()
+
+
+def test_early_result_and_errors_finish_the_job():
+    def check(job):
+        if job == "bad":
+            raise ValueError(job)
+        return True if job == "early" else None
+
+    pipeline = Pipeline(
+        [Stage("check", check), Stage("last", lambda job: "last")],
+        on_error=lambda job, error: f"error: {error}"
+    )
+    pipeline.start()
+    try:
+        assert pipeline.submit("early").result(5) is True
+        assert pipeline.submit("bad").result(5) == "error: bad"
+        assert pipeline.submit("ok").result(5) == "last"
+    finally:
+        pipeline.shutdown()
+
+
+def test_shutdown_fails_queued_jobs():
+    gate = threading.Event()
+    pipeline = gated_pipeline(gate)
+    pipeline.start()
+    futures = [pipeline.submit(n, block=False) for n in range(3)]
+    pipeline.shutdown(timeout=0.1)
+    gate.set()
+    # The job held by the worker may still finish; the queued ones cannot
+    queued = futures[1:]
+    assert all(isinstance(future.exception(5), PipelineStopped) for future in queued)
+    assert pipeline.submit(9).cancelled()
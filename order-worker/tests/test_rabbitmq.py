@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+from src.rabbitmq import OrderMessage, RabbitMQConnection
+
+
+class RecordingChannel:
+    def __init__(self):
+        self.calls = []
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.calls.append(("ack", delivery_tag, multiple))
+
+    def basic_nack(self, delivery_tag, multiple=False, requeue=True):
+        self.calls.append(("nack", delivery_tag))
+
+    def basic_reject(self, delivery_tag, requeue=True):
+        self.calls.append(("reject", delivery_tag))
+
+
+def deliveries(*retry_counts):
+    return [
+        (
+            SimpleNamespace(delivery_tag=tag),
+            OrderMessage(
+                order_uuid=f"order-{tag}", user_id="user", event_id=1, seat_id=tag,
+                total_amount=10.0, processing_complexity=1, timestamp=None, retry_count=retries
+            )
+        )
+        for tag, retries in enumerate(retry_counts, start=1)
+    ]
+
+
+def settle(results, retry_counts=None):
+    channel = RecordingChannel()
+    pending = deliveries(*(retry_counts or [0] * len(results)))
+    RabbitMQConnection()._settle_batch(channel, pending, results)
+    return channel.calls
+
+
+def test_runs_of_successes_are_acked_once():
+    assert settle([True, True, True]) == [("ack", 3, True)]
+    assert settle([True]) == [("ack", 1, False)]
+
+
+def test_a_failure_ends_the_run_before_it_is_settled():
+    calls = settle([True, True, False, True, True, False], retry_counts=[0, 0, 0, 0, 0, 3])
+    assert calls == [
+        ("ack", 2, True),
+        ("nack", 3),
+        ("ack", 5, True),
+        ("reject", 6),  # out of retries: dead-lettered
+    ]
+
+
+def test_all_failures_are_settled_one_by_one():
+    assert settle([False, False]) == [("nack", 1), ("nack", 2)]
+
+
+
+def test_consumer_count_includes_shard_queues(monkeypatch):
+    from src.config import settings
+    monkeypatch.setattr(settings, "order_shards", 0)
+    assert RabbitMQConnection().consumer_count == 1
+    monkeypatch.setattr(settings, "order_shards", 4)
+    assert RabbitMQConnection().consumer_count == 5
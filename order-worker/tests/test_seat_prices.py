@@ -0,0 +1,83 @@
+import pytest
+
+from src import seat_prices as seat_prices_module
+from src.seat_prices import SeatPriceCache
+
+PRICES = {1: 50.0, 2: 50.0, 3: 80.0}
+
+
+class Loader:
+    def __init__(self, *tables):
+        self.tables = list(tables)
+        self.calls = 0
+
+    def __call__(self, event_id):
+        self.calls += 1
+        return self.tables[min(self.calls, len(self.tables)) - 1]
+
+
+def test_matching_order_passes_and_the_table_is_reused():
+    cache = SeatPriceCache()
+    loader = Loader(PRICES)
+    assert cache.check(7, [1, 3], 130.0, loader) is None
+    assert cache.check(7, [2], 50.0, loader) is None
+    assert loader.calls == 1
+
+
+def test_unknown_seat_and_wrong_amount_are_rejected():
+    cache = SeatPriceCache()
+    loader = Loader(PRICES)
+    assert cache.check(7, [1, 9], 100.0, loader) == "Seat not found for event 7: 9"
+    assert cache.check(7, [1], 40.0, loader) == "Amount mismatch: paid 40.00, expected 50.00"
+    # Cent rounding is not a mismatch
+    assert cache.check(7, [1], 50.004, loader) is None
+
+
+@pytest.mark.parametrize("total_amount", [None, 0, 0.0])
+def test_missing_amount_only_checks_the_seats(total_amount):
+    # Offline sync posts no total_amount; the gateway forwards 0.0
+    cache = SeatPriceCache()
+    loader = Loader(PRICES)
+    assert cache.check(7, [1, 3], total_amount, loader) is None
+    assert cache.check(7, [9], total_amount, loader) == "Seat not found for event 7: 9"
+
+
+def test_stale_table_is_reloaded_once_before_rejecting(monkeypatch):
+    monkeypatch.setattr(seat_prices_module, "RECHECK_AFTER", 0.0)
+    cache = SeatPriceCache()
+    loader = Loader(PRICES, {**PRICES, 4: 20.0})
+    cache.check(7, [1], 50.0, loader)
+    assert cache.check(7, [4], 20.0, loader) is None
+    assert loader.calls == 2
+
+
+def test_fresh_table_is_not_reloaded_for_a_rejection():
+    cache = SeatPriceCache()
+    loader = Loader(PRICES)
+    cache.check(7, [1], 50.0, loader)
+    assert cache.check(7, [1], 1.0, loader) is not None
+    assert loader.calls == 1
+
+
+@pytest.mark.parametrize("loader", [lambda event_id: None, lambda event_id: 1 / 0])
+def test_orders_pass_when_the_catalog_cannot_be_asked(loader):
+    assert SeatPriceCache().check(7, [99], 1.0, loader) is None
+
+
+def test_invalidate_event_reloads_on_the_next_order():
+    cache = SeatPriceCache()
+    loader = Loader(PRICES)
+    cache.check(7, [1], 50.0, loader)
+    cache.invalidate_event(7)
+    cache.check(7, [1], 50.0, loader)
+    assert loader.calls == 2
+
+
+def test_least_recently_used_event_is_evicted():
+    cache = SeatPriceCache(max_events=2)
+    for event_id in (1, 2, 1, 3):
+        cache.check(event_id, [1], 50.0, Loader(PRICES))
+    assert len(cache) == 2
+    loader = Loader(PRICES)
+    cache.check(2, [1], 50.0, loader)
+    assert loader.calls == 1